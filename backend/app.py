@@ -1,7 +1,8 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, ConfigDict
 from typing import Any, Dict, Optional
+import asyncio
 import os
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,12 +12,18 @@ try:
     from .dataset_repo import DatasetRepository
     from .orchestrator import Orchestrator
     from .artifacts import RunArtifactWriter, RunArtifactReader
+    from .compression import ArtifactCodec, codec_of_path, decompress, find_artifact, normalize_compression, read_artifact, write_artifact
     from .reporter import Reporter
+    from .events import TERMINAL_STATES
+    from .matrix import MATRIX_DIRNAME
 except ImportError:  # fallback for test runs importing as top-level modules
     from backend.dataset_repo import DatasetRepository
     from backend.orchestrator import Orchestrator
     from backend.artifacts import RunArtifactWriter, RunArtifactReader
+    from backend.compression import ArtifactCodec, codec_of_path, decompress, find_artifact, normalize_compression, read_artifact, write_artifact
     from backend.reporter import Reporter
+    from backend.events import TERMINAL_STATES
+    from backend.matrix import MATRIX_DIRNAME
     from backend.commerce_taxonomy import load_commerce_config
     from backend.coverage_builder import (
         build_per_behavior_datasets,
@@ -274,6 +281,16 @@ _migrate_legacy_assets()
 _get_or_create_vertical_context(os.getenv("INDUSTRY_VERTICAL", "commerce"))
 
 
+@app.on_event("shutdown")
+async def _close_provider_pools() -> None:
+    # Close the long-lived provider HTTP pools held by each vertical's orchestrator
+    for c in list(app.state.vctx.values()):
+        try:
+            await c['orch'].aclose()
+        except Exception:
+            pass
+
+
 class StartRunRequest(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
     dataset_id: str
@@ -287,6 +304,15 @@ class StartRunResponse(BaseModel):
     run_id: str
     state: str
 
+class MatrixRunRequest(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+    dataset_ids: list[str]
+    model_specs: list[str]
+    metrics: Optional[list[str]] = None
+    thresholds: Optional[dict[str, Any]] = None
+    context: Optional[dict[str, Any]] = None
+    provider_concurrency: Optional[dict[str, int]] = None  # e.g. {"ollama": 1, "openai": 8}
+
 class ControlBody(BaseModel):
     action: str  # 'pause' | 'resume' | 'cancel'
 
@@ -911,6 +937,107 @@ async def start_run(req: StartRunRequest):
     return StartRunResponse(job_id=jr.job_id, run_id=jr.run_id, state=jr.state)
 
 
+@app.post("/runs/matrix")
+async def start_matrix_run(req: MatrixRunRequest):
+    """Run every dataset x model pair concurrently; see GET /runs/matrix/{matrix_id} for the comparison."""
+    vertical = (req.context or {}).get("vertical")
+    ctx = _get_or_create_vertical_context(vertical)
+    orch: Orchestrator = ctx['orch']
+    cfg: Dict[str, Any] = {
+        "metrics": req.metrics or [],
+        "thresholds": req.thresholds or {},
+        "context": req.context or {},
+    }
+    try:
+        mr = orch.submit_matrix(
+            dataset_ids=req.dataset_ids,
+            model_specs=req.model_specs,
+            config=cfg,
+            provider_concurrency=req.provider_concurrency,
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    for job_id in mr.job_ids:
+        jr = orch.jobs[job_id]
+        ctx['artifacts'].init_run(jr.run_id, {"dataset_id": jr.config["dataset_id"], "model_spec": jr.config["model_spec"], **cfg})
+    orch.start_matrix(mr.matrix_id)
+    return orch.matrix_status(mr.matrix_id)
+
+
+@app.get("/runs/matrix/{matrix_id}")
+async def matrix_run_status(matrix_id: str):
+    """Progress of a matrix run, with its comparison once written (also for earlier server sessions)."""
+    status: Optional[Dict[str, Any]] = None
+    for c in _iter_all_contexts():
+        orch: Orchestrator = c['orch']
+        if matrix_id in orch.matrices:
+            status = orch.matrix_status(matrix_id)
+            break
+    for c in _iter_all_contexts():
+        path = c['reader'].layout.runs_root / MATRIX_DIRNAME / matrix_id / "comparison.json"
+        if path.exists():
+            comparison = json.loads(path.read_text(encoding="utf-8"))
+            if status is None:
+                ok = all(r.get("state") == "succeeded" for r in comparison.get("runs", []))
+                status = {"matrix_id": matrix_id, "state": "succeeded" if ok else "failed", "comparison_path": str(path)}
+            status["comparison"] = comparison
+            break
+    if status is None:
+        raise HTTPException(status_code=404, detail="matrix not found")
+    return status
+
+
+@app.post("/runs/{run_id}/resume", response_model=StartRunResponse)
+async def resume_run(run_id: str, vertical: Optional[str] = None):
+    """Start a job that finishes an interrupted run, re-running only turns without an ok record."""
+    contexts = [_get_or_create_vertical_context(vertical)] if vertical else _iter_all_contexts()
+    ctx = next((c for c in contexts if (c['reader'].layout.runs_root / run_id / "run_config.json").exists()), None)
+    if ctx is None:
+        raise HTTPException(status_code=404, detail="run not found")
+    orch: Orchestrator = ctx['orch']
+    if any(j.run_id == run_id and j.state not in TERMINAL_STATES for j in orch.jobs.values()):
+        raise HTTPException(status_code=409, detail="run is already in progress")
+    try:
+        jr = orch.resume_run(run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    orch.start(jr.job_id)
+    return StartRunResponse(job_id=jr.job_id, run_id=jr.run_id, state=jr.state)
+
+
+def _find_persisted_job(job_id: str):
+    """(vertical context, run_id, persisted job status) for a job id, or None.
+
+    Looks the job up in each vertical's run catalog; scans job.json files only when the
+    catalog is disabled.
+    """
+    for c in _iter_all_contexts():
+        reader: RunArtifactReader = c['reader']
+        cat = reader.catalog
+        if cat is not None:
+            try:
+                found = cat.find_job(job_id)
+            except Exception:
+                found = None
+            if found is not None:
+                return c, found[0], found[1]
+            continue
+        for p in sorted(reader.layout.runs_root.iterdir()):
+            if not p.is_dir():
+                continue
+            try:
+                obj = json.loads((p / "job.json").read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if obj.get("job_id") == job_id:
+                return c, p.name, obj
+    return None
+
+
 @app.post("/runs/{job_id}/control")
 async def control_run(job_id: str, body: ControlBody):
     # find job across all vertical orchestrators
@@ -924,27 +1051,16 @@ async def control_run(job_id: str, body: ControlBody):
             break
     if orch is None:
         # Allow 'cancel' to mark a stale job as cancelled if persisted job.json exists
-        # search across readers
-        for c in _iter_all_contexts():
-            reader: RunArtifactReader = c['reader']
-            for p in sorted(reader.layout.runs_root.iterdir()):
-                if not p.is_dir():
-                    continue
-                jpath = p / "job.json"
-                if not jpath.exists():
-                    continue
-                try:
-                    obj = json.loads(jpath.read_text(encoding="utf-8"))
-                except Exception:
-                    continue
-                if obj.get("job_id") == job_id:
-                    act = (body.action or '').lower()
-                    if act in ('cancel','abort'):
-                        obj["state"] = "cancelled"
-                        obj["error"] = "cancelled by user after restart"
-                        jpath.write_text(json.dumps(obj, indent=2), encoding="utf-8")
-                        return obj
-                    raise HTTPException(status_code=404, detail="job not running")
+        found = _find_persisted_job(job_id)
+        if found is not None:
+            c, run_id, obj = found
+            act = (body.action or '').lower()
+            if act in ('cancel','abort'):
+                obj["state"] = "cancelled"
+                obj["error"] = "cancelled by user after restart"
+                c['artifacts'].write_job_status(run_id, obj)
+                return obj
+            raise HTTPException(status_code=404, detail="job not running")
         raise HTTPException(status_code=404, detail="job not found")
     act = (body.action or '').lower()
     try:
@@ -979,6 +1095,9 @@ async def run_status(job_id: str):
         orch: Orchestrator = c['orch']
         jr = orch.jobs.get(job_id)
         if jr:
+            snap = orch.status_snapshot(job_id)
+            if snap is not None:
+                return snap
             return {
                 "job_id": jr.job_id,
                 "run_id": jr.run_id,
@@ -989,19 +1108,12 @@ async def run_status(job_id: str):
                 "error": jr.error,
             }
     # Try to recover from persisted job status if the process lost in-memory job across verticals
-    for c in _iter_all_contexts():
-        reader: RunArtifactReader = c['reader']
-        for p in sorted(reader.layout.runs_root.iterdir()):
-            if not p.is_dir():
-                continue
-            try:
-                obj = json.loads((p / "job.json").read_text(encoding="utf-8"))
-            except Exception:
-                continue
-            if obj.get("job_id") == job_id:
-                if obj.get("boot_id") != BOOT_ID and obj.get("state") in ("running", "paused", "cancelling"):
-                    obj = {**obj, "state": "failed", "error": "stale status from previous server session"}
-                return obj
+    found = _find_persisted_job(job_id)
+    if found is not None:
+        obj = found[2]
+        if obj.get("boot_id") != BOOT_ID and obj.get("state") in ("running", "paused", "cancelling"):
+            obj = {**obj, "state": "failed", "error": "stale status from previous server session"}
+        return obj
     raise HTTPException(status_code=404, detail="job not found")
     return {
         "job_id": jr.job_id,
@@ -1014,6 +1126,86 @@ async def run_status(job_id: str):
     }
 
 
+@app.get("/runs/{job_id}/partial")
+async def run_partial_results(job_id: str):
+    """Metrics scored so far for an in-memory job (available while it is running)."""
+    for c in _iter_all_contexts():
+        orch: Orchestrator = c['orch']
+        if job_id in orch.jobs:
+            return orch.partial_results(job_id)
+    raise HTTPException(status_code=404, detail="job not found")
+
+
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    head = f"id: {event['seq']}\n" if event.get("seq") is not None else ""
+    return f"{head}event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@app.get("/runs/{job_id}/events")
+async def run_events(job_id: str):
+    """Server-Sent Events stream of a job's progress.
+
+    Opens with a `state` snapshot, then forwards `state`, `turn` and `conversation` events
+    as the orchestrator publishes them, and ends once the job reaches a terminal state.
+    Jobs from an earlier server session get their persisted status as a single event.
+    """
+    for c in _iter_all_contexts():
+        orch: Orchestrator = c['orch']
+        jr = orch.jobs.get(job_id)
+        if jr is not None:
+            break
+    else:
+        found = _find_persisted_job(job_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail="job not found")
+        obj = dict(found[2])
+        if obj.get("boot_id") != BOOT_ID and obj.get("state") in ("running", "paused", "cancelling"):
+            obj.update(state="failed", error="stale status from previous server session")
+
+        async def _persisted():
+            yield _sse({"type": "state", "run_id": found[1], **obj})
+
+        return StreamingResponse(_persisted(), media_type="text/event-stream")
+
+    queue = orch.events.subscribe(job_id)
+    snapshot = {
+        "type": "state",
+        "job_id": jr.job_id,
+        "run_id": jr.run_id,
+        "state": jr.state,
+        "progress_pct": jr.progress_pct,
+        "total_conversations": jr.total_conversations,
+        "completed_conversations": jr.completed_conversations,
+        "error": jr.error,
+    }
+
+    async def _stream():
+        try:
+            yield _sse(snapshot)
+            if jr.state in TERMINAL_STATES:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                if event.get("type") == "state" and event.get("state") in TERMINAL_STATES:
+                    return
+        finally:
+            orch.events.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/runs/{run_id}/results")
 async def run_results(run_id: str, vertical: Optional[str] = None):
     paths = []
@@ -1024,7 +1216,7 @@ async def run_results(run_id: str, vertical: Optional[str] = None):
         for c in _iter_all_contexts():
             paths.append(c['reader'].layout.results_json_path(run_id))
     for path in paths:
-        if path.exists():
+        if find_artifact(path) is not None:
             return get_json_file(path)
     raise HTTPException(status_code=404, detail="results not found")
 
@@ -1032,13 +1224,34 @@ async def run_results(run_id: str, vertical: Optional[str] = None):
 def get_json_file(path: Path):
     import json
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return json.loads(read_artifact(path))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _artifact_response(request: Request, path: Path, media_type: str, filename: str):
+    """Serve a stored artifact, or None if no variant of path exists.
+
+    Compressed artifacts are sent as is with Content-Encoding when the client accepts that
+    codec (gzip, zstd) and decompressed otherwise.
+    """
+    found = find_artifact(path)
+    if found is None:
+        return None
+    mode = codec_of_path(found)
+    if mode == "off":
+        return FileResponse(str(found), media_type=media_type, filename=filename)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Vary": "Accept-Encoding"}
+    data = found.read_bytes()
+    accepted = [t.split(";")[0].strip().lower() for t in request.headers.get("accept-encoding", "").split(",")]
+    if mode in accepted:
+        headers["Content-Encoding"] = mode
+        return Response(content=data, media_type=media_type, headers=headers)
+    return Response(content=decompress(data), media_type=media_type, headers=headers)
+
+
 @app.get("/runs/{run_id}/artifacts")
-async def run_artifacts(run_id: str, type: str = "json", vertical: Optional[str] = None):
+async def run_artifacts(request: Request, run_id: str, type: str = "json", vertical: Optional[str] = None):
     reporter: Reporter = app.state.reporter
     # pick reader by vertical or search
     readers: list[RunArtifactReader] = []
@@ -1048,23 +1261,35 @@ async def run_artifacts(run_id: str, type: str = "json", vertical: Optional[str]
         readers = [c['reader'] for c in _iter_all_contexts()]
     if type == "json":
         for reader in readers:
-            path = reader.layout.results_json_path(run_id)
-            if path.exists():
-                return FileResponse(str(path), media_type="application/json", filename="results.json")
+            resp = _artifact_response(request, reader.layout.results_json_path(run_id), "application/json", "results.json")
+            if resp is not None:
+                return resp
         raise HTTPException(status_code=404, detail="results.json not found")
     elif type == "csv":
         for reader in readers:
-            path = reader.layout.results_csv_path(run_id)
-            if path.exists():
-                return FileResponse(str(path), media_type="text/csv", filename="results.csv")
+            resp = _artifact_response(request, reader.layout.results_csv_path(run_id), "text/csv", "results.csv")
+            if resp is not None:
+                return resp
         raise HTTPException(status_code=404, detail="results.csv not found")
+    elif type == "parquet":
+        for reader in readers:
+            path = reader.layout.results_parquet_path(run_id)
+            if not path.exists() and find_artifact(reader.layout.results_json_path(run_id)) is not None:
+                # runs from before the export (or without pyarrow at the time): build it now
+                try:
+                    RunArtifactWriter(reader.layout.runs_root).write_results_parquet(run_id, reader.read_results_json(run_id))
+                except RuntimeError as e:
+                    raise HTTPException(status_code=501, detail=f"Parquet export not available: {e}")
+            if path.exists():
+                return FileResponse(str(path), media_type="application/vnd.apache.parquet", filename="results.parquet")
+        raise HTTPException(status_code=404, detail="results.json not found")
     elif type == "html":
         # generate on the fly from results.json
         json_path = None
         rd_for_html = None
         for reader in readers:
             cand = reader.layout.results_json_path(run_id)
-            if cand.exists():
+            if find_artifact(cand) is not None:
                 json_path = cand
                 rd_for_html = reader
                 break
@@ -1099,15 +1324,15 @@ async def run_artifacts(run_id: str, type: str = "json", vertical: Optional[str]
         if base:
             fname = f"report-{base}.html"
         out_path = rd_for_html.layout.run_dir(run_id) / fname
-        out_path.write_text(html, encoding="utf-8")
-        return FileResponse(str(out_path), media_type="text/html", filename=out_path.name)
+        write_artifact(out_path, html.encode("utf-8"), ArtifactCodec(normalize_compression()))
+        return _artifact_response(request, out_path, "text/html", out_path.name)
     elif type == "pdf":
         # Render HTML then convert to PDF (requires WeasyPrint)
         json_path = None
         rd_for_html = None
         for reader in readers:
             cand = reader.layout.results_json_path(run_id)
-            if cand.exists():
+            if find_artifact(cand) is not None:
                 json_path = cand
                 rd_for_html = reader
                 break
@@ -1246,167 +1471,169 @@ async def run_artifacts(run_id: str, type: str = "json", vertical: Optional[str]
         raise HTTPException(status_code=400, detail="unknown type")
 
 
-    @app.post("/runs/{run_id}/rebuild")
-    async def rebuild_run_artifacts(run_id: str, vertical: Optional[str] = None):
-        """Rebuild and enrich results.json and results.csv for an existing run.
-        Adds human-friendly identity, per-turn snippets, rollups, and writes CSV.
-        """
-        # locate by vertical or search across
-        if vertical:
-            ctx = _get_or_create_vertical_context(vertical)
-            reader: RunArtifactReader = ctx['reader']
-            writer: RunArtifactWriter = ctx['artifacts']
-            repo: DatasetRepository = ctx['orch'].repo
-        else:
-            # search for run_id
-            reader = None
-            writer = None
-            repo = None
-            for c in _iter_all_contexts():
-                if (c['reader'].layout.run_dir(run_id)).exists():
-                    reader = c['reader']
-                    writer = c['artifacts']
-                    repo = c['orch'].repo
-                    break
-            if reader is None or writer is None or repo is None:
-                raise HTTPException(status_code=404, detail="run not found")
-        # Load existing
-        res_path = reader.layout.results_json_path(run_id)
-        if not res_path.exists():
-            raise HTTPException(status_code=404, detail="results.json not found")
-        try:
-            results = json.loads(res_path.read_text(encoding="utf-8"))
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"invalid results.json: {e}")
-        ds_id = results.get("dataset_id")
-        if not ds_id:
-            raise HTTPException(status_code=400, detail="results missing dataset_id")
-        try:
-            ds = repo.get_dataset(ds_id)
-        except Exception as e:
-            raise HTTPException(status_code=404, detail=f"dataset not found: {e}")
-
-        # Build conversation map from dataset
-        ds_meta = ds.get("metadata", {}) or {}
-        domain_description = ds_meta.get("short_description")
-        conv_map: dict[str, dict] = {c.get("conversation_id"): c for c in (ds.get("conversations") or [])}
-
-        # Helpers
-        import re
-        def slugify(text: str) -> str:
-            t = (text or "").lower()
-            t = re.sub(r"[^a-z0-9]+", "-", t).strip("-")
-            return t[:80]
-
-        def conv_identity(cid: str) -> dict:
-            c = conv_map.get(cid) or {}
-            meta = c.get("metadata") or {}
-            d = meta.get("domain") or ds_meta.get("domain")
-            b = meta.get("behavior") or ds_meta.get("behavior")
-            s = meta.get("scenario") or meta.get("case")
-            persona = meta.get("persona")
-            locale = meta.get("locale")
-            channel = meta.get("channel")
-            complexity = meta.get("complexity") or ds_meta.get("difficulty")
-            case_type = meta.get("case_type") or meta.get("type")
-            title = c.get("title") or ((f"{b}: {s}" if b and s else (b or s)) if (b or s) else None) or cid
-            parts = [p for p in [d, b, s, persona, locale] if p]
-            slug = slugify("-".join(parts)) if parts else slugify(cid)
-            return {
-                "conversation_slug": slug,
-                "conversation_title": title,
-                "domain": d,
-                "behavior": b,
-                "scenario": s,
-                "persona": persona,
-                "locale": locale,
-                "channel": channel,
-                "complexity": complexity,
-                "case_type": case_type,
-            }
+@app.post("/runs/{run_id}/rebuild")
+async def rebuild_run_artifacts(run_id: str, vertical: Optional[str] = None):
+    """Rebuild and enrich results.json and results.csv for an existing run.
+    Adds human-friendly identity, per-turn snippets, rollups, and writes CSV.
+    """
+    # locate by vertical or search across
+    if vertical:
+        ctx = _get_or_create_vertical_context(vertical)
+        reader: RunArtifactReader = ctx['reader']
+        writer: RunArtifactWriter = ctx['artifacts']
+        repo: DatasetRepository = ctx['orch'].repo
+    else:
+        # search for run_id
+        reader = None
+        writer = None
+        repo = None
+        for c in _iter_all_contexts():
+            if (c['reader'].layout.run_dir(run_id)).exists():
+                reader = c['reader']
+                writer = c['artifacts']
+                repo = c['orch'].repo
+                break
+        if reader is None or writer is None or repo is None:
+            raise HTTPException(status_code=404, detail="run not found")
+    # Load existing
+    res_path = reader.layout.results_json_path(run_id)
+    if find_artifact(res_path) is None:
+        raise HTTPException(status_code=404, detail="results.json not found")
+    try:
+        results = reader.read_results_json(run_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"invalid results.json: {e}")
+    ds_id = results.get("dataset_id")
+    if not ds_id:
+        raise HTTPException(status_code=400, detail="results missing dataset_id")
+    try:
+        ds = repo.get_dataset(ds_id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"dataset not found: {e}")
+
+    # Build conversation map from dataset
+    ds_meta = ds.get("metadata", {}) or {}
+    domain_description = ds_meta.get("short_description")
+    conv_map: dict[str, dict] = {c.get("conversation_id"): c for c in (ds.get("conversations") or [])}
+
+    # Helpers
+    import re
+    def slugify(text: str) -> str:
+        t = (text or "").lower()
+        t = re.sub(r"[^a-z0-9]+", "-", t).strip("-")
+        return t[:80]
+
+    def conv_identity(cid: str) -> dict:
+        c = conv_map.get(cid) or {}
+        meta = c.get("metadata") or {}
+        d = meta.get("domain") or ds_meta.get("domain")
+        b = meta.get("behavior") or ds_meta.get("behavior")
+        s = meta.get("scenario") or meta.get("case")
+        persona = meta.get("persona")
+        locale = meta.get("locale")
+        channel = meta.get("channel")
+        complexity = meta.get("complexity") or ds_meta.get("difficulty")
+        case_type = meta.get("case_type") or meta.get("type")
+        title = c.get("title") or ((f"{b}: {s}" if b and s else (b or s)) if (b or s) else None) or cid
+        parts = [p for p in [d, b, s, persona, locale] if p]
+        slug = slugify("-".join(parts)) if parts else slugify(cid)
+        return {
+            "conversation_slug": slug,
+            "conversation_title": title,
+            "domain": d,
+            "behavior": b,
+            "scenario": s,
+            "persona": persona,
+            "locale": locale,
+            "channel": channel,
+            "complexity": complexity,
+            "case_type": case_type,
+        }
 
-        # Enrich per conversation
-        from .artifacts import RunFolderLayout
-        layout = RunFolderLayout(reader.layout.runs_root)
-        updated = 0
-        for conv in results.get("conversations", []) or []:
-            cid = conv.get("conversation_id")
-            if not cid:
-                continue
-            ident = conv_identity(cid)
-            conv.update({k: v for k, v in ident.items() if k not in conv or conv.get(k) in (None, "")})
-            # trace dir
-            conv["trace_dir"] = str(layout.conversation_subdir(run_id, cid))
-            # set conversation_description if present in dataset
-            if "conversation_description" not in conv:
-                try:
-                    conv_desc = (conv_map.get(cid, {}).get("metadata") or {}).get("short_description")
-                    if conv_desc:
-                        conv["conversation_description"] = conv_desc
-                except Exception:
-                    pass
-            # per-turn enrich
-            # open turn files to get assistant output snippet
-            from glob import glob
+    # Enrich per conversation
+    layout = reader.layout
+    updated = 0
+    # read turn records (per-turn files or JSONL turn log) once for the whole run
+    try:
+        records_by_conv = reader.read_turn_records_by_conversation(run_id)
+    except Exception:
+        records_by_conv = {}
+    for conv in results.get("conversations", []) or []:
+        cid = conv.get("conversation_id")
+        if not cid:
+            continue
+        ident = conv_identity(cid)
+        conv.update({k: v for k, v in ident.items() if k not in conv or conv.get(k) in (None, "")})
+        # trace dir
+        conv["trace_dir"] = str(layout.conversation_subdir(run_id, cid))
+        # set conversation_description if present in dataset
+        if "conversation_description" not in conv:
             try:
-                conv_dir = layout.conversation_subdir(run_id, cid)
-                turn_files = sorted(conv_dir.glob("turn_*.json"))
+                conv_desc = (conv_map.get(cid, {}).get("metadata") or {}).get("short_description")
+                if conv_desc:
+                    conv["conversation_description"] = conv_desc
             except Exception:
-                turn_files = []
-            # map turn_index -> response content
-            resp_by_idx: dict[int, str] = {}
-            for tf in turn_files:
+                pass
+        # per-turn enrich
+        # assistant output snippets from the run's turn records
+        turn_records = records_by_conv.get(str(cid), [])
+        # map turn_index -> response content
+        resp_by_idx: dict[int, str] = {}
+        for rec in turn_records:
+            try:
+                uidx = int(rec.get("turn_index", 0))
+                resp_by_idx[uidx] = ((rec.get("response", {}) or {}).get("content")) or ""
+            except Exception:
+                continue
+        # dataset turns for user prompt snippet
+        ds_turns = (conv_map.get(cid, {}).get("turns") or []) if cid in conv_map else []
+        def snippet(t: str, n: int = 160) -> str:
+            t = (t or "").strip().replace("\n", " ")
+            return t if len(t) <= n else (t[: n - 1] + "…")
+        for t in conv.get("turns", []) or []:
+            idx = int(t.get("turn_index", 0))
+            if "turn_pass" not in t:
+                mets = t.get("metrics", {}) or {}
+                pass_vals = [bool(v.get("pass")) for v in mets.values() if isinstance(v, dict) and "pass" in v]
+                t["turn_pass"] = (all(pass_vals) if pass_vals else True)
+            if "user_prompt_snippet" not in t:
                 try:
-                    rec = json.loads(tf.read_text(encoding="utf-8"))
-                    uidx = int(rec.get("turn_index", 0))
-                    resp_by_idx[uidx] = ((rec.get("response", {}) or {}).get("content")) or ""
+                    user_text = str(ds_turns[idx].get("text") or "") if 0 <= idx < len(ds_turns) else ""
                 except Exception:
-                    continue
-            # dataset turns for user prompt snippet
-            ds_turns = (conv_map.get(cid, {}).get("turns") or []) if cid in conv_map else []
-            def snippet(t: str, n: int = 160) -> str:
-                t = (t or "").strip().replace("\n", " ")
-                return t if len(t) <= n else (t[: n - 1] + "…")
-            for t in conv.get("turns", []) or []:
-                idx = int(t.get("turn_index", 0))
-                if "turn_pass" not in t:
-                    mets = t.get("metrics", {}) or {}
-                    pass_vals = [bool(v.get("pass")) for v in mets.values() if isinstance(v, dict) and "pass" in v]
-                    t["turn_pass"] = (all(pass_vals) if pass_vals else True)
-                if "user_prompt_snippet" not in t:
-                    try:
-                        user_text = str(ds_turns[idx].get("text") or "") if 0 <= idx < len(ds_turns) else ""
-                    except Exception:
-                        user_text = ""
-                    t["user_prompt_snippet"] = snippet(user_text)
-                if "assistant_output_snippet" not in t:
-                    t["assistant_output_snippet"] = snippet(resp_by_idx.get(idx, ""), 200)
-            # summary rollups
-            summ = conv.get("summary") or {}
-            if "total_user_turns" not in summ:
-                summ["total_user_turns"] = len(conv.get("turns") or [])
-            if "failed_turns_count" not in summ:
-                summ["failed_turns_count"] = sum(1 for tt in (conv.get("turns") or []) if tt.get("turn_pass") is False)
-            if "failed_metrics" not in summ:
-                failed_metrics = sorted({
-                    name for tt in (conv.get("turns") or []) for name, m in (tt.get("metrics") or {}).items()
-                    if isinstance(m, dict) and m.get("pass") is False
-                })
-                summ["failed_metrics"] = failed_metrics
-            conv["summary"] = summ
-            updated += 1
-
-        # Write back results.json and results.csv
-        # add domain description at top level
-        if domain_description:
-            results["domain_description"] = domain_description
-        writer.write_results_json(run_id, results)
-        try:
-            writer.write_results_csv(run_id, results)
-        except Exception as e:
-            # still return ok if JSON was updated
-            return {"ok": True, "updated_json": True, "updated_csv": False, "error": str(e), "conversations": updated}
-        return {"ok": True, "updated_json": True, "updated_csv": True, "conversations": updated}
+                    user_text = ""
+                t["user_prompt_snippet"] = snippet(user_text)
+            if "assistant_output_snippet" not in t:
+                t["assistant_output_snippet"] = snippet(resp_by_idx.get(idx, ""), 200)
+        # summary rollups
+        summ = conv.get("summary") or {}
+        if "total_user_turns" not in summ:
+            summ["total_user_turns"] = len(conv.get("turns") or [])
+        if "failed_turns_count" not in summ:
+            summ["failed_turns_count"] = sum(1 for tt in (conv.get("turns") or []) if tt.get("turn_pass") is False)
+        if "failed_metrics" not in summ:
+            failed_metrics = sorted({
+                name for tt in (conv.get("turns") or []) for name, m in (tt.get("metrics") or {}).items()
+                if isinstance(m, dict) and m.get("pass") is False
+            })
+            summ["failed_metrics"] = failed_metrics
+        conv["summary"] = summ
+        updated += 1
+
+    # Write back results.json and results.csv
+    # add domain description at top level
+    if domain_description:
+        results["domain_description"] = domain_description
+    writer.write_results_json(run_id, results)
+    try:
+        writer.write_results_parquet(run_id, results)
+    except Exception:
+        pass  # pyarrow not installed
+    try:
+        writer.write_results_csv(run_id, results)
+    except Exception as e:
+        # still return ok if JSON was updated
+        return {"ok": True, "updated_json": True, "updated_csv": False, "error": str(e), "conversations": updated}
+    return {"ok": True, "updated_json": True, "updated_csv": True, "conversations": updated}
 
 
 @app.post("/runs/{run_id}/feedback")
@@ -1450,7 +1677,7 @@ async def compare_runs(runA: str, runB: str, verticalA: Optional[str] = None, ve
         a = None
         for c in _iter_all_contexts():
             cand = c['reader'].layout.results_json_path(runA)
-            if cand.exists():
+            if find_artifact(cand) is not None:
                 a = cand
                 break
     # resolve for B
@@ -1461,10 +1688,10 @@ async def compare_runs(runA: str, runB: str, verticalA: Optional[str] = None, ve
         b = None
         for c in _iter_all_contexts():
             cand = c['reader'].layout.results_json_path(runB)
-            if cand.exists():
+            if find_artifact(cand) is not None:
                 b = cand
                 break
-    if a is None or b is None or (not a.exists()) or (not b.exists()):
+    if a is None or b is None or find_artifact(a) is None or find_artifact(b) is None:
         raise HTTPException(status_code=404, detail="one or both results.json missing")
     A = get_json_file(a)
     B = get_json_file(b)
@@ -1492,19 +1719,78 @@ class RunListItem(BaseModel):
     vertical: Optional[str] = None
 
 
+def _run_list_item(row: Dict[str, Any], vertical: str) -> Dict[str, Any]:
+    # Determine staleness
+    boot_id = row.get('boot_id')
+    is_stale = (boot_id is None) or (boot_id != BOOT_ID)
+    state_val = row.get('state')
+    if is_stale and state_val in ("running","paused","cancelling"):
+        state_val = "stale"
+    return {
+        'run_id': row['run_id'],
+        'dataset_id': row.get('dataset_id'),
+        'model_spec': row.get('model_spec'),
+        'has_results': bool(row.get('has_results')),
+        'created_ts': row.get('created_ts'),
+        'state': state_val,
+        'progress_pct': row.get('progress_pct'),
+        'completed_conversations': row.get('completed_conversations'),
+        'job_id': row.get('job_id'),
+        'stale': is_stale,
+        'vertical': vertical,
+    }
+
+
 @app.get("/runs")
-async def list_runs(vertical: Optional[str] = None):
-    """List runs by inspecting runs/<vertical>/ folder. Defaults to selected vertical."""
+async def list_runs(
+    response: Response,
+    vertical: Optional[str] = None,
+    dataset_id: Optional[str] = None,
+    model_spec: Optional[str] = None,
+    state: Optional[str] = None,
+    job_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+):
+    """List runs of runs/<vertical>/ (all verticals by default) from the run catalog.
+
+    dataset_id/model_spec/state/job_id filter exactly (state is the persisted state, before
+    stale detection). limit/offset page through runs ordered by vertical, then run_id; the
+    total match count is returned in the X-Total-Count header.
+    """
     contexts = [_get_or_create_vertical_context(vertical)] if vertical else _iter_all_contexts()
+    filters = {"dataset_id": dataset_id, "model_spec": model_spec, "state": state, "job_id": job_id}
     items: list[dict[str, Any]] = []
+    total = 0
+    skip = max(0, offset)
+    want = None if limit is None else max(0, limit)
     for c in contexts:
-        vname = c['vertical']
-        reader: RunArtifactReader = c['reader']
-        layout = reader.layout
-        if not layout.runs_root.exists():
-            continue
+        cat = c['reader'].catalog
+        rows = _scan_runs(c) if cat is None else None
+        if rows is not None:
+            # catalog disabled: filter and page the scanned folders in memory
+            rows = [r for r in rows if all(v is None or r.get(k) == v for k, v in filters.items())]
+            n = len(rows)
+            rows = rows[skip:] if want is None else rows[skip:skip + want]
+        else:
+            rows, n = cat.list(limit=want, offset=skip, **filters)
+        total += n
+        skip = max(0, skip - n)
+        if want is not None:
+            want -= len(rows)
+        items.extend(_run_list_item(r, c['vertical']) for r in rows)
+    response.headers["X-Total-Count"] = str(total)
+    return items
+
+
+def _scan_runs(c: dict[str, Any]) -> list[dict[str, Any]]:
+    """Catalog-shaped rows read from the run folders of one vertical (RUN_CATALOG=off)."""
+    rows: list[dict[str, Any]] = []
+    reader: RunArtifactReader = c['reader']
+    layout = reader.layout
+    if layout.runs_root.exists():
         for p in sorted(layout.runs_root.iterdir()):
-            if not p.is_dir():
+            if not p.is_dir() or p.name.startswith(".") or p.name == MATRIX_DIRNAME:  # e.g. .zstd dictionaries
                 continue
             run_id = p.name
             cfg_path = p / 'run_config.json'
@@ -1516,27 +1802,16 @@ async def list_runs(vertical: Optional[str] = None):
             except Exception:
                 cfg = {}
             # Try to read persisted job status to enrich item
-            job_state = reader.read_job_status(run_id)
-            # Determine staleness
-            boot_id = (job_state or {}).get('boot_id')
-            is_stale = (boot_id is None) or (boot_id != BOOT_ID)
-            state_val = (job_state or {}).get('state')
-            if is_stale and state_val in ("running","paused","cancelling"):
-                state_val = "stale"
-            items.append({
+            job_state = reader.read_job_status(run_id) or {}
+            rows.append({
                 'run_id': run_id,
                 'dataset_id': cfg.get('dataset_id'),
                 'model_spec': cfg.get('model_spec'),
-                'has_results': res_path.exists(),
+                'has_results': find_artifact(res_path) is not None,
                 'created_ts': cfg_path.stat().st_mtime if cfg_path.exists() else None,
-                'state': state_val,
-                'progress_pct': (job_state or {}).get('progress_pct'),
-                'completed_conversations': (job_state or {}).get('completed_conversations'),
-                'job_id': (job_state or {}).get('job_id'),
-                'stale': is_stale,
-                'vertical': vname,
+                **{k: job_state.get(k) for k in ('state', 'progress_pct', 'completed_conversations', 'job_id', 'boot_id')},
             })
-    return items
+    return rows
 
 
 @app.post("/validate")
@@ -1,11 +1,37 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
 import json
 import csv
+import io
+import os
 import re
 import hashlib
+import sqlite3
+import time
+
+try:
+    from .turn_log import TurnLog
+    from .blob_store import BlobStore, BLOB_DIRNAME, rehydrate_record
+    from .columnar import write_parquet
+    from .run_catalog import RunCatalog, run_catalog
+    from .matrix import MATRIX_DIRNAME, comparison_csv
+    from .compression import (
+        ArtifactCodec, ZstdDictionaries, codec_of_path, decompress, dictionary_root,
+        find_artifact, normalize_compression, read_artifact, write_artifact,
+    )
+except ImportError:
+    from turn_log import TurnLog
+    from blob_store import BlobStore, BLOB_DIRNAME, rehydrate_record
+    from columnar import write_parquet
+    from run_catalog import RunCatalog, run_catalog
+    from matrix import MATRIX_DIRNAME, comparison_csv
+    from compression import (
+        ArtifactCodec, ZstdDictionaries, codec_of_path, decompress, dictionary_root,
+        find_artifact, normalize_compression, read_artifact, write_artifact,
+    )
 
 
 def safe_component(name: str, *, max_len: int = 120) -> str:
@@ -61,32 +87,82 @@ class RunFolderLayout:
     def results_csv_path(self, run_id: str) -> Path:
         return self.run_dir(run_id) / "results.csv"
 
+    def results_parquet_path(self, run_id: str) -> Path:
+        return self.run_dir(run_id) / "results.parquet"
+
     def job_status_path(self, run_id: str) -> Path:
         return self.run_dir(run_id) / "job.json"
 
+    def matrix_dir(self, matrix_id: str) -> Path:
+        # Combined artifacts of multi-model runs: <runs_root>/matrix/<matrix_id>/
+        p = self.runs_root / MATRIX_DIRNAME / matrix_id
+        p.mkdir(parents=True, exist_ok=True)
+        return p
+
 
 class RunArtifactWriter:
     def __init__(self, runs_root: Path) -> None:
         self.layout = RunFolderLayout(runs_root=runs_root)
+        # Per-run codecs for results.json/results.csv; kept for compression_stats()
+        self._codecs: Dict[str, ArtifactCodec] = {}
+
+    def _codec(self, run_id: str, path: Path, compression: Optional[str]) -> ArtifactCodec:
+        """Codec for an artifact; without an explicit mode, keep the stored variant's format."""
+        if compression is None:
+            found = find_artifact(path)
+            mode = codec_of_path(found) if found is not None else normalize_compression()
+        else:
+            mode = normalize_compression(compression)
+        codec = self._codecs.get(run_id)
+        if codec is None or codec.mode != mode:
+            codec = ArtifactCodec(mode)
+            self._codecs[run_id] = codec
+        return codec
+
+    @property
+    def catalog(self) -> Optional[RunCatalog]:
+        return run_catalog(self.layout.runs_root)
+
+    def _index(self, method: str, run_id: str, *args: Any) -> None:
+        """Mirror a write into the run catalog; the catalog is only an index and never fails a write."""
+        cat = self.catalog
+        if cat is not None:
+            try:
+                getattr(cat, method)(run_id, *args)
+            except sqlite3.Error:
+                pass
+
+    def compression_stats(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Raw vs stored bytes of the results artifacts written for a run (and forget them)."""
+        codec = self._codecs.pop(run_id, None)
+        return codec.stats() if codec is not None else None
 
     def init_run(self, run_id: str, config: Dict[str, Any]) -> Path:
         path = self.layout.run_config_path(run_id)
         path.write_text(json.dumps(config, indent=2), encoding="utf-8")
         # ensure conversations dir exists for turn artifacts
         self.layout.conversations_dir(run_id)
+        self._index("record_config", run_id, config)
         return path
 
     def write_job_status(self, run_id: str, status: Dict[str, Any]) -> Path:
+        """Replace job.json atomically (temp file + os.replace), so readers never see a partial file."""
         path = self.layout.job_status_path(run_id)
-        path.write_text(json.dumps(status, indent=2), encoding="utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(status, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        self._index("record_status", run_id, status)
         return path
 
-    def write_results_json(self, run_id: str, results: Dict[str, Any]) -> Path:
+    def write_results_json(self, run_id: str, results: Dict[str, Any], compression: Optional[str] = None) -> Path:
         path = self.layout.results_json_path(run_id)
-        path.write_text(json.dumps(results, indent=2), encoding="utf-8")
-        return path
+        codec = self._codec(run_id, path, compression)
+        out = write_artifact(path, json.dumps(results, indent=2).encode("utf-8"), codec)
+        self._index("record_results", run_id)
+        return out
 
-    def write_results_csv(self, run_id: str, results: Dict[str, Any]) -> Path:
+    def write_results_csv(self, run_id: str, results: Dict[str, Any], compression: Optional[str] = None) -> Path:
         """
         Expect results structure:
         {
@@ -104,7 +180,7 @@ class RunArtifactWriter:
         }
         """
         path = self.layout.results_csv_path(run_id)
-        with path.open("w", newline="", encoding="utf-8") as f:
+        with io.StringIO(newline="") as f:
             writer = csv.writer(f)
             header = [
                 # identity
@@ -200,18 +276,127 @@ class RunArtifactWriter:
                         in_tokens_total, out_tokens_total,
                     ]
                     writer.writerow(row)
+            data = f.getvalue().encode("utf-8")
+        return write_artifact(path, data, self._codec(run_id, path, compression))
+
+    def write_results_parquet(self, run_id: str, results: Dict[str, Any]) -> Path:
+        """Typed per-turn table (one row per scored turn) for analytics; requires pyarrow.
+
+        Parquet pages are zstd-compressed internally, so artifact compression does not apply.
+        """
+        return write_parquet(self.layout.results_parquet_path(run_id), results)
+
+    def write_matrix_comparison(self, matrix_id: str, comparison: Dict[str, Any]) -> Path:
+        """comparison.json (and a flat comparison.csv) of a dataset x model matrix."""
+        out_dir = self.layout.matrix_dir(matrix_id)
+        path = out_dir / "comparison.json"
+        path.write_text(json.dumps(comparison, indent=2), encoding="utf-8")
+        (out_dir / "comparison.csv").write_text(comparison_csv(comparison), encoding="utf-8")
         return path
 
 
+TERMINAL_JOB_STATES = ("succeeded", "failed", "cancelled")
+
+
+class JobStatusWriter:
+    """Coalesces job status updates in front of RunArtifactWriter.write_job_status.
+
+    The latest status of each job is kept in memory (`snapshot`). It is written at most
+    once every `interval_ms` (JOB_STATUS_FLUSH_MS, default 500), with a trailing write
+    for the last update. A change of state, including a terminal one, is written at once.
+    Without a running event loop to schedule the trailing write, every update is written.
+    Once a terminal status is written the job is forgotten; its job.json has the final word.
+    """
+
+    def __init__(self, writer: RunArtifactWriter, interval_ms: Optional[float] = None) -> None:
+        self.writer = writer
+        if interval_ms is None:
+            try:
+                interval_ms = float(os.getenv("JOB_STATUS_FLUSH_MS", "") or 500)
+            except ValueError:
+                interval_ms = 500.0
+        self.interval = max(0.0, float(interval_ms)) / 1000.0
+        self._latest: Dict[str, Tuple[str, Dict[str, Any]]] = {}  # job_id -> (run_id, latest status)
+        self._written_state: Dict[str, Any] = {}
+        self._written_at: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.writes = 0
+
+    def update(self, run_id: str, status: Dict[str, Any]) -> None:
+        job_id = str(status.get("job_id") or run_id)
+        self._latest[job_id] = (run_id, status)
+        state = status.get("state")
+        if job_id not in self._written_state or state != self._written_state[job_id] or state in TERMINAL_JOB_STATES:
+            self.flush(job_id)
+            return
+        wait = self._written_at.get(job_id, 0.0) + self.interval - time.monotonic()
+        if wait <= 0:
+            self.flush(job_id)
+            return
+        if job_id in self._timers:
+            return  # the pending write will pick up this update
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush(job_id)
+            return
+        self._timers[job_id] = loop.call_later(wait, self.flush, job_id)
+
+    def flush(self, job_id: Optional[str] = None) -> None:
+        """Write pending status now (for one job, or every job with a pending write)."""
+        for jid in ([job_id] if job_id is not None else list(self._timers)):
+            timer = self._timers.pop(jid, None)
+            if timer is not None:
+                timer.cancel()
+            latest = self._latest.get(jid)
+            if latest is None:
+                continue
+            run_id, status = latest
+            self._written_state[jid] = status.get("state")
+            self._written_at[jid] = time.monotonic()
+            try:
+                self.writer.write_job_status(run_id, status)
+                self.writes += 1
+            except OSError:
+                continue  # keep the status in memory; the next update retries the write
+            if status.get("state") in TERMINAL_JOB_STATES:
+                self._forget(jid)
+
+    def _forget(self, job_id: str) -> None:
+        self._latest.pop(job_id, None)
+        self._written_state.pop(job_id, None)
+        self._written_at.pop(job_id, None)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Latest status of a running job (whether or not it has been written yet).
+
+        None once the job finished; read its job.json instead.
+        """
+        latest = self._latest.get(job_id)
+        return dict(latest[1]) if latest is not None else None
+
+
 class RunArtifactReader:
+    """Reads run artifacts whether they are stored plain or gzip/zstd-compressed."""
+
     def __init__(self, runs_root: Path) -> None:
         self.layout = RunFolderLayout(runs_root=runs_root)
+        self.dictionaries = ZstdDictionaries(dictionary_root(self.layout.runs_root))
+        # kept across calls so parsed turn log indexes are reused
+        self.turn_log = TurnLog(self.layout.runs_root)
+
+    @property
+    def catalog(self) -> Optional[RunCatalog]:
+        return run_catalog(self.layout.runs_root)
 
     def read_results_json(self, run_id: str) -> Dict[str, Any]:
-        path = self.layout.results_json_path(run_id)
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(read_artifact(self.layout.results_json_path(run_id), self.dictionaries))
         return data
 
+    def read_artifact(self, path: Path) -> bytes:
+        """Decompressed bytes of a run artifact (path, path.zst or path.gz)."""
+        return read_artifact(path, self.dictionaries)
+
     def read_job_status(self, run_id: str) -> Optional[Dict[str, Any]]:
         p = self.layout.job_status_path(run_id)
         if not p.exists():
@@ -220,3 +405,43 @@ class RunArtifactReader:
             return json.loads(p.read_text(encoding="utf-8"))
         except Exception:
             return None
+
+    def read_turn_records(self, run_id: str, conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Turn records of one conversation, ordered by turn_index, from either storage mode.
+
+        Prefers the run's JSONL turn log; otherwise reads turn_NNN.json[.gz|.zst] files from
+        the plain (<conversation_id>) or hashed conversation folder. Message bodies stored in
+        the run's blob store are rehydrated, so callers always see full records.
+        Without a conversation_id, returns the records of every conversation in the run.
+        """
+        blobs = BlobStore(self.layout.runs_root / run_id / BLOB_DIRNAME)
+        if self.turn_log.exists(run_id):
+            return [rehydrate_record(r, blobs) for r in self.turn_log.read(run_id, conversation_id)]
+        conv_root = self.layout.runs_root / run_id / "conversations"
+        if conversation_id is None:
+            dirs = sorted(d for d in conv_root.iterdir() if d.is_dir()) if conv_root.is_dir() else []
+            return [r for d in dirs for r in self._read_turn_files(d, blobs)]
+        records: List[Dict[str, Any]] = []
+        for conv_dir in (conv_root / conversation_id, conv_root / conversation_dirname(conversation_id)):
+            if not conv_dir.is_dir():
+                continue
+            records = self._read_turn_files(conv_dir, blobs)
+            if records:
+                break
+        return records
+
+    def read_turn_records_by_conversation(self, run_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Every turn record of a run in one pass, grouped by conversation_id (turn order kept)."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for rec in self.read_turn_records(run_id):
+            grouped.setdefault(str(rec.get("conversation_id")), []).append(rec)
+        return grouped
+
+    def _read_turn_files(self, conv_dir: Path, blobs: BlobStore) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        for tf in sorted(conv_dir.glob("turn_*.json*")):
+            try:
+                records.append(rehydrate_record(json.loads(decompress(tf.read_bytes(), self.dictionaries)), blobs))
+            except Exception:
+                continue
+        return records
@@ -0,0 +1,102 @@
+from __future__ import annotations
+import copy
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+BLOB_DIRNAME = "blobs"
+REF_PREFIX = "sha256:"
+# Per-turn suffix appended to the system prompt by build_context; kept inline so the
+# large policy/facts prefix hashes identically across turns.
+_STATE_MARKER = "\nSTATE="
+
+
+def _min_bytes() -> int:
+    try:
+        return int(os.getenv("TURN_BLOB_MIN_BYTES", "") or 512)
+    except ValueError:
+        return 512
+
+
+class BlobStore:
+    """Content-addressed store of message bodies under <run_dir>/blobs/<h[:2]>/<h>.txt.
+
+    Each distinct body is written once (atomically) and referenced by its sha256.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._known: Set[str] = set()
+        self._cache: Dict[str, str] = {}
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.txt"
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self._known:
+            return digest
+        p = self._path(digest)
+        if not p.exists():
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, p)
+        self._known.add(digest)
+        return digest
+
+    def get(self, digest: str) -> str:
+        text = self._cache.get(digest)
+        if text is None:
+            text = self._path(digest).read_text(encoding="utf-8")
+            self._cache[digest] = text
+        return text
+
+
+def dehydrate_messages(messages: List[Dict[str, Any]], store: BlobStore, min_bytes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Replace large message bodies with `content_ref` (+ inline `content_tail`)."""
+    limit = _min_bytes() if min_bytes is None else min_bytes
+    out: List[Dict[str, Any]] = []
+    for m in messages or []:
+        content = m.get("content")
+        if not isinstance(content, str) or len(content.encode("utf-8")) < limit:
+            out.append(m)
+            continue
+        cut = content.rfind(_STATE_MARKER) if m.get("role") == "system" else -1
+        body, tail = (content[:cut], content[cut:]) if cut > 0 else (content, "")
+        slim = {k: v for k, v in m.items() if k != "content"}
+        slim["content_ref"] = REF_PREFIX + store.put(body)
+        if tail:
+            slim["content_tail"] = tail
+        out.append(slim)
+    return out
+
+
+def dehydrate_record(record: Dict[str, Any], store: BlobStore, min_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Copy of a turn record whose request.messages reference blobs instead of embedding them."""
+    request = record.get("request")
+    if not isinstance(request, dict) or not request.get("messages"):
+        return record
+    slim = dict(record)
+    slim["request"] = {**request, "messages": dehydrate_messages(request["messages"], store, min_bytes)}
+    return slim
+
+
+def rehydrate_record(record: Dict[str, Any], store: BlobStore) -> Dict[str, Any]:
+    """Inverse of dehydrate_record; records without references are returned unchanged."""
+    messages = (record.get("request") or {}).get("messages") if isinstance(record.get("request"), dict) else None
+    if not messages or not any(isinstance(m, dict) and "content_ref" in m for m in messages):
+        return record
+    full = copy.copy(record)
+    restored = []
+    for m in messages:
+        if isinstance(m, dict) and "content_ref" in m:
+            m = dict(m)
+            ref = str(m.pop("content_ref"))
+            digest = ref[len(REF_PREFIX):] if ref.startswith(REF_PREFIX) else ref
+            m["content"] = store.get(digest) + m.pop("content_tail", "")
+        restored.append(m)
+    full["request"] = {**record["request"], "messages": restored}
+    return full
@@ -3,12 +3,15 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from .orchestrator import Orchestrator
     from .schemas import SchemaValidator
     from .reporter import Reporter
+    from .dataset_repo import DatasetRepository
+    from .compression import find_artifact, read_artifact
+    from .run_catalog import RunCatalog, is_run_dir
     from .coverage_builder import (
         build_per_behavior_datasets,
         build_domain_combined_datasets,
@@ -28,6 +31,9 @@ except ImportError:
     from backend.orchestrator import Orchestrator
     from backend.schemas import SchemaValidator
     from backend.reporter import Reporter
+    from backend.dataset_repo import DatasetRepository
+    from backend.compression import find_artifact, read_artifact
+    from backend.run_catalog import RunCatalog, is_run_dir
     from backend.coverage_builder import (
         build_per_behavior_datasets,
         build_domain_combined_datasets,
@@ -108,7 +114,23 @@ def cmd_init(root: Path) -> int:
     return 0
 
 
-def cmd_run(root: Path, file: Path, no_semantic: bool = False) -> int:
+def _write_run_report(root: Path, run_id: str) -> None:
+    """Generate the HTML report of a finished run next to its results.json."""
+    try:
+        runs_dir = root / "runs" / run_id
+        results_path = runs_dir / "results.json"
+        if find_artifact(results_path) is not None:
+            results = json.loads(read_artifact(results_path))
+            templates_dir = Path(__file__).resolve().parent / "templates"
+            rep = Reporter(templates_dir)
+            out_html = runs_dir / "report.html"
+            rep.write_html(results, out_html)
+            print(f"Report: {out_html}")
+    except Exception as e:
+        print(f"Report generation failed: {e}")
+
+
+def cmd_run(root: Path, file: Path, no_semantic: bool = False, resume: bool = False, matrix: bool = False) -> int:
     root = Path(root)
     cfg_path = Path(file)
     if not cfg_path.exists():
@@ -139,46 +161,132 @@ def cmd_run(root: Path, file: Path, no_semantic: bool = False) -> int:
     if no_semantic and "semantic" in metrics:
         metrics = [m for m in metrics if m != "semantic"]
     thresholds = run_cfg.get("thresholds") or {}
+    context = {}
+    if run_cfg.get("concurrency") is not None:
+        context["concurrency"] = int(run_cfg["concurrency"])
+    if run_cfg.get("cache") is not None:
+        context["cache"] = run_cfg["cache"]
+    if run_cfg.get("embed_batching") is not None:
+        context["embed_batching"] = run_cfg["embed_batching"]
+    if run_cfg.get("turn_storage") is not None:
+        context["turn_storage"] = run_cfg["turn_storage"]
+    if run_cfg.get("turn_blobs") is not None:
+        context["turn_blobs"] = bool(run_cfg["turn_blobs"])
+    if run_cfg.get("artifact_compression") is not None:
+        context["artifact_compression"] = run_cfg["artifact_compression"]
+    if run_cfg.get("stream") is not None:
+        context["stream"] = bool(run_cfg["stream"])
+    if run_cfg.get("warmup") is not None:
+        context["warmup"] = bool(run_cfg["warmup"])
 
     if not datasets or not models:
         print("No datasets or models specified", file=sys.stderr)
         return 2
+    config: Dict[str, Any] = {"metrics": metrics, "thresholds": thresholds}
+    if context:
+        config["context"] = context
 
     orch = Orchestrator(datasets_dir=root / "datasets", runs_root=root / "runs")
     run_ids: List[str] = []
+    import asyncio
+    if matrix:
+        # One event loop for all dataset x model pairs: datasets load once, models run concurrently
+        try:
+            mr = orch.submit_matrix(
+                dataset_ids=datasets,
+                model_specs=models,
+                config=config,
+                provider_concurrency=run_cfg.get("provider_concurrency"),
+                resume=resume,
+            )
+        except (FileNotFoundError, ValueError) as e:
+            print(str(e), file=sys.stderr)
+            return 2
+        asyncio.run(orch.run_matrix(mr.matrix_id))
+        for job_id in mr.job_ids:
+            job = orch.jobs[job_id]
+            print(f"Run completed: job={job.job_id} state={job.state} run_id={job.run_id}")
+            run_ids.append(job.run_id)
+            _write_run_report(root, job.run_id)
+        print(f"Matrix {mr.matrix_id}: {mr.state}; comparison: {mr.comparison_path}")
+        print("All runs:", ", ".join(run_ids))
+        return 0 if mr.state == "succeeded" else 1
     for d in datasets:
         for m in models:
-            job = orch.submit(dataset_id=d, model_spec=m, config={"metrics": metrics, "thresholds": thresholds})
+            # --resume reuses the ok turn records of an interrupted run with the same run_id
+            job = orch.submit(dataset_id=d, model_spec=m, config=config, resume=resume)
             # Run the job inline without requiring an event loop
-            import asyncio
             asyncio.run(orch.run_job(job.job_id))
             print(f"Run completed: job={job.job_id} state={job.state} run_id={job.run_id}")
             run_ids.append(job.run_id)
             # Generate HTML report per run
-            try:
-                runs_dir = root / "runs" / job.run_id
-                results_path = runs_dir / "results.json"
-                if results_path.exists():
-                    results = json.loads(results_path.read_text(encoding="utf-8"))
-                    templates_dir = Path(__file__).resolve().parent / "templates"
-                    rep = Reporter(templates_dir)
-                    out_html = runs_dir / "report.html"
-                    rep.write_html(results, out_html)
-                    print(f"Report: {out_html}")
-            except Exception as e:
-                print(f"Report generation failed: {e}")
+            _write_run_report(root, job.run_id)
 
     print("All runs:", ", ".join(run_ids))
     return 0
 
 
+def cmd_warm_embeddings(root: Path, dataset_ids: List[str], batch_size: int = 32) -> int:
+    """Pre-embed every golden variant of the given datasets into the persistent embedding store."""
+    try:
+        from .embeddings.embedding_store import EmbeddingStore, warm_texts
+        from .embeddings.ollama_embed import OllamaEmbeddings
+    except ImportError:
+        from backend.embeddings.embedding_store import EmbeddingStore, warm_texts
+        from backend.embeddings.ollama_embed import OllamaEmbeddings
+    import asyncio
+
+    repo = DatasetRepository(Path(root) / "datasets")
+    texts: List[str] = []
+    for dataset_id in dataset_ids:
+        try:
+            texts.extend(repo.golden_variants(dataset_id))
+        except Exception as e:
+            print(f"Dataset {dataset_id}: {e}", file=sys.stderr)
+            return 2
+    try:
+        store = EmbeddingStore()
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    emb = OllamaEmbeddings()
+    try:
+        counts = asyncio.run(warm_texts(texts, store, emb, emb.model, batch_size=batch_size))
+    except Exception as e:
+        print(f"Warm-up failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Embedding store: {store.root} (model={emb.model}, dtype={store.dtype})")
+    print(f" - variants: {counts['texts']}  already cached: {counts['already_cached']}  embedded: {counts['embedded']}")
+    return 0
+
+
+def cmd_backfill_catalog(root: Path) -> int:
+    """Index existing run folders into the SQLite run catalog of each runs root (runs/ and runs/<vertical>/)."""
+    runs_base = root / "runs"
+    if not runs_base.is_dir():
+        print(f"No runs folder under {root}", file=sys.stderr)
+        return 2
+    roots = [runs_base] + [d for d in sorted(runs_base.iterdir()) if d.is_dir() and not d.name.startswith(".") and not is_run_dir(d)]
+    for runs_root in roots:
+        if not any(is_run_dir(d) for d in runs_root.iterdir() if d.is_dir()):
+            continue
+        count = RunCatalog(runs_root, auto_backfill=False).backfill()
+        print(f"Catalog: {runs_root} ({count} runs)")
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="llm-eval-cli", description="LLM Eval CLI")
-    p.add_argument("command", choices=["init", "run", "coverage"], help="CLI command")
+    p.add_argument("command", choices=["init", "run", "coverage", "warm-embeddings", "backfill-catalog"], help="CLI command")
     p.add_argument("--root", dest="root", default=str(Path.cwd()), help="Workspace root (default: CWD)")
     # run
     p.add_argument("--file", dest="file", default=None, help="Run config file (for run)")
     p.add_argument("--no-semantic", dest="no_semantic", action="store_true", help="Disable semantic metric for this run")
+    p.add_argument("--resume", dest="resume", action="store_true", help="Skip turns already completed by an interrupted run with the same config")
+    p.add_argument("--matrix", dest="matrix", action="store_true", help="Run all dataset x model pairs concurrently and write a comparison")
+    # warm-embeddings
+    p.add_argument("--dataset", dest="dataset_ids", nargs="*", default=None, help="Dataset id(s) whose golden variants to pre-embed")
+    p.add_argument("--batch-size", dest="batch_size", type=int, default=32, help="Texts per embeddings request (warm-embeddings)")
     # coverage generate options
     p.add_argument("--combined", dest="combined", action="store_true", help="Generate combined datasets (per-domain + global)")
     p.add_argument("--split", dest="split", action="store_true", help="Generate split per-behavior datasets")
@@ -206,7 +314,14 @@ def main(argv: List[str] | None = None) -> int:
         if not args.file:
             print("--file is required for run", file=sys.stderr)
             return 2
-        return cmd_run(root, Path(args.file), no_semantic=args.no_semantic)
+        return cmd_run(root, Path(args.file), no_semantic=args.no_semantic, resume=args.resume, matrix=args.matrix)
+    if args.command == "warm-embeddings":
+        if not args.dataset_ids:
+            print("--dataset is required for warm-embeddings", file=sys.stderr)
+            return 2
+        return cmd_warm_embeddings(root, args.dataset_ids, batch_size=args.batch_size)
+    if args.command == "backfill-catalog":
+        return cmd_backfill_catalog(root)
     if args.command == "coverage":
         return cmd_coverage_generate(
             root=root,
@@ -0,0 +1,137 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # parquet export is skipped without pyarrow
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+METRIC_NAMES = ("exact", "semantic", "consistency", "adherence", "hallucination")
+
+# (column, arrow type name) for the fixed part of the per-turn table; axes are appended
+# as axis_<name> string columns.
+TURN_COLUMNS = [
+    # identity
+    ("run_id", "string"), ("dataset_id", "string"), ("model_spec", "string"),
+    ("conversation_id", "string"), ("conversation_slug", "string"), ("conversation_title", "string"),
+    ("domain", "string"), ("behavior", "string"), ("scenario", "string"), ("persona", "string"),
+    ("locale", "string"), ("channel", "string"), ("complexity", "string"), ("case_type", "string"),
+    ("risk_tier", "string"),
+    # conversation summary
+    ("conversation_pass", "bool"), ("weighted_pass_rate", "float64"),
+    ("total_user_turns", "int64"), ("failed_turns_count", "int64"), ("failed_metrics", "string"),
+    # turn
+    ("turn_index", "int64"), ("turn_key", "string"), ("turn_pass", "bool"),
+    ("latency_ms", "int64"), ("load_ms", "float64"), ("input_tokens", "int64"), ("output_tokens", "int64"), ("cache_hit", "bool"),
+    ("throttle_ms", "int64"), ("ttft_ms", "float64"), ("tokens_per_sec", "float64"),
+] + [
+    (f"{m}_{field}", kind)
+    for m in METRIC_NAMES
+    for field, kind in (("pass", "bool"), ("skipped", "bool"), ("score", "float64"))
+]
+
+
+def _risk_tier(conv: Dict[str, Any]) -> Optional[str]:
+    axes = conv.get("axes") or {}
+    if not (isinstance(axes, dict) and conv.get("domain") and conv.get("behavior")):
+        return None
+    try:
+        try:
+            from .risk_sampler import compute_risk_tier
+            from .commerce_taxonomy import load_commerce_config
+        except ImportError:
+            from risk_sampler import compute_risk_tier
+            from commerce_taxonomy import load_commerce_config
+        return compute_risk_tier(load_commerce_config(), conv["domain"], conv["behavior"], axes)
+    except Exception:
+        return None
+
+
+def _as(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        if kind == "bool":
+            return bool(value)
+        if kind == "int64":
+            return int(value)
+        if kind == "float64":
+            return float(value)
+        return str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def results_to_columns(results: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """One row per scored turn of results.json, as typed column lists.
+
+    Unlike the CSV, absent values stay null (e.g. a metric that was not run).
+    """
+    rows: List[Dict[str, Any]] = []
+    axis_names = set()
+    for conv in results.get("conversations", []) or []:
+        summ = conv.get("summary") or {}
+        axes = conv.get("axes") if isinstance(conv.get("axes"), dict) else {}
+        axis_names.update(axes)
+        base = {
+            "run_id": results.get("run_id"),
+            "dataset_id": results.get("dataset_id"),
+            "model_spec": results.get("model_spec"),
+            **{k: conv.get(k) for k in (
+                "conversation_id", "conversation_slug", "conversation_title", "domain", "behavior",
+                "scenario", "persona", "locale", "channel", "complexity", "case_type",
+            )},
+            "risk_tier": _risk_tier(conv),
+            "conversation_pass": summ.get("conversation_pass"),
+            "weighted_pass_rate": summ.get("weighted_pass_rate"),
+            "total_user_turns": summ.get("total_user_turns"),
+            "failed_turns_count": summ.get("failed_turns_count"),
+            "failed_metrics": ";".join(summ.get("failed_metrics") or []),
+            **{f"axis_{k}": v for k, v in axes.items()},
+        }
+        for t in conv.get("turns", []) or []:
+            idx = t.get("turn_index")
+            row = dict(base)
+            row.update({
+                "turn_index": idx,
+                "turn_key": f"{conv.get('conversation_slug') or conv.get('conversation_id')}#{idx}",
+                "turn_pass": t.get("turn_pass"),
+                "latency_ms": t.get("latency_ms"),
+                "load_ms": t.get("load_ms"),
+                "input_tokens": t.get("input_tokens"),
+                "output_tokens": t.get("output_tokens"),
+                "cache_hit": t.get("cache_hit"),
+                "throttle_ms": t.get("throttle_ms"),
+                "ttft_ms": t.get("ttft_ms"),
+                "tokens_per_sec": t.get("tokens_per_sec"),
+            })
+            mets = t.get("metrics") or {}
+            for m in METRIC_NAMES:
+                res = mets.get(m)
+                if isinstance(res, dict):
+                    score = res.get("score_max", res.get("score"))
+                    row[f"{m}_pass"] = res.get("pass")
+                    row[f"{m}_skipped"] = bool(res.get("skipped"))
+                    row[f"{m}_score"] = score
+            rows.append(row)
+    columns = TURN_COLUMNS + [(f"axis_{k}", "string") for k in sorted(axis_names)]
+    return {name: [_as(kind, r.get(name)) for r in rows] for name, kind in columns}
+
+
+def results_table(results: Dict[str, Any]):
+    """results.json as a pyarrow Table with an explicit schema."""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for parquet export")
+    arrow = {"string": pa.string(), "bool": pa.bool_(), "int64": pa.int64(), "float64": pa.float64()}
+    kinds = dict(TURN_COLUMNS)
+    cols = results_to_columns(results)
+    schema = pa.schema([(name, arrow[kinds.get(name, "string")]) for name in cols])
+    return pa.Table.from_pydict(cols, schema=schema)
+
+
+def write_parquet(path: Path, results: Dict[str, Any]) -> Path:
+    pq.write_table(results_table(results), str(path), compression="zstd")
+    return path
@@ -0,0 +1,236 @@
+from __future__ import annotations
+import gzip
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # zstd mode falls back to gzip
+    zstandard = None  # type: ignore
+
+COMPRESSION_MODES = ("off", "gzip", "zstd")
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+DICT_DIRNAME = ".zstd"
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def normalize_compression(value: Any = None) -> str:
+    """Map a run config `artifact_compression` value to off|gzip|zstd (falls back to ARTIFACT_COMPRESSION env, then off).
+
+    zstd degrades to gzip when the zstandard package is not installed.
+    """
+    v = str(value or os.getenv("ARTIFACT_COMPRESSION") or "off").strip().lower()
+    if v not in COMPRESSION_MODES:
+        return "off"
+    if v == "zstd" and zstandard is None:
+        return "gzip"
+    return v
+
+
+def codec_of(data: bytes) -> str:
+    """Codec of a payload, sniffed from its magic bytes."""
+    if data[:2] == _GZIP_MAGIC:
+        return "gzip"
+    if data[:4] == _ZSTD_MAGIC:
+        return "zstd"
+    return "off"
+
+
+def codec_of_path(path: Path) -> str:
+    for mode, suffix in SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return mode
+    return "off"
+
+
+def dictionary_root(runs_root: Path) -> Path:
+    return Path(runs_root) / DICT_DIRNAME
+
+
+class ZstdDictionaries:
+    """Trained zstd dictionaries for turn records under <runs_root>/.zstd/<dict_id>.dict.
+
+    Every zstd frame records the id of the dictionary it was compressed with, so runs stay
+    readable after a newer dictionary is trained; `current` names the one used for writes.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._loaded: Dict[int, Any] = {}
+
+    def get(self, dict_id: int) -> Any:
+        d = self._loaded.get(dict_id)
+        if d is None and zstandard is not None:
+            try:
+                d = zstandard.ZstdCompressionDict((self.root / f"{dict_id}.dict").read_bytes())
+            except OSError:
+                return None
+            self._loaded[dict_id] = d
+        return d
+
+    def current(self) -> Any:
+        try:
+            dict_id = int((self.root / "current").read_text(encoding="utf-8").strip())
+        except (OSError, ValueError):
+            return None
+        return self.get(dict_id)
+
+    def train(self, samples: List[bytes], size: Optional[int] = None) -> Optional[int]:
+        """Train a dictionary from sample payloads and make it current; None if training fails."""
+        if zstandard is None or not samples:
+            return None
+        size = size or _env_int("ZSTD_DICT_SIZE", 64 * 1024)
+        try:
+            d = zstandard.train_dictionary(size, samples)
+        except zstandard.ZstdError:
+            return None
+        dict_id = d.dict_id()
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / f"{dict_id}.dict").write_bytes(d.as_bytes())
+        tmp = self.root / f"current.{os.getpid()}.tmp"
+        tmp.write_text(str(dict_id), encoding="utf-8")
+        os.replace(tmp, self.root / "current")
+        self._loaded[dict_id] = d
+        return dict_id
+
+
+def decompress(data: bytes, dictionaries: Optional[ZstdDictionaries] = None) -> bytes:
+    """Decompress a gzip or zstd payload (detected by magic bytes); other data is returned as is."""
+    kind = codec_of(data)
+    if kind == "gzip":
+        return gzip.decompress(data)
+    if kind == "zstd":
+        if zstandard is None:
+            raise RuntimeError("the zstandard package is required to read .zst artifacts")
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        d = dictionaries.get(dict_id) if (dict_id and dictionaries is not None) else None
+        if dict_id and d is None:
+            raise RuntimeError(f"zstd dictionary {dict_id} not found")
+        return zstandard.ZstdDecompressor(dict_data=d).decompress(data)
+    return data
+
+
+class ArtifactCodec:
+    """Compression for the artifacts of one run, with byte counts for the compression ratio.
+
+    Turn records (`record=True`) use the current trained zstd dictionary. Until one exists,
+    the first ZSTD_DICT_SAMPLES records are kept as samples and a dictionary is trained
+    from them, used for the rest of the run and by later runs.
+    """
+
+    def __init__(self, mode: str = "off", dictionaries: Optional[ZstdDictionaries] = None) -> None:
+        self.mode = mode if mode in COMPRESSION_MODES else "off"
+        if self.mode == "zstd" and zstandard is None:
+            self.mode = "gzip"
+        self.dictionaries = dictionaries
+        self.raw_bytes: Dict[str, int] = {}
+        self.stored_bytes: Dict[str, int] = {}
+        self._plain = None
+        self._dict = None
+        self._dict_compressor = None
+        self._dict_checked = False
+        self._samples: List[bytes] = []
+
+    @property
+    def suffix(self) -> str:
+        return SUFFIXES.get(self.mode, "")
+
+    def compress(self, data: bytes, kind: str = "artifact", record: bool = False) -> bytes:
+        if self.mode == "gzip":
+            out = gzip.compress(data, compresslevel=6, mtime=0)
+        elif self.mode == "zstd":
+            out = self._zstd(record).compress(data)
+            if record:
+                self._observe(data)
+        else:
+            out = data
+        self.raw_bytes[kind] = self.raw_bytes.get(kind, 0) + len(data)
+        self.stored_bytes[kind] = self.stored_bytes.get(kind, 0) + len(out)
+        return out
+
+    def _zstd(self, record: bool) -> Any:
+        level = _env_int("ZSTD_LEVEL", 3)
+        if record and self.dictionaries is not None:
+            if not self._dict_checked:
+                self._dict_checked = True
+                self._dict = self.dictionaries.current()
+            if self._dict is not None:
+                if self._dict_compressor is None:
+                    self._dict_compressor = zstandard.ZstdCompressor(level=level, dict_data=self._dict)
+                return self._dict_compressor
+        if self._plain is None:
+            self._plain = zstandard.ZstdCompressor(level=level)
+        return self._plain
+
+    def _observe(self, data: bytes) -> None:
+        if self._dict is not None or self.dictionaries is None or self._samples is None:
+            return
+        self._samples.append(data)
+        if len(self._samples) >= _env_int("ZSTD_DICT_SAMPLES", 200):
+            samples, self._samples = self._samples, None  # train once per run
+            dict_id = self.dictionaries.train(samples)
+            if dict_id is not None:
+                self._dict = self.dictionaries.get(dict_id)
+
+    def stats(self) -> Dict[str, Any]:
+        raw = sum(self.raw_bytes.values())
+        stored = sum(self.stored_bytes.values())
+        return {
+            "mode": self.mode,
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "ratio": round(raw / stored, 2) if stored else 1.0,
+            "artifacts": {
+                k: {
+                    "raw_bytes": self.raw_bytes[k],
+                    "stored_bytes": self.stored_bytes[k],
+                    "ratio": round(self.raw_bytes[k] / self.stored_bytes[k], 2) if self.stored_bytes[k] else 1.0,
+                }
+                for k in self.raw_bytes
+            },
+        }
+
+
+def variants(path: Path) -> List[Path]:
+    """The plain path and its compressed siblings (path.zst, path.gz)."""
+    return [path] + [path.with_name(path.name + s) for s in SUFFIXES.values()]
+
+
+def find_artifact(path: Path) -> Optional[Path]:
+    """The stored file for an artifact path, whichever variant exists."""
+    for cand in variants(Path(path)):
+        if cand.exists():
+            return cand
+    return None
+
+
+def read_artifact(path: Path, dictionaries: Optional[ZstdDictionaries] = None) -> bytes:
+    """Decompressed bytes of an artifact, whichever variant is stored."""
+    found = find_artifact(path)
+    if found is None:
+        raise FileNotFoundError(str(path))
+    return decompress(found.read_bytes(), dictionaries)
+
+
+def write_artifact(path: Path, data: bytes, codec: ArtifactCodec, record: bool = False) -> Path:
+    """Write an artifact through codec (adding its suffix) and drop stale variants."""
+    path = Path(path)
+    target = path.with_name(path.name + codec.suffix)
+    kind = "turn_records" if record else path.name
+    target.write_bytes(codec.compress(data, kind=kind, record=record))
+    for other in variants(path):
+        if other != target and other.exists():
+            try:
+                other.unlink()
+            except OSError:
+                pass
+    return target
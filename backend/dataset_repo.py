@@ -1,7 +1,9 @@
 from __future__ import annotations
+from copy import deepcopy
+from dataclasses import dataclass, field
 from pathlib import Path
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from .schemas import SchemaValidator
@@ -11,10 +13,39 @@ except ImportError:
 DEFAULT_DATASETS_DIR = Path(__file__).resolve().parents[1] / "datasets"
 
 
+@dataclass
+class _FileEntry:
+    """Parsed + validated contents of one dataset/golden file, keyed by its stat signature."""
+    mtime_ns: int
+    size: int
+    data: Optional[Dict[str, Any]] = None
+    errors: List[str] = field(default_factory=list)
+    load_error: Optional[ValueError] = None
+
+
+@dataclass
+class _RepoIndex:
+    dataset_paths: List[Path] = field(default_factory=list)
+    golden_paths: List[Path] = field(default_factory=list)
+    # <dataset_id>.dataset.json filename stem -> shallowest path
+    dataset_by_filename: Dict[str, Path] = field(default_factory=dict)
+    # conversation_id -> dataset files (valid only) that contain it
+    conversation_datasets: Dict[str, List[Path]] = field(default_factory=dict)
+    # (dataset_id, conversation_id) -> (golden header, entry); first match in file order
+    golden_by_pair: Dict[Tuple[Optional[str], str], Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=dict)
+    # conversation_id -> first golden match across all files (fallback)
+    golden_by_conversation: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=dict)
+    golden_dataset_ids: set = field(default_factory=set)
+
+
 class DatasetRepository:
     def __init__(self, root_dir: Optional[Path] = None) -> None:
         self.root_dir: Path = Path(root_dir) if root_dir else DEFAULT_DATASETS_DIR
         self.sv = SchemaValidator()
+        # Files are parsed and validated once; entries are reused until mtime/size changes
+        self._files: Dict[Path, _FileEntry] = {}
+        self._index: Optional[_RepoIndex] = None
+        self._signature: Optional[Tuple[Tuple[str, int, int], ...]] = None
 
     # File conventions: <dataset_id>.dataset.json and <dataset_id>.golden.json
     def _dataset_files(self) -> List[Path]:
@@ -32,13 +63,85 @@ class DatasetRepository:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in {p.name}: {e}") from e
 
+    # --- index maintenance ---
+    def _entry(self, p: Path, kind: str, st) -> _FileEntry:
+        cached = self._files.get(p)
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+            return cached
+        entry = _FileEntry(mtime_ns=st.st_mtime_ns, size=st.st_size)
+        try:
+            entry.data = self._load_json(p)
+            entry.errors = self.sv.validate(kind, entry.data)
+        except ValueError as e:
+            entry.load_error = e
+        self._files[p] = entry
+        return entry
+
+    def _refresh(self) -> _RepoIndex:
+        """Stat every file and rebuild lookup maps only when something changed."""
+        dataset_paths = self._dataset_files()
+        golden_paths = self._golden_files()
+        stats = {}
+        for p in dataset_paths + golden_paths:
+            try:
+                stats[p] = p.stat()
+            except OSError:
+                continue
+        signature = tuple((str(p), st.st_mtime_ns, st.st_size) for p, st in stats.items())
+        if self._index is not None and signature == self._signature:
+            return self._index
+
+        dataset_paths = [p for p in dataset_paths if p in stats]
+        golden_paths = [p for p in golden_paths if p in stats]
+        for p in dataset_paths:
+            self._entry(p, "dataset", stats[p])
+        for p in golden_paths:
+            self._entry(p, "golden", stats[p])
+        # drop entries for files that disappeared
+        for p in [p for p in self._files if p not in stats]:
+            del self._files[p]
+
+        idx = _RepoIndex(dataset_paths=dataset_paths, golden_paths=golden_paths)
+        for p in sorted(dataset_paths, key=lambda x: len(x.parts)):
+            idx.dataset_by_filename.setdefault(p.name[: -len(".dataset.json")], p)
+        for p in dataset_paths:
+            e = self._files[p]
+            if e.data is None or e.errors:
+                continue
+            for conv in e.data.get("conversations", []):
+                idx.conversation_datasets.setdefault(conv.get("conversation_id"), []).append(p)
+        for p in golden_paths:
+            e = self._files[p]
+            if e.data is None:
+                continue
+            idx.golden_dataset_ids.add(e.data.get("dataset_id"))
+            if e.errors:
+                continue
+            header = {"dataset_id": e.data.get("dataset_id"), "version": e.data.get("version")}
+            for entry in e.data.get("entries", []):
+                cid = entry.get("conversation_id")
+                idx.golden_by_pair.setdefault((header["dataset_id"], cid), (header, entry))
+                idx.golden_by_conversation.setdefault(cid, (header, entry))
+        self._index = idx
+        self._signature = signature
+        return idx
+
+    def _raise_load_errors(self, paths: List[Path]) -> None:
+        for p in paths:
+            err = self._files[p].load_error
+            if err is not None:
+                raise err
+
+    # --- public API ---
     def list_datasets(self) -> List[Dict[str, Any]]:
+        idx = self._refresh()
+        self._raise_load_errors(idx.golden_paths)
         items: List[Dict[str, Any]] = []
-        golden_index = {self._load_json(p).get("dataset_id"): p for p in self._golden_files()}
-        for p in self._dataset_files():
-            data = self._load_json(p)
-            errors = self.sv.validate("dataset", data)
-            if errors:
+        for p in idx.dataset_paths:
+            self._raise_load_errors([p])
+            e = self._files[p]
+            data = e.data or {}
+            if e.errors:
                 # Skip invalid datasets in listing but annotate error info
                 items.append({
                     "dataset_id": data.get("dataset_id") or p.stem.replace(".dataset", ""),
@@ -46,9 +149,9 @@ class DatasetRepository:
                     "domain": data.get("metadata", {}).get("domain"),
                     "difficulty": data.get("metadata", {}).get("difficulty"),
                     "conversations": len(data.get("conversations", []) or []),
-                    "has_golden": data.get("dataset_id") in golden_index,
+                    "has_golden": data.get("dataset_id") in idx.golden_dataset_ids,
                     "valid": False,
-                    "errors": errors,
+                    "errors": list(e.errors),
                 })
                 continue
             items.append({
@@ -57,45 +160,63 @@ class DatasetRepository:
                 "domain": data["metadata"]["domain"],
                 "difficulty": data["metadata"]["difficulty"],
                 "conversations": len(data["conversations"]),
-                "has_golden": data["dataset_id"] in golden_index,
+                "has_golden": data["dataset_id"] in idx.golden_dataset_ids,
                 "valid": True,
             })
         return items
 
     def get_dataset(self, dataset_id: str) -> Dict[str, Any]:
-        # Search in root and nested folders for the exact dataset filename
-        candidates = list(self.root_dir.rglob(f"{dataset_id}.dataset.json"))
-        if not candidates:
+        # Search in root and nested folders for the exact dataset filename (shallowest path wins)
+        idx = self._refresh()
+        p = idx.dataset_by_filename.get(dataset_id)
+        if p is None:
             raise FileNotFoundError(f"Dataset file not found: {dataset_id}.dataset.json")
-        # prefer the shallowest path
-        p = sorted(candidates, key=lambda x: len(x.parts))[0]
-        data = self._load_json(p)
-        errors = self.sv.validate("dataset", data)
-        if errors:
-            raise ValueError("Dataset schema validation failed: " + "; ".join(errors))
-        return data
+        self._raise_load_errors([p])
+        e = self._files[p]
+        if e.errors:
+            raise ValueError("Dataset schema validation failed: " + "; ".join(e.errors))
+        return deepcopy(e.data)
+
+    def golden_variants(self, dataset_id: str) -> List[str]:
+        """Expected-answer variants of every golden turn of a dataset (e.g. to pre-embed them)."""
+        texts: List[str] = []
+        for conv in self.get_dataset(dataset_id).get("conversations", []):
+            try:
+                g = self.get_golden(conv.get("conversation_id"))
+            except KeyError:
+                continue
+            for t in g.get("entry", {}).get("turns", []) or []:
+                texts.extend((t.get("expected", {}) or {}).get("variants", []) or [])
+        return texts
 
     def get_conversation(self, conversation_id: str) -> Dict[str, Any]:
-        found: Optional[Dict[str, Any]] = None
-        for p in self._dataset_files():
-            data = self._load_json(p)
-            if self.sv.validate("dataset", data):
-                continue
-            for conv in data.get("conversations", []):
-                if conv.get("conversation_id") == conversation_id:
-                    if found is not None:
-                        raise ValueError(
-                            f"Conversation ID '{conversation_id}' found in multiple datasets"
-                        )
-                    found = {
-                        "dataset_id": data["dataset_id"],
-                        "version": data["version"],
-                        "metadata": data.get("metadata", {}),
-                        "conversation": conv,
-                    }
-        if not found:
+        idx = self._refresh()
+        self._raise_load_errors(idx.dataset_paths)
+        paths = idx.conversation_datasets.get(conversation_id) or []
+        if not paths:
             raise KeyError(f"Conversation not found: {conversation_id}")
-        return found
+        matches = [
+            conv for p in paths for conv in self._files[p].data.get("conversations", [])
+            if conv.get("conversation_id") == conversation_id
+        ]
+        if len(matches) > 1:
+            raise ValueError(
+                f"Conversation ID '{conversation_id}' found in multiple datasets"
+            )
+        data = self._files[paths[0]].data
+        return deepcopy({
+            "dataset_id": data["dataset_id"],
+            "version": data["version"],
+            "metadata": data.get("metadata", {}),
+            "conversation": matches[0],
+        })
+
+    def _conversation_dataset_id(self, idx: _RepoIndex, conversation_id: str) -> Optional[str]:
+        """dataset_id of the one dataset containing the conversation; None when unknown or ambiguous."""
+        paths = idx.conversation_datasets.get(conversation_id) or []
+        if len(paths) != 1 or any(self._files[p].load_error is not None for p in idx.dataset_paths):
+            return None
+        return self._files[paths[0]].data.get("dataset_id")
 
     def get_golden(self, conversation_id: str) -> Dict[str, Any]:
         """
@@ -106,50 +227,18 @@ class DatasetRepository:
         collisions, we first determine the dataset_id that contains this conversation
         and then restrict our search to golden files that match that dataset_id.
         """
+        idx = self._refresh()
+        self._raise_load_errors(idx.golden_paths)
         # Determine which dataset this conversation belongs to
-        try:
-            conv_info = self.get_conversation(conversation_id)
-            target_dataset_id: Optional[str] = conv_info.get("dataset_id")
-        except Exception:
-            target_dataset_id = None
-
-        found_entry: Optional[Dict[str, Any]] = None
-        found_header: Optional[Dict[str, Any]] = None
+        target_dataset_id = self._conversation_dataset_id(idx, conversation_id)
+        if target_dataset_id:
+            found = idx.golden_by_pair.get((target_dataset_id, conversation_id))
+        else:
+            # As a fallback (conversation unknown or in several datasets), pick the first match
+            # across all golden files deterministically.
+            found = idx.golden_by_conversation.get(conversation_id)
 
-        for p in self._golden_files():
-            golden = self._load_json(p)
-            if self.sv.validate("golden", golden):
-                continue
-            # If we know the dataset that contains this conversation, only consider matching golden files
-            if target_dataset_id and golden.get("dataset_id") != target_dataset_id:
-                continue
-            for entry in golden.get("entries", []):
-                if entry.get("conversation_id") == conversation_id:
-                    if found_entry is not None:
-                        # If duplicates occur even after filtering by dataset_id,
-                        # keep the first and prefer the file that exactly matches target_dataset_id.
-                        # This avoids failing runs when both combined and per-scenario goldens exist.
-                        continue
-                    found_entry = entry
-                    found_header = {"dataset_id": golden.get("dataset_id"), "version": golden.get("version")}
-
-        if not found_entry or not found_header:
-            # As a fallback (e.g., if get_conversation failed), search across all golden files
-            # and pick the first match deterministically.
-            if not target_dataset_id:
-                for p in self._golden_files():
-                    golden = self._load_json(p)
-                    if self.sv.validate("golden", golden):
-                        continue
-                    for entry in golden.get("entries", []):
-                        if entry.get("conversation_id") == conversation_id:
-                            found_entry = entry
-                            found_header = {"dataset_id": golden.get("dataset_id"), "version": golden.get("version")}
-                            break
-                    if found_entry:
-                        break
-
-        if not found_entry or not found_header:
+        if not found:
             raise KeyError(f"Golden not found for conversation: {conversation_id}")
-
-        return {**found_header, "entry": found_entry}
+        header, entry = found
+        return deepcopy({**header, "entry": entry})
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+class EmbeddingBatcher:
+    """Micro-batching front for an embedder shared by concurrent scoring tasks.
+
+    Texts submitted through `embed()` are queued and sent as one request once
+    `max_batch` texts are pending or `linger_ms` has passed since the first one,
+    whichever comes first; results are fanned back out to each caller. Duplicate texts
+    within a batch are embedded once. At most `max_in_flight` requests run at a time.
+    Exposes the same `embed()`/`model` surface as OllamaEmbeddings.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,
+        max_batch: Optional[int] = None,
+        linger_ms: Optional[float] = None,
+        max_in_flight: int = 4,
+    ) -> None:
+        self.embedder = embedder
+        self.model = getattr(embedder, "model", None)
+        if max_batch is None:
+            max_batch = int(_env_number("EMBED_BATCH_SIZE", 32))
+        if linger_ms is None:
+            linger_ms = _env_number("EMBED_BATCH_LINGER_MS", 5.0)
+        self.max_batch = max(1, int(max_batch))
+        self.linger_ms = max(0.0, float(linger_ms))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.largest_batch = 0
+        self.failed_batches = 0
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        futs = []
+        for t in texts:
+            fut = loop.create_future()
+            self._pending.append((t, fut))
+            futs.append(fut)
+        self.requests += 1
+        self.texts += len(texts)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.linger_ms / 1000.0, self._flush)
+        return list(await asyncio.gather(*futs))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        for i in range(0, len(pending), self.max_batch):
+            task = asyncio.ensure_future(self._send(pending[i:i + self.max_batch]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, items: List[Tuple[str, asyncio.Future]]) -> None:
+        unique = list(dict.fromkeys(t for t, _ in items))
+        self.batches += 1
+        self.batched_texts += len(unique)
+        self.largest_batch = max(self.largest_batch, len(unique))
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_in_flight)
+        try:
+            async with self._sem:
+                vecs = await self.embedder.embed(unique)
+            if not isinstance(vecs, list) or len(vecs) != len(unique):
+                raise RuntimeError("unexpected embedding shape")
+        except Exception as e:
+            self.failed_batches += 1
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        by_text = dict(zip(unique, vecs))
+        for t, fut in items:
+            if not fut.done():
+                fut.set_result(by_text[t])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "linger_ms": self.linger_ms,
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "embedded_texts": self.batched_texts,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "failed_batches": self.failed_batches,
+        }
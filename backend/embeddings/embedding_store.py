@@ -0,0 +1,410 @@
+from __future__ import annotations
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # store is disabled without numpy
+    np = None  # type: ignore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, use one process per store
+    fcntl = None  # type: ignore
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "embeddings"
+STORE_DTYPES = ("float32", "float16")
+DEFAULT_FLUSH_ROWS = 256
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path, exclusive: bool = True) -> Iterator[None]:
+    """Advisory lock on `path` (a sidecar .lock file) across processes: shared or exclusive."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class _Shard:
+    """Vectors of one embedding model: a (capacity, dim) memmap plus an index.
+
+    The index maps sha256(text) -> row and is kept in LRU order (oldest first). Rows
+    freed by eviction are reused, so the vector file never exceeds the size cap.
+
+    Processes may share a shard (e.g. `cli warm-embeddings` next to the server). On disk
+    the index is a snapshot (`.idx.json`) plus a journal (`.idx.log`) to which writers
+    append one `[key, row]` line per stored vector and `[null, capacity]` per resize.
+    Every access holds the shard's file lock (shared to read, exclusive to write) and
+    first replays what other processes appended, so rows are allocated and the file is
+    grown from the current on-disk state. The vector file is never shrunk, keeping other
+    processes' mappings valid. `compact` folds the journal into a new snapshot.
+    """
+
+    def __init__(self, base: Path, model: str, dtype: str, max_bytes: int) -> None:
+        self.vec_path = base.with_name(base.name + ".vec")
+        self.idx_path = base.with_name(base.name + ".idx.json")
+        self.log_path = base.with_name(base.name + ".idx.log")
+        self.lock_path = base.with_name(base.name + ".lock")
+        self.model = model
+        self.dtype = dtype
+        self.max_bytes = max_bytes
+        self.dim = 0
+        self.capacity = 0
+        self.rows: "OrderedDict[str, int]" = OrderedDict()
+        self.owner: Dict[int, str] = {}  # row -> key
+        self.free: Set[int] = set()  # unused rows below capacity
+        self.dirty = 0  # journaled rows not folded into the snapshot yet
+        self._stamp: Optional[Tuple[int, int, int]] = None  # snapshot file the state was loaded from
+        self._log_offset = 0
+        self._pending: List[bytes] = []  # journal lines of the current write
+        self._mm = None
+
+    @property
+    def max_rows(self) -> int:
+        itemsize = np.dtype(self.dtype).itemsize
+        return max(1, self.max_bytes // max(1, self.dim * itemsize))
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        if not exclusive and not self.lock_path.parent.exists():
+            yield  # nothing stored yet
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.lock_path, exclusive):
+            self._sync()
+            yield
+
+    # --- on-disk state (lock held) ---
+    def _sync(self) -> None:
+        stamp = _file_stamp(self.idx_path)
+        if stamp is None or stamp != self._stamp:
+            self._load_snapshot()
+            self._stamp = stamp
+        self._replay_log()
+        self._map()
+
+    def _load_snapshot(self) -> None:
+        self.dim = self.capacity = self.dirty = self._log_offset = 0
+        self.rows.clear()
+        self.owner.clear()
+        self.free.clear()
+        try:
+            meta = json.loads(self.idx_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        dim, capacity = int(meta.get("dim") or 0), int(meta.get("capacity") or 0)
+        itemsize = np.dtype(self.dtype).itemsize
+        try:
+            size = self.vec_path.stat().st_size
+        except OSError:
+            size = 0
+        if meta.get("model") != self.model or dim <= 0 or size < capacity * dim * itemsize:
+            return
+        self.dim = dim
+        self._set_capacity(capacity)
+        for k, r in meta.get("rows") or []:
+            if 0 <= int(r) < capacity:
+                self._assign(k, int(r))
+
+    def _replay_log(self) -> None:
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1  # a torn trailing line (crashed writer) is skipped once completed
+        for raw in data[:end].splitlines():
+            try:
+                key, value = json.loads(raw)
+                value = int(value)
+            except (ValueError, TypeError):
+                continue
+            if key is None:
+                self._set_capacity(value)
+                continue
+            if 0 <= value < self.capacity:
+                self._assign(key, value)
+            self.dirty += 1
+        self._log_offset += end
+
+    def _map(self) -> None:
+        shape = (self.capacity, self.dim)
+        if self._mm is not None and self._mm.shape == shape:
+            return
+        self._mm = None
+        if not (self.capacity and self.dim):
+            return
+        try:
+            size = self.vec_path.stat().st_size
+        except OSError:
+            size = 0
+        if size < self.capacity * self.dim * np.dtype(self.dtype).itemsize:
+            # vector file lost or replaced: forget its rows, the next write grows a fresh one
+            self.rows.clear()
+            self.owner.clear()
+            self.free.clear()
+            self.capacity = 0
+            return
+        self._mm = np.memmap(self.vec_path, dtype=self.dtype, mode="r+", shape=shape)
+
+    def _set_capacity(self, capacity: int) -> None:
+        if capacity > self.capacity:
+            self.free.update(range(self.capacity, capacity))
+            self.capacity = capacity
+
+    def _assign(self, key: str, row: int) -> None:
+        prev_key = self.owner.get(row)
+        if prev_key is not None and prev_key != key:
+            self.rows.pop(prev_key, None)
+        prev_row = self.rows.pop(key, None)
+        if prev_row is not None and prev_row != row:
+            self.owner.pop(prev_row, None)
+            self.free.add(prev_row)
+        self.rows[key] = row
+        self.owner[row] = key
+        self.free.discard(row)
+
+    def _journal(self, key: Optional[str], value: int) -> None:
+        self._pending.append(json.dumps([key, value], separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def _append_log(self) -> None:
+        if not self._pending:
+            return
+        with open(self.log_path, "ab") as f:
+            if f.tell() != self._log_offset:
+                f.write(b"\n")  # terminate a torn line left by a crashed writer
+            f.write(b"".join(self._pending))
+            self._log_offset = f.tell()
+        self.dirty += sum(1 for line in self._pending if not line.startswith(b"[null,"))
+        self._pending.clear()
+
+    def _grow(self, capacity: int) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+        self._mm = None  # release the mapping before resizing (required on Windows)
+        need = capacity * self.dim * np.dtype(self.dtype).itemsize
+        self.vec_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.vec_path, "ab") as f:
+            if f.tell() < need:  # never shrink: another process may map the tail
+                f.truncate(need)
+        self._set_capacity(capacity)
+        self._journal(None, capacity)
+        self._map()
+
+    def _reset(self, dim: int) -> None:
+        """Model/dimension changed under the same name: start over (the file keeps its size)."""
+        self._pending.clear()
+        self.rows.clear()
+        self.owner.clear()
+        self.free.clear()
+        self.dim, self.capacity = dim, 0
+        self._mm = None
+        self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+        meta = {
+            "model": self.model,
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "capacity": self.capacity,
+            "rows": [[k, r] for k, r in self.rows.items()],
+        }
+        tmp = self.idx_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.idx_path)
+        # the snapshot already holds every journal entry; replaying them again would be harmless
+        open(self.log_path, "wb").close()
+        self._pending.clear()
+        self._log_offset = self.dirty = 0
+        self._stamp = _file_stamp(self.idx_path)
+
+    def _allocate(self) -> int:
+        if not self.free and self.capacity < self.max_rows:
+            self._grow(min(self.max_rows, max(16, self.capacity * 2)))
+        if self.free:
+            return self.free.pop()
+        _, row = self.rows.popitem(last=False)  # evict least recently used
+        self.owner.pop(row, None)
+        return row
+
+    def _put(self, key: str, vec: Sequence[float]) -> List[float]:
+        arr = np.asarray(vec, dtype=np.float32)
+        if arr.ndim != 1 or arr.size == 0:
+            raise ValueError("embedding must be a non-empty 1-D vector")
+        if arr.size != self.dim:
+            self._reset(int(arr.size))
+        row = self.rows.get(key)
+        if row is None:
+            row = self._allocate()
+        self._mm[row] = arr
+        self._assign(key, row)
+        self._journal(key, row)
+        return self._mm[row].astype(np.float32).tolist()
+
+    # --- public ---
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        out: List[Optional[List[float]]] = []
+        with self._locked(exclusive=False):
+            for key in keys:
+                row = self.rows.get(key)
+                if row is None or self._mm is None:
+                    out.append(None)
+                    continue
+                self.rows.move_to_end(key)
+                out.append(self._mm[row].astype(np.float32).tolist())
+        return out
+
+    def put_many(self, items: Sequence[Tuple[str, Sequence[float]]], compact_after: int) -> List[List[float]]:
+        with self._locked(exclusive=True):
+            try:
+                stored = [self._put(k, v) for k, v in items]
+            finally:
+                if self._mm is not None:
+                    self._mm.flush()  # vectors reach the file before the journal points at them
+                self._append_log()
+            if self.dirty >= compact_after:
+                self._write_snapshot()
+        return stored
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot (which also persists this process's lookup recency)."""
+        with self._locked(exclusive=True):
+            if self.dirty:
+                self._write_snapshot()
+
+
+class EmbeddingStore:
+    """Persistent embedding cache keyed by (embed model, sha256(text)).
+
+    Each model gets its own shard under <root>: `<model>.<dtype>.vec` (memory-mapped
+    vectors) and `<model>.<dtype>.idx.json` + `.idx.log` (key -> row, LRU order). Vectors
+    are stored as float32 (or float16 via EMBED_CACHE_DTYPE) and each shard is capped at
+    EMBED_CACHE_MAX_MB, evicting least recently used rows. New rows are appended to the
+    journal; the snapshot is rewritten once EMBED_CACHE_FLUSH_ROWS journal entries pile up
+    and on `flush`/`close` (the default store flushes at exit). Several processes can
+    share a store on POSIX (see _Shard).
+
+    Callers store golden/reference texts only: model outputs are rarely seen twice and
+    would evict goldens from the LRU.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        dtype: Optional[str] = None,
+        flush_rows: Optional[int] = None,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the embedding store")
+        self.root = Path(root or os.getenv("EMBED_CACHE_DIR") or DEFAULT_STORE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("EMBED_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        dtype = (dtype or os.getenv("EMBED_CACHE_DTYPE") or "float32").lower()
+        self.dtype = dtype if dtype in STORE_DTYPES else "float32"
+        if flush_rows is None:
+            try:
+                flush_rows = int(os.getenv("EMBED_CACHE_FLUSH_ROWS", "") or DEFAULT_FLUSH_ROWS)
+            except ValueError:
+                flush_rows = DEFAULT_FLUSH_ROWS
+        self.flush_rows = max(1, flush_rows)
+        self._shards: Dict[str, _Shard] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _shard(self, model: str) -> _Shard:
+        shard = self._shards.get(model)
+        if shard is None:
+            slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model)[:48]
+            digest = hashlib.sha1(model.encode("utf-8")).hexdigest()[:8]
+            shard = _Shard(self.root / f"{slug}-{digest}.{self.dtype}", model, self.dtype, self.max_bytes)
+            self._shards[model] = shard
+        return shard
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        shard = self._shard(model)
+        out = shard.get_many([text_key(t) for t in texts])
+        hits = sum(1 for v in out if v is not None)
+        self.hits += hits
+        self.misses += len(out) - hits
+        return out
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> List[List[float]]:
+        """Store vectors and return them as read back (i.e. at storage precision)."""
+        shard = self._shard(model)
+        return shard.put_many([(text_key(t), v) for t, v in zip(texts, vectors)], self.flush_rows)
+
+    def flush(self) -> None:
+        """Fold every shard's journal into its snapshot."""
+        for shard in self._shards.values():
+            shard.compact()
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "dtype": self.dtype,
+            "max_bytes": self.max_bytes,
+            "entries": {m: len(s.rows) for m, s in self._shards.items()},
+        }
+
+
+_DEFAULT: Optional[EmbeddingStore] = None
+
+
+def default_store() -> Optional[EmbeddingStore]:
+    """Process-wide store shared by all runs and verticals; None when disabled (EMBED_CACHE=off) or numpy is missing."""
+    global _DEFAULT
+    if os.getenv("EMBED_CACHE", "on").strip().lower() in ("off", "0", "false", "no") or np is None:
+        return None
+    if _DEFAULT is None:
+        _DEFAULT = EmbeddingStore()
+        atexit.register(_DEFAULT.close)
+    return _DEFAULT
+
+
+async def warm_texts(texts: Sequence[str], store: EmbeddingStore, embedder: Any, model: str, batch_size: int = 32) -> Dict[str, int]:
+    """Embed and store every text not already cached; returns counts."""
+    unique = list(dict.fromkeys(t for t in texts if t))
+    cached = store.get_many(model, unique)
+    missing = [t for t, v in zip(unique, cached) if v is None]
+    for i in range(0, len(missing), max(1, batch_size)):
+        chunk = missing[i:i + batch_size]
+        vecs = await embedder.embed(chunk)
+        if not isinstance(vecs, list) or len(vecs) != len(chunk):
+            raise RuntimeError("unexpected embedding shape")
+        store.put_many(model, chunk, vecs)
+    store.flush()
+    return {"texts": len(unique), "already_cached": len(unique) - len(missing), "embedded": len(missing)}
@@ -9,11 +9,12 @@ EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
 class OllamaEmbeddings:
     def __init__(self, host: str | None = None) -> None:
         self.base_url = (host or os.getenv("OLLAMA_HOST", "http://localhost:11434")).rstrip("/")
+        self.model = EMBED_MODEL
 
     async def embed(self, texts: List[str]) -> List[List[float]]:
         # Ollama embeddings endpoint with simple retry
         url = f"{self.base_url}/api/embeddings"
-        payload = {"model": EMBED_MODEL, "input": texts}
+        payload = {"model": self.model, "input": texts}
         last_err: Exception | None = None
         for attempt in range(3):
             try:
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python cosine fallback
+    np = None  # type: ignore
+
+try:
+    from .ollama_embed import OllamaEmbeddings
+except ImportError:
+    from embeddings.ollama_embed import OllamaEmbeddings
+
+# Scores within this distance of the vectorized max are re-checked with the exact
+# pure-Python cosine so ties and near-ties resolve exactly as the scalar loop does.
+_TIE_EPS = 1e-9
+
+
+def variant_matrix(var_vecs: Sequence[Sequence[float]]):
+    """Stack variant embeddings into a row-normalized float64 matrix.
+
+    Returns None when NumPy is unavailable or the vectors cannot be stacked (ragged,
+    empty), in which case scoring falls back to OllamaEmbeddings.cosine. Zero-norm rows
+    stay zero, matching cosine() returning 0.0.
+    """
+    if np is None or not var_vecs:
+        return None
+    dim = len(var_vecs[0])
+    if dim == 0 or any(len(v) != dim for v in var_vecs):
+        return None
+    m = np.asarray(var_vecs, dtype=np.float64)
+    norms = np.linalg.norm(m, axis=1)
+    nz = norms > 0
+    m[nz] /= norms[nz, None]
+    m[~nz] = 0.0
+    return m
+
+
+def _scalar_scores(out_vec: Sequence[float], var_vecs: Sequence[Sequence[float]]) -> Tuple[List[float], int, float]:
+    scores: List[float] = []
+    best_idx = -1
+    best_score = -1.0
+    for i, v in enumerate(var_vecs):
+        sc = OllamaEmbeddings.cosine(out_vec, v)  # type: ignore[arg-type]
+        scores.append(sc)
+        if sc > best_score:
+            best_score = sc
+            best_idx = i
+    return scores, best_idx, best_score
+
+
+def cosine_scores(
+    out_vec: Sequence[float],
+    var_vecs: Sequence[Sequence[float]],
+    matrix=None,
+) -> Tuple[List[float], int, float]:
+    """Cosine of out_vec against every variant: (scores, best_variant_index, score_max).
+
+    Uses one matrix-vector product against a pre-normalized variant matrix when NumPy is
+    available; best_variant_index and score_max are identical to the scalar loop.
+    """
+    if matrix is None:
+        matrix = variant_matrix(var_vecs)
+    if matrix is None or len(out_vec) != matrix.shape[1]:
+        return _scalar_scores(out_vec, var_vecs)
+    o = np.asarray(out_vec, dtype=np.float64)
+    norm = float(np.linalg.norm(o))
+    if norm == 0.0:
+        return _scalar_scores(out_vec, var_vecs)
+    sims = matrix @ (o / norm)
+    scores = sims.tolist()
+    # Resolve the winner exactly among the vectorized near-maxima (first index wins ties)
+    top = float(sims.max())
+    best_idx = -1
+    best_score = -1.0
+    for i in np.flatnonzero(sims >= top - _TIE_EPS).tolist():
+        sc = OllamaEmbeddings.cosine(out_vec, var_vecs[i])  # type: ignore[arg-type]
+        scores[i] = sc
+        if sc > best_score:
+            best_score = sc
+            best_idx = i
+    return scores, best_idx, best_score
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set
+
+TERMINAL_STATES = ("succeeded", "failed", "cancelled")
+
+
+class EventBus:
+    """In-process publish/subscribe of job events, keyed by job id.
+
+    Each subscriber gets its own bounded queue. A subscriber that falls behind loses its
+    oldest events instead of slowing the publisher. The latest `state` event of each job
+    is kept, so late subscribers can start from a snapshot. Publish from the event loop
+    thread.
+    """
+
+    def __init__(self, max_queue: int = 1000) -> None:
+        self.max_queue = max(1, int(max_queue))
+        self._subs: Dict[str, Set[asyncio.Queue]] = {}
+        self._last_state: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        self._subs.setdefault(job_id, set()).add(q)
+        return q
+
+    def unsubscribe(self, job_id: str, q: asyncio.Queue) -> None:
+        subs = self._subs.get(job_id)
+        if subs is not None:
+            subs.discard(q)
+            if not subs:
+                del self._subs[job_id]
+
+    def publish(self, job_id: str, event_type: str, **data: Any) -> Dict[str, Any]:
+        self._seq += 1
+        event = {"seq": self._seq, "type": event_type, "job_id": job_id, "ts": time.time(), **data}
+        if event_type == "state":
+            self._last_state[job_id] = event
+        for q in list(self._subs.get(job_id, ())):
+            if q.full():
+                try:
+                    q.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            q.put_nowait(event)
+        return event
+
+    def last_state(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._last_state.get(job_id)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import csv
+import hashlib
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+MATRIX_DIRNAME = "matrix"
+
+# Flat per-run columns of comparison.csv (metric pass rates follow as <metric>_pass_rate)
+SUMMARY_COLUMNS = [
+    "dataset_id", "model_spec", "run_id", "job_id", "state", "error",
+    "conversations", "conversation_pass_rate", "mean_weighted_pass_rate",
+    "turns", "turn_pass_rate", "latency_ms_mean", "latency_ms_p50", "latency_ms_p95",
+    "input_tokens_total", "output_tokens_total",
+]
+
+
+def matrix_id(run_ids: Iterable[str]) -> str:
+    """Deterministic id of a dataset x model matrix, derived from its run ids."""
+    blob = json.dumps(sorted(run_ids)).encode("utf-8")
+    return f"matrix-{hashlib.sha256(blob).hexdigest()[:8]}"
+
+
+def parse_provider_concurrency(value: Any = None) -> Dict[str, int]:
+    """Per-provider caps on in-flight provider calls, e.g. {"ollama": 1, "openai": 8}.
+
+    Accepts a mapping or a "provider=n,provider=n" string; falls back to the
+    PROVIDER_CONCURRENCY env var. Providers without a cap are unbounded.
+    """
+    if value is None:
+        value = os.getenv("PROVIDER_CONCURRENCY") or {}
+    if isinstance(value, str):
+        pairs = [p.split("=", 1) for p in value.split(",") if "=" in p]
+        value = {k.strip(): v.strip() for k, v in pairs}
+    caps: Dict[str, int] = {}
+    for name, n in dict(value).items():
+        try:
+            caps[str(name)] = max(1, int(n))
+        except (TypeError, ValueError):
+            continue
+    return caps
+
+
+def _rate(hits: int, total: int) -> Optional[float]:
+    return round(hits / total, 4) if total else None
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return float(ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))])
+
+
+def summarize_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Headline numbers of one run's results.json for side-by-side comparison."""
+    convs = results.get("conversations", []) or []
+    conv_pass = sum(1 for c in convs if (c.get("summary") or {}).get("conversation_pass"))
+    weighted = [
+        float((c.get("summary") or {})["weighted_pass_rate"]) for c in convs
+        if isinstance((c.get("summary") or {}).get("weighted_pass_rate"), (int, float))
+    ]
+    turns = [t for c in convs for t in (c.get("turns") or [])]
+    latencies = [float(t["latency_ms"]) for t in turns if isinstance(t.get("latency_ms"), (int, float))]
+    metric_hits: Dict[str, List[int]] = {}
+    for t in turns:
+        for name, m in (t.get("metrics") or {}).items():
+            if isinstance(m, dict) and "pass" in m and not m.get("skipped"):
+                counts = metric_hits.setdefault(name, [0, 0])
+                counts[0] += int(bool(m.get("pass")))
+                counts[1] += 1
+    return {
+        "conversations": len(convs),
+        "conversation_pass_rate": _rate(conv_pass, len(convs)),
+        "mean_weighted_pass_rate": round(sum(weighted) / len(weighted), 4) if weighted else None,
+        "turns": len(turns),
+        "turn_pass_rate": _rate(sum(1 for t in turns if t.get("turn_pass")), len(turns)),
+        "latency_ms_mean": round(sum(latencies) / len(latencies), 1) if latencies else None,
+        "latency_ms_p50": percentile(latencies, 50),
+        "latency_ms_p95": percentile(latencies, 95),
+        "input_tokens_total": results.get("input_tokens_total"),
+        "output_tokens_total": results.get("output_tokens_total"),
+        "metric_pass_rates": {name: _rate(h, n) for name, (h, n) in sorted(metric_hits.items())},
+    }
+
+
+def build_comparison(matrix: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combined view of a matrix: one entry per run plus the leading model per dataset.
+
+    `runs` items carry dataset_id, model_spec, run_id, job_id, state, error and the
+    summarize_results() fields (absent when the run produced no results).
+    """
+    best: Dict[str, Optional[str]] = {}
+    for ds in dict.fromkeys(r["dataset_id"] for r in runs):
+        scored = [r for r in runs if r["dataset_id"] == ds and r.get("conversation_pass_rate") is not None]
+        ranked = sorted(scored, key=lambda r: (r["conversation_pass_rate"], r.get("mean_weighted_pass_rate") or 0.0), reverse=True)
+        best[ds] = ranked[0]["model_spec"] if ranked else None
+    return {
+        "matrix_id": matrix,
+        "datasets": list(dict.fromkeys(r["dataset_id"] for r in runs)),
+        "models": list(dict.fromkeys(r["model_spec"] for r in runs)),
+        "runs": runs,
+        "best_model_by_dataset": best,
+    }
+
+
+def comparison_csv(comparison: Dict[str, Any]) -> str:
+    metrics = sorted({m for r in comparison.get("runs", []) for m in (r.get("metric_pass_rates") or {})})
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(SUMMARY_COLUMNS + [f"{m}_pass_rate" for m in metrics])
+    for r in comparison.get("runs", []):
+        rates = r.get("metric_pass_rates") or {}
+        w.writerow([r.get(c) for c in SUMMARY_COLUMNS] + [rates.get(m) for m in metrics])
+    return buf.getvalue()
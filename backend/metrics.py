@@ -4,9 +4,13 @@ import re
 from typing import Dict, List, Tuple, Optional
 
 try:
-    from .embeddings.ollama_embed import OllamaEmbeddings
+    from .embeddings.ollama_embed import OllamaEmbeddings, EMBED_MODEL
+    from .embeddings.embedding_store import EmbeddingStore
+    from .embeddings.similarity import cosine_scores, variant_matrix
 except ImportError:
-    from embeddings.ollama_embed import OllamaEmbeddings
+    from embeddings.ollama_embed import OllamaEmbeddings, EMBED_MODEL
+    from embeddings.embedding_store import EmbeddingStore
+    from embeddings.similarity import cosine_scores, variant_matrix
 
 
 def _normalize_text(s: str) -> str:
@@ -33,11 +37,18 @@ async def semantic_similarity(
     embedder: Optional[OllamaEmbeddings] = None,
     threshold: Optional[float] = None,
     cache: Optional[Dict[str, List[float]]] = None,
+    store: Optional[EmbeddingStore] = None,
+    matrices: Optional[Dict[Tuple[str, ...], object]] = None,
 ) -> Dict[str, object]:
     """Compute semantic similarity via embeddings.
 
     - Respects threshold argument, else falls back to SEMANTIC_THRESHOLD env (default 0.80)
     - Uses an optional cache dict[text] = embedding to avoid repeat calls within a run
+    - Consults an optional persistent EmbeddingStore for the golden variants before calling
+      the embedder; new variant vectors are written back and used at storage precision so
+      hits and misses score alike. The model output is never stored (see EmbeddingStore)
+    - Scores all variants with one matrix-vector product (NumPy); pre-normalized variant
+      matrices are reused via the optional `matrices` dict keyed by the variants tuple
     - Gracefully returns skipped=true if embeddings are unavailable
     """
     thr = threshold if threshold is not None else float(os.getenv("SEMANTIC_THRESHOLD", "0.80"))
@@ -53,11 +64,31 @@ async def semantic_similarity(
     for t in texts:
         if t not in cache:
             to_embed.append(t)
+    model = getattr(emb, "model", EMBED_MODEL)
+    golden = set(variants)
+    stored_texts = [t for t in to_embed if t in golden]
+    if store is not None and stored_texts:
+        try:
+            found = store.get_many(model, stored_texts)
+        except Exception:
+            found = [None] * len(stored_texts)
+        for t, v in zip(stored_texts, found):
+            if v is not None:
+                cache[t] = v
+        to_embed = [t for t in to_embed if t not in cache]
     try:
         if to_embed:
             vecs_new = await emb.embed(to_embed)
             if not isinstance(vecs_new, list) or len(vecs_new) != len(to_embed):
                 return {"metric": "semantic", "pass": False, "skipped": True, "reason": "unexpected embedding shape"}
+            if store is not None:
+                new_golden = [i for i, t in enumerate(to_embed) if t in golden]
+                try:
+                    stored = store.put_many(model, [to_embed[i] for i in new_golden], [vecs_new[i] for i in new_golden])
+                    for i, v in zip(new_golden, stored):
+                        vecs_new[i] = v
+                except Exception:
+                    pass
             for t, v in zip(to_embed, vecs_new):
                 cache[t] = v
         # Gather vectors
@@ -65,15 +96,13 @@ async def semantic_similarity(
         var_vecs = [cache.get(v) for v in variants]
         if out_vec is None or any(vv is None for vv in var_vecs):
             return {"metric": "semantic", "pass": False, "skipped": True, "reason": "embedding cache miss"}
-        scores: List[float] = []
-        best_idx = -1
-        best_score = -1.0
-        for i, v in enumerate(var_vecs):
-            sc = OllamaEmbeddings.cosine(out_vec, v)  # type: ignore[arg-type]
-            scores.append(sc)
-            if sc > best_score:
-                best_score = sc
-                best_idx = i
+        matrix = None
+        if matrices is not None:
+            key = tuple(variants)
+            if key not in matrices:
+                matrices[key] = variant_matrix(var_vecs)  # type: ignore[arg-type]
+            matrix = matrices[key]
+        scores, best_idx, best_score = cosine_scores(out_vec, var_vecs, matrix)  # type: ignore[arg-type]
         passed = best_score >= thr
         return {
             "metric": "semantic",
@@ -1,41 +1,84 @@
 from __future__ import annotations
 import asyncio
+import contextlib
 import hashlib
 import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     from .dataset_repo import DatasetRepository
     from .turn_runner import TurnRunner
-    from .artifacts import RunArtifactWriter
+    from .artifacts import JobStatusWriter, RunArtifactReader, RunArtifactWriter
     from .metrics import exact_match, semantic_similarity
     from .metrics_extra import consistency, adherence, hallucination
     from .conversation_scoring import aggregate_conversation
+    from .providers.response_cache import normalize_cache_mode
+    from .state_extractor import IncrementalStateExtractor
+    from .turn_log import normalize_turn_storage
+    from .compression import normalize_compression
+    from .events import EventBus
+    from .matrix import build_comparison, matrix_id, parse_provider_concurrency, percentile, summarize_results
+    from .embeddings.embedding_store import default_store, warm_texts
+    from .embeddings.batcher import EmbeddingBatcher
+    from .embeddings.ollama_embed import OllamaEmbeddings
 except ImportError:  # test fallback
     from backend.dataset_repo import DatasetRepository
     from backend.turn_runner import TurnRunner
-    from backend.artifacts import RunArtifactWriter
+    from backend.artifacts import JobStatusWriter, RunArtifactReader, RunArtifactWriter
     from backend.metrics import exact_match, semantic_similarity
     from backend.metrics_extra import consistency, adherence, hallucination
     from backend.conversation_scoring import aggregate_conversation
+    from backend.providers.response_cache import normalize_cache_mode
+    from backend.state_extractor import IncrementalStateExtractor
+    from backend.turn_log import normalize_turn_storage
+    from backend.compression import normalize_compression
+    from backend.events import EventBus
+    from backend.matrix import build_comparison, matrix_id, parse_provider_concurrency, percentile, summarize_results
+    from backend.embeddings.embedding_store import default_store, warm_texts
+    from backend.embeddings.batcher import EmbeddingBatcher
+    from backend.embeddings.ollama_embed import OllamaEmbeddings
 
 
 JobState = str  # 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled'
 
 
+def _set_event() -> asyncio.Event:
+    ev = asyncio.Event()
+    ev.set()
+    return ev
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _circuit_open(rec: Any) -> bool:
+    """True when a turn record's provider call was refused or ended with the provider's circuit open."""
+    if not isinstance(rec, dict):
+        return False
+    meta = (rec.get("response") or {}).get("provider_meta") or {}
+    return isinstance(meta, dict) and meta.get("circuit") == "open"
+
+
+# Context keys that only affect how a run executes, not what it produces
+_EXECUTION_ONLY_CONTEXT_KEYS = ("concurrency", "cache", "embed_batching", "turn_storage", "turn_blobs", "artifact_compression", "stream", "warmup")
+
+
 def compute_run_id(dataset_id: str, dataset_version: str, model_spec: str, config: Dict[str, Any]) -> str:
     # Deterministic checksum of relevant config fields
+    context = config.get("context")
+    if isinstance(context, dict):
+        context = {k: v for k, v in context.items() if k not in _EXECUTION_ONLY_CONTEXT_KEYS}
+    # No run-shaping context hashes like no context at all, so run ids stay stable
+    if not context:
+        context = None
     relevant = {
         "metrics": config.get("metrics"),
         "thresholds": config.get("thresholds"),
-        "context": config.get("context"),
+        "context": context,
     }
     blob = json.dumps(relevant, sort_keys=True).encode("utf-8")
     cksum = hashlib.sha256(blob).hexdigest()[:8]
@@ -55,13 +98,84 @@ class JobRecord:
     total_conversations: int = 0
     completed_conversations: int = 0
     error: Optional[str] = None
+    # Reuse turn records that already succeeded in this run folder (see Orchestrator.resume_run)
+    resume: bool = False
+    _task: Optional[asyncio.Task] = None
+    # Control signals: set while the job may proceed / once cancellation was requested.
+    # Paused workers block on _unpaused instead of polling, so idle jobs cost no wakeups.
+    _unpaused: asyncio.Event = field(default_factory=_set_event, repr=False)
+    _cancel_requested: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    # Persists and publishes status on every state change (Orchestrator._write_status)
+    _on_transition: Optional[Callable[["JobRecord", Optional[str], Optional[Dict[str, Any]]], None]] = field(default=None, repr=False)
+    # Live scoring state of the current run (see Orchestrator.partial_results)
+    _scoring: Optional[Dict[str, Any]] = None
+    # Dataset loaded at submit time, reused by run_job (shared by the jobs of a matrix)
+    _dataset: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    # Matrix this job was queued by; its provider caps apply to the job's calls (see submit_matrix)
+    _matrix_id: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    @property
+    def pause_requested(self) -> bool:
+        return not self._unpaused.is_set()
+
+    def request_pause(self) -> None:
+        self._unpaused.clear()
+
+    def request_resume(self) -> None:
+        self._unpaused.set()
+
+    def request_cancel(self) -> None:
+        self._cancel_requested.set()
+        self._unpaused.set()  # release paused workers so they observe the cancellation
+
+    async def wait_unpaused(self) -> bool:
+        """Block while the job is paused. Returns False when it was cancelled."""
+        while not self._unpaused.is_set():
+            await self._unpaused.wait()
+        return not self.cancel_requested
+
+    def transition(self, state: JobState, error: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """Move to `state` and persist the status once. Returns False (and writes nothing) if already there."""
+        if state == self.state:
+            return False
+        self.state = state
+        if error is not None:
+            self.error = error
+        self.updated_at = _now_iso()
+        if self._on_transition is not None:
+            self._on_transition(self, error, extra)
+        return True
+
+
+@dataclass
+class MatrixRecord:
+    """A dataset x model fan-out: one job per pair, compared once all of them finish."""
+    matrix_id: str
+    dataset_ids: List[str]
+    model_specs: List[str]
+    job_ids: List[str]
+    state: JobState = "queued"
+    created_at: str = field(default_factory=_now_iso)
+    updated_at: str = field(default_factory=_now_iso)
+    error: Optional[str] = None
+    comparison_path: Optional[str] = None
+    # Per-provider caps shared by this matrix's jobs, on top of the orchestrator-wide ones
+    provider_concurrency: Dict[str, int] = field(default_factory=dict)
     _task: Optional[asyncio.Task] = None
-    _cancel: bool = False
-    _pause: bool = False
 
 
 class Orchestrator:
-    def __init__(self, datasets_dir: Optional[Path] = None, runs_root: Optional[Path] = None, boot_id: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        datasets_dir: Optional[Path] = None,
+        runs_root: Optional[Path] = None,
+        boot_id: Optional[str] = None,
+        max_concurrent_conversations: int = 1,
+    ) -> None:
         self.repo = DatasetRepository(datasets_dir)
         self.runs_root = Path(runs_root) if runs_root else Path(__file__).resolve().parents[1] / "runs"
         self.runs_root.mkdir(parents=True, exist_ok=True)
@@ -69,7 +183,21 @@ class Orchestrator:
         self._id_seq = 0
         self._runner = TurnRunner(self.runs_root)
         self._writer = RunArtifactWriter(self.runs_root)
+        self._reader = RunArtifactReader(self.runs_root)
+        # Debounced job.json writes; also serves the latest status from memory
+        self._status = JobStatusWriter(self._writer)
         self.boot_id = boot_id or "unknown"
+        # Default conversation fan-out; a run may override it via config.context.concurrency
+        self.max_concurrent_conversations = max(1, int(max_concurrent_conversations))
+        # Persistent embedding cache shared across runs and verticals (None when disabled)
+        self.embedding_store = default_store()
+        # Live job events (state, conversation and turn progress) for streaming endpoints
+        self.events = EventBus()
+        self.matrices: Dict[str, MatrixRecord] = {}
+        # Caps on in-flight provider calls across all jobs (PROVIDER_CONCURRENCY, or set by a matrix)
+        self.provider_concurrency: Dict[str, int] = parse_provider_concurrency()
+        # (matrix_id or None, provider) -> (cap, loop, semaphore)
+        self._provider_slots: Dict[Tuple[Optional[str], str], Tuple[int, Any, asyncio.Semaphore]] = {}
 
     @staticmethod
     def parse_model_spec(model_spec: str) -> tuple[str, str]:
@@ -79,125 +207,249 @@ class Orchestrator:
             raise ValueError("model spec must be 'provider:model'")
         return parts[0], parts[1]
 
-    def submit(self, *, dataset_id: str, model_spec: str, config: Dict[str, Any]) -> JobRecord:
-        ds = self.repo.get_dataset(dataset_id)
+    def submit(
+        self,
+        *,
+        dataset_id: str,
+        model_spec: str,
+        config: Dict[str, Any],
+        resume: bool = False,
+        dataset: Optional[Dict[str, Any]] = None,
+    ) -> JobRecord:
+        """Queue a run. With resume=True, turns already recorded as ok in the run folder are not re-run.
+
+        `dataset` is an already loaded copy of the dataset (read-only; may be shared by jobs).
+        """
+        ds = dataset if dataset is not None else self.repo.get_dataset(dataset_id)
         run_id = compute_run_id(ds["dataset_id"], ds["version"], model_spec, config)
         self._id_seq += 1
         job_id = f"job-{self._id_seq:04d}"
-        jr = JobRecord(job_id=job_id, run_id=run_id, config={"dataset_id": dataset_id, "model_spec": model_spec, **config})
+        jr = JobRecord(job_id=job_id, run_id=run_id, config={"dataset_id": dataset_id, "model_spec": model_spec, **config}, resume=resume)
         jr.total_conversations = len(ds.get("conversations", []))
+        jr._dataset = ds
+        jr._on_transition = self._write_status
         self.jobs[job_id] = jr
         # persist initial job status
+        self._write_status(jr)
+        return jr
+
+    def resume_run(self, run_id: str) -> JobRecord:
+        """Queue a new job that completes an interrupted run from its run_config.json.
+
+        Only conversations/turns without an ok turn record are sent to the provider; the
+        run is then scored and aggregated as a whole. Raises FileNotFoundError when the
+        run has no run_config.json and ValueError when the dataset or config no longer
+        map to this run_id (e.g. the dataset version changed).
+        """
+        cfg_path = self.runs_root / run_id / "run_config.json"  # layout paths would create the folder
+        if not cfg_path.exists():
+            raise FileNotFoundError(f"run config not found for {run_id}")
+        saved = json.loads(cfg_path.read_text(encoding="utf-8"))
+        dataset_id, model_spec = saved.get("dataset_id"), saved.get("model_spec")
+        config = {k: v for k, v in saved.items() if k not in ("dataset_id", "model_spec")}
+        ds = self.repo.get_dataset(dataset_id)
+        if compute_run_id(ds["dataset_id"], ds["version"], model_spec, config) != run_id:
+            raise ValueError(f"dataset or run config changed since {run_id} started; it cannot be resumed")
+        return self.submit(dataset_id=dataset_id, model_spec=model_spec, config=config, resume=True)
+
+    def _completed_turns(self, run_id: str) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        """Turn records of a run whose provider call succeeded, by conversation_id then turn_index."""
         try:
-            self._writer.write_job_status(run_id, {
-                "job_id": job_id,
-                "run_id": run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": None,
-                "boot_id": self.boot_id,
-            })
+            by_conv = self._reader.read_turn_records_by_conversation(run_id)
         except Exception:
-            pass
-        return jr
+            return {}
+        return {
+            cid: {
+                r["turn_index"]: r for r in records
+                if isinstance(r.get("turn_index"), int) and (r.get("response") or {}).get("ok")
+            }
+            for cid, records in by_conv.items()
+        }
 
     def cancel(self, job_id: str) -> None:
         jr = self.jobs[job_id]
-        jr._cancel = True
-        jr.updated_at = _now_iso()
+        jr.request_cancel()
         # If there's an active task, cancel it immediately and mark cancelled
         if jr._task and not jr._task.done():
             try:
                 jr._task.cancel()
             except Exception:
                 pass
-            jr.state = "cancelled"
+            state = "cancelled"
         else:
             # If not yet started or already paused, mark cancelled
-            jr.state = "cancelled" if jr.state in ("queued", "paused") else "cancelling"
-        try:
-            self._writer.write_job_status(jr.run_id, {
-                "job_id": jr.job_id,
-                "run_id": jr.run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": "cancelled by user" if jr.state == "cancelled" else None,
-                "boot_id": self.boot_id,
-            })
-        except Exception:
-            pass
+            state = "cancelled" if jr.state in ("queued", "paused") else "cancelling"
+        jr.transition(state, "cancelled by user" if state == "cancelled" else None)
 
     def pause(self, job_id: str) -> None:
         jr = self.jobs[job_id]
         if jr.state in ("succeeded", "failed", "cancelled") or (jr._task and jr._task.done()):
             raise RuntimeError("cannot pause a completed job")
-        if jr.state == "paused":
-            return
-        jr._pause = True
-        jr.state = "paused"
-        jr.updated_at = _now_iso()
-        try:
-            self._writer.write_job_status(jr.run_id, {
-                "job_id": jr.job_id,
-                "run_id": jr.run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": None,
-                "boot_id": self.boot_id,
-            })
-        except Exception:
-            pass
+        jr.request_pause()
+        jr.transition("paused")
 
     def resume(self, job_id: str) -> None:
         jr = self.jobs[job_id]
         if jr.state in ("succeeded", "failed", "cancelled") or (jr._task and jr._task.done()):
             raise RuntimeError("cannot resume a completed job")
-        jr._pause = False
-        jr.state = "running"
-        jr.updated_at = _now_iso()
+        jr.error = None
+        # a resume is the user's signal to try providers again without waiting out a breaker cooldown
+        for breaker in self._runner.providers.breakers.values():
+            breaker.probe()
+        jr.request_resume()
+        jr.transition("running")
+
+    def _write_status(self, jr: JobRecord, error: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Record the job status (job.json, debounced) and publish it as a `state` event."""
+        status = {
+            "job_id": jr.job_id,
+            "run_id": jr.run_id,
+            "state": jr.state,
+            "progress_pct": jr.progress_pct,
+            "total_conversations": jr.total_conversations,
+            "completed_conversations": jr.completed_conversations,
+            "error": error if error is not None else jr.error,
+            "boot_id": self.boot_id,
+            **(extra or {}),
+        }
         try:
-            self._writer.write_job_status(jr.run_id, {
-                "job_id": jr.job_id,
-                "run_id": jr.run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": None,
-                "boot_id": self.boot_id,
-            })
+            self._status.update(jr.run_id, status)
         except Exception:
             pass
+        self.events.publish(jr.job_id, "state", **{k: v for k, v in status.items() if k not in ("job_id", "boot_id")})
+
+    def status_snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Latest status of an unfinished in-memory job, served from memory (None once it finished)."""
+        return self._status.snapshot(job_id)
+
+    def _resolve_concurrency(self, jr: JobRecord) -> int:
+        # Run config context.concurrency wins over the orchestrator default
+        raw = (jr.config.get("context") or {}).get("concurrency")
+        try:
+            n = int(raw) if raw is not None else int(self.max_concurrent_conversations)
+        except (TypeError, ValueError):
+            n = int(self.max_concurrent_conversations)
+        return max(1, n)
+
+    def _provider_slot(self, provider: str, jr: JobRecord) -> Any:
+        """Async context bounding in-flight calls to a provider (a no-op when it has no cap).
+
+        A job queued by a matrix that caps this provider shares that matrix's slots;
+        other jobs use the orchestrator-wide caps.
+        """
+        mr = self.matrices.get(jr._matrix_id) if jr._matrix_id else None
+        if mr is not None and mr.provider_concurrency.get(provider):
+            scope: Optional[str] = mr.matrix_id
+            cap = mr.provider_concurrency[provider]
+        else:
+            scope, cap = None, self.provider_concurrency.get(provider)
+        if not cap:
+            return contextlib.nullcontext()
+        # semaphores bind to one event loop; the CLI runs each job under its own asyncio.run()
+        loop = asyncio.get_running_loop()
+        held = self._provider_slots.get((scope, provider))
+        if held is None or held[0] != cap or held[1] is not loop:
+            held = (cap, loop, asyncio.Semaphore(cap))
+            self._provider_slots[(scope, provider)] = held
+        return held[2]
+
+    async def _gate(self, jr: JobRecord) -> bool:
+        """Honor pause/cancel between units of work. Returns False when the job was cancelled."""
+        if jr.cancel_requested:
+            return False
+        if jr.pause_requested:
+            jr.transition("paused")
+            if not await jr.wait_unpaused():
+                return False
+            if jr.state == "paused":
+                jr.transition("running")
+        return True
+
+    async def _run_conversation(
+        self,
+        jr: JobRecord,
+        conv: Dict[str, Any],
+        *,
+        provider: str,
+        model: str,
+        domain: str,
+        params_override: Optional[Dict[str, Any]],
+        cache_mode: str = "off",
+        on_turn: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        storage: str = "files",
+        blobs: bool = True,
+        compression: str = "off",
+        completed: Optional[Dict[int, Dict[str, Any]]] = None,
+        stream: bool = False,
+    ) -> bool:
+        """Run every user turn of one conversation in order. Returns False if cancelled.
+
+        `on_turn(turn_index, record)` receives each completed turn record for scoring.
+        Turns found in `completed` (records from an earlier attempt) are reused as is.
+        """
+        # Pause gate before each conversation and between turns
+        if not await self._gate(jr):
+            return False
+        conv_id = conv.get("conversation_id")
+        conv_meta = (conv.get("metadata") or {}) if isinstance(conv.get("metadata"), dict) else {}
+        turns = conv.get("turns", [])
+        # State is carried forward across this conversation's turns instead of re-scanning the prefix
+        extractor = IncrementalStateExtractor(domain)
+        # iterate user turns only
+        for idx, t in enumerate(turns):
+            if t.get("role") != "user":
+                continue
+            if completed and idx in completed:
+                if on_turn is not None:
+                    on_turn(idx, completed[idx])
+                continue
+            if not await self._gate(jr):
+                return False
+            while True:
+                async with self._provider_slot(provider, jr):
+                    rec = await self._runner.run_turn(
+                        run_id=jr.run_id,
+                        provider=provider,
+                        model=model,
+                        domain=domain,
+                        conversation_id=conv_id,
+                        turn_index=idx,
+                        turns=turns[: idx + 1],
+                        conv_meta=conv_meta,
+                        params_override=params_override,
+                        cache_mode=cache_mode,
+                        extractor=extractor,
+                        storage=storage,
+                        blobs=blobs,
+                        compression=compression,
+                        stream=stream,
+                        cancel=jr._cancel_requested,
+                    )
+                if not _circuit_open(rec):
+                    break
+                # The provider keeps failing: pause the job rather than fail the rest of the
+                # dataset, and run this turn again once the user resumes
+                jr.request_pause()
+                jr.transition("paused", error=f"provider {provider} circuit open; resume to retry")
+                if not await self._gate(jr):
+                    return False
+            if on_turn is not None and isinstance(rec, dict):
+                on_turn(idx, rec)
+        jr.completed_conversations += 1
+        jr.progress_pct = int(jr.completed_conversations * 100 / max(1, jr.total_conversations))
+        jr.updated_at = _now_iso()
+        self._write_status(jr)
+        return True
 
     async def run_job(self, job_id: str) -> JobRecord:
         jr = self.jobs[job_id]
         try:
             if jr.state not in ("queued",):
                 return jr
-            jr.state = "running"
-            jr.updated_at = _now_iso()
-            # write running status
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": None,
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
+            jr.transition("running")
 
-            ds = self.repo.get_dataset(jr.config["dataset_id"])
+            ds = jr._dataset if jr._dataset is not None else self.repo.get_dataset(jr.config["dataset_id"])
+            jr._dataset = None  # finished jobs stay in self.jobs; do not pin the dataset
             provider, model = self.parse_model_spec(jr.config["model_spec"])  # e.g., 'ollama', 'llama3.2:2b'
             domain = ds.get("metadata", {}).get("domain", "commerce")
             # Normalize metric selection from run config
@@ -258,173 +510,41 @@ class Orchestrator:
                     "case_type": case_type,
                 }
 
-            # Simple per-run embedding cache for semantic metric
+            # Per-run embedding cache for semantic metric (backed by the persistent store)
             embed_cache: Dict[str, List[float]] = {}
+            # Pre-normalized variant matrices per golden turn, keyed by the variants tuple
+            variant_matrices: Dict[tuple, Any] = {}
+            # Semantic lookups from concurrently scored conversations share embedding requests;
+            # context.embed_batching = {max_batch, linger_ms} overrides EMBED_BATCH_SIZE/EMBED_BATCH_LINGER_MS
+            batching_cfg = (jr.config.get("context") or {}).get("embed_batching") or {}
+            embed_batcher = EmbeddingBatcher(
+                OllamaEmbeddings(),
+                max_batch=batching_cfg.get("max_batch"),
+                linger_ms=batching_cfg.get("linger_ms"),
+            )
 
-            for conv in ds.get("conversations", []):
-                if jr._cancel:
-                    jr.state = "cancelled"
-                    jr.updated_at = _now_iso()
-                    try:
-                        self._writer.write_job_status(jr.run_id, {
-                            "job_id": jr.job_id,
-                            "run_id": jr.run_id,
-                            "state": jr.state,
-                            "progress_pct": jr.progress_pct,
-                            "total_conversations": jr.total_conversations,
-                            "completed_conversations": jr.completed_conversations,
-                            "error": None,
-                            "boot_id": self.boot_id,
-                        })
-                    except Exception:
-                        pass
-                    return jr
-                # Pause gate before each conversation and between turns
-                if jr._pause:
-                    jr.state = "paused"
-                    jr.updated_at = _now_iso()
-                    try:
-                        self._writer.write_job_status(jr.run_id, {
-                            "job_id": jr.job_id,
-                            "run_id": jr.run_id,
-                            "state": jr.state,
-                            "progress_pct": jr.progress_pct,
-                            "total_conversations": jr.total_conversations,
-                            "completed_conversations": jr.completed_conversations,
-                            "error": None,
-                            "boot_id": self.boot_id,
-                        })
-                    except Exception:
-                        pass
-                    # wait until unpaused or cancelled
-                    while jr._pause and not jr._cancel:
-                        await asyncio.sleep(0.3)
-                    if jr._cancel:
-                        jr.state = "cancelled"
-                        jr.updated_at = _now_iso()
-                        return jr
-                    jr.state = "running"
-                    jr.updated_at = _now_iso()
-                    try:
-                        self._writer.write_job_status(jr.run_id, {
-                            "job_id": jr.job_id,
-                            "run_id": jr.run_id,
-                            "state": jr.state,
-                            "progress_pct": jr.progress_pct,
-                            "total_conversations": jr.total_conversations,
-                            "completed_conversations": jr.completed_conversations,
-                            "error": None,
-                            "boot_id": self.boot_id,
-                        })
-                    except Exception:
-                        pass
-                conv_id = conv.get("conversation_id")
-                conv_meta = (conv.get("metadata") or {}) if isinstance(conv.get("metadata"), dict) else {}
-                turns = conv.get("turns", [])
-                # iterate user turns only
-                for idx, t in enumerate(turns):
-                    if t.get("role") == "user":
-                        # inner pause gate before each user turn
-                        if jr._cancel:
-                            jr.state = "cancelled"
-                            jr.updated_at = _now_iso()
-                            try:
-                                self._writer.write_job_status(jr.run_id, {
-                                    "job_id": jr.job_id,
-                                    "run_id": jr.run_id,
-                                    "state": jr.state,
-                                    "progress_pct": jr.progress_pct,
-                                    "total_conversations": jr.total_conversations,
-                                    "completed_conversations": jr.completed_conversations,
-                                    "error": None,
-                                    "boot_id": self.boot_id,
-                                })
-                            except Exception:
-                                pass
-                            return jr
-                        if jr._pause:
-                            jr.state = "paused"
-                            jr.updated_at = _now_iso()
-                            try:
-                                self._writer.write_job_status(jr.run_id, {
-                                    "job_id": jr.job_id,
-                                    "run_id": jr.run_id,
-                                    "state": jr.state,
-                                    "progress_pct": jr.progress_pct,
-                                    "total_conversations": jr.total_conversations,
-                                    "completed_conversations": jr.completed_conversations,
-                                    "error": None,
-                                    "boot_id": self.boot_id,
-                                })
-                            except Exception:
-                                pass
-                            while jr._pause and not jr._cancel:
-                                await asyncio.sleep(0.3)
-                            if jr._cancel:
-                                jr.state = "cancelled"
-                                jr.updated_at = _now_iso()
-                                try:
-                                    self._writer.write_job_status(jr.run_id, {
-                                        "job_id": jr.job_id,
-                                        "run_id": jr.run_id,
-                                        "state": jr.state,
-                                        "progress_pct": jr.progress_pct,
-                                        "total_conversations": jr.total_conversations,
-                                        "completed_conversations": jr.completed_conversations,
-                                        "error": None,
-                                        "boot_id": self.boot_id,
-                                    })
-                                except Exception:
-                                    pass
-                                return jr
-                            jr.state = "running"
-                            jr.updated_at = _now_iso()
-                            try:
-                                self._writer.write_job_status(jr.run_id, {
-                                    "job_id": jr.job_id,
-                                    "run_id": jr.run_id,
-                                    "state": jr.state,
-                                    "progress_pct": jr.progress_pct,
-                                    "total_conversations": jr.total_conversations,
-                                    "completed_conversations": jr.completed_conversations,
-                                    "error": None,
-                                    "boot_id": self.boot_id,
-                                })
-                            except Exception:
-                                pass
-                        # Allow run-level decoding overrides via config.context.params
-                        params_override = None
-                        try:
-                            params_override = (jr.config.get("context") or {}).get("params")
-                        except Exception:
-                            params_override = None
-                        await self._runner.run_turn(
-                            run_id=jr.run_id,
-                            provider=provider,
-                            model=model,
-                            domain=domain,
-                            conversation_id=conv_id,
-                            turn_index=idx,
-                            turns=turns[: idx + 1],
-                            conv_meta=conv_meta,
-                            params_override=params_override,
-                        )
-                jr.completed_conversations += 1
-                jr.progress_pct = int(jr.completed_conversations * 100 / max(1, jr.total_conversations))
-                jr.updated_at = _now_iso()
-                try:
-                    self._writer.write_job_status(jr.run_id, {
-                        "job_id": jr.job_id,
-                        "run_id": jr.run_id,
-                        "state": jr.state,
-                        "progress_pct": jr.progress_pct,
-                        "total_conversations": jr.total_conversations,
-                        "completed_conversations": jr.completed_conversations,
-                        "error": None,
-                        "boot_id": self.boot_id,
-                    })
-                except Exception:
-                    pass
+            # Allow run-level decoding overrides via config.context.params
+            params_override = None
+            try:
+                params_override = (jr.config.get("context") or {}).get("params")
+            except Exception:
+                params_override = None
+            # Deterministic response cache: off | read | readwrite (context.cache)
+            cache_mode = normalize_cache_mode((jr.config.get("context") or {}).get("cache"))
+            # Turn record storage: per-turn JSON files (default) or the run's append-only JSONL log
+            storage = normalize_turn_storage((jr.config.get("context") or {}).get("turn_storage"))
+            if jr.resume:
+                # A resumed run keeps writing where its earlier records are, whatever turn_storage says now
+                storage = self._runner.stored_turn_storage(jr.run_id) or storage
+            else:
+                # run ids ignore storage options: clear turn records an earlier run left in this folder
+                self._runner.reset_run(jr.run_id)
+            # Large message bodies go to the run's content-addressed blob store unless turn_blobs=false
+            blobs = (jr.config.get("context") or {}).get("turn_blobs") is not False
+            # Turn records and results compressed with gzip/zstd (ARTIFACT_COMPRESSION sets the default)
+            compression = normalize_compression((jr.config.get("context") or {}).get("artifact_compression"))
+            # Streamed provider calls report time-to-first-token and decode speed (context.stream)
+            stream = (jr.config.get("context") or {}).get("stream") is True
 
             # Aggregate results across conversations and write artifacts
             results: Dict[str, Any] = {
@@ -436,40 +556,30 @@ class Orchestrator:
             # Accumulate token usage across all turns
             total_input_tokens = 0
             total_output_tokens = 0
+            cache_hits = 0
+            cache_misses = 0
+            # Time spent waiting for provider rate limits and 429/503 responses seen by this run
+            throttling: Dict[str, int] = {"throttled_turns": 0, "throttle_ms": 0, "rate_limited_responses": 0, "retries": 0}
+            # Model load time reported by Ollama per turn, kept out of turn latency
+            model_load: Dict[str, float] = {"turn_load_ms_total": 0.0, "turn_load_ms_max": 0.0}
+            # Per-turn time-to-first-token and decode speed of streamed responses
+            ttft_values: List[float] = []
+            tps_values: List[float] = []
             # include dataset/domain short description if present
             try:
                 results["domain_description"] = (ds.get("metadata", {}) or {}).get("short_description")
             except Exception:
                 pass
 
-            for conv in ds.get("conversations", []):
+            # Scoring runs alongside the provider calls: each completed turn record is queued
+            # to metric workers, so results accumulate mid-run (see partial_results()).
+            scoring: Dict[str, Any] = {"contexts": [], "turns_scored": 0, "turns_passed": 0, "turns_resumed": 0}
+            jr._scoring = scoring
+
+            def _open_conversation(conv: Dict[str, Any]) -> Dict[str, Any]:
                 cid = conv.get("conversation_id")
-                # Locate conversation trace directory (support both hashed and plain layouts)
-                try:
-                    from .artifacts import RunFolderLayout  # type: ignore
-                except Exception:
-                    from artifacts import RunFolderLayout  # type: ignore
-                # Prefer plain layout used by TurnRunner in tests; fallback to hashed
-                conv_dir_plain = self.runs_root / jr.run_id / "conversations" / cid
-                conv_dir_hashed = RunFolderLayout(self.runs_root).conversation_subdir(jr.run_id, cid)
-                if conv_dir_plain.exists():
-                    conv_dir = conv_dir_plain
-                elif conv_dir_hashed.exists():
-                    conv_dir = conv_dir_hashed
-                else:
-                    # default to hashed to avoid path length issues
-                    conv_dir = conv_dir_hashed
-                turn_files = sorted(conv_dir.glob("turn_*.json"))
-                per_turn: List[Dict[str, Any]] = []
                 identity = _conv_identity(conv)
                 # Preserve axes for downstream risk rollups
-                try:
-                    axes = (conv.get("metadata") or {}).get("axes") or {}
-                    if isinstance(axes, dict):
-                        identity["axes"] = axes
-                except Exception:
-                    pass
-                # attach axes for downstream rollups/reporting
                 try:
                     axes = (conv.get("metadata") or {}).get("axes") or {}
                     if isinstance(axes, dict):
@@ -495,128 +605,219 @@ class Orchestrator:
                     print(f"[DEBUG] Failed to load golden for {cid}: {e}", file=sys.stderr)
                     pass
 
-                last_state: Dict[str, Any] = {}
-                for tf in turn_files:
-                    try:
-                        rec = json.loads(tf.read_text(encoding="utf-8"))
-                    except Exception:
-                        continue
-                    out_text = ((rec.get("response", {}) or {}).get("content")) or ""
-                    uidx = int(rec.get("turn_index", 0))
-                    # Token accounting from provider metadata when available; otherwise approximate
-                    try:
-                        pm = ((rec.get("response", {}) or {}).get("provider_meta") or {})
-                        usage = pm.get("usage") if isinstance(pm, dict) else None
-                        in_tok = None
-                        out_tok = None
-                        if isinstance(usage, dict):
-                            # OpenAI-style usage
-                            if "prompt_tokens" in usage:
-                                in_tok = int(usage.get("prompt_tokens") or 0)
-                            if "completion_tokens" in usage:
-                                out_tok = int(usage.get("completion_tokens") or 0)
-                            if in_tok is None and "input_tokens" in usage:
-                                in_tok = int(usage.get("input_tokens") or 0)
-                            if out_tok is None and "output_tokens" in usage:
-                                out_tok = int(usage.get("output_tokens") or 0)
-                        # Ollama-style counters
-                        if in_tok is None and isinstance(pm, dict) and "prompt_eval_count" in pm:
-                            try:
-                                in_tok = int(pm.get("prompt_eval_count") or 0)
-                            except Exception:
-                                in_tok = 0
-                        if out_tok is None and isinstance(pm, dict) and "eval_count" in pm:
-                            try:
-                                out_tok = int(pm.get("eval_count") or 0)
-                            except Exception:
-                                out_tok = 0
-                        # Fallback to rough estimates if still missing
-                        if in_tok is None:
-                            try:
-                                ctx_est = int((rec.get("context_audit", {}) or {}).get("token_estimate") or 0)
-                            except Exception:
-                                ctx_est = 0
-                            in_tok = ctx_est
-                        if out_tok is None:
-                            try:
-                                out_tok = max(0, int(len(out_text) / 4.0))
-                            except Exception:
-                                out_tok = 0
-                        total_input_tokens += int(in_tok or 0)
-                        total_output_tokens += int(out_tok or 0)
-                    except Exception:
-                        pass
-                    # Robust mapping of user turn index -> assistant turn index in golden
-                    # Preferred (convgen_v2): A1=1, A2=3 => assistant_idx = 2*uidx + 1
-                    cand_idxs = [2 * uidx + 1, uidx + 1, uidx]
-                    # derive user prompt snippet from dataset conversation
+                ctx: Dict[str, Any] = {
+                    "conv": conv,
+                    "conversation_id": cid,
+                    "identity": identity,
+                    "golden_entry": golden_entry,
+                    "golden_outcome": golden_outcome,
+                    "golden_constraints": golden_constraints,
+                    "per_turn": [],
+                    "states": {},
+                    "pending": 0,
+                    "closed": False,
+                    "result": None,
+                }
+                scoring["contexts"].append(ctx)
+                return ctx
+
+            async def _score_turn(ctx: Dict[str, Any], turn_index: int, rec: Dict[str, Any]) -> None:
+                nonlocal total_input_tokens, total_output_tokens, cache_hits, cache_misses
+                conv = ctx["conv"]
+                golden_entry = ctx["golden_entry"]
+                golden_outcome = ctx["golden_outcome"]
+                golden_constraints = ctx["golden_constraints"]
+                out_text = ((rec.get("response", {}) or {}).get("content")) or ""
+                uidx = int(rec.get("turn_index", turn_index))
+                cache_rec = rec.get("cache") or {}
+                if cache_rec.get("mode") not in (None, "off"):
+                    if cache_rec.get("hit"):
+                        cache_hits += 1
+                    else:
+                        cache_misses += 1
+                meta = (rec.get("response", {}) or {}).get("provider_meta") or {}
+                if isinstance(meta, dict):
+                    if int(meta.get("throttle_ms") or 0) > 0:
+                        throttling["throttled_turns"] += 1
+                        throttling["throttle_ms"] += int(meta["throttle_ms"])
+                    if meta.get("status") in (429, 503):
+                        throttling["rate_limited_responses"] += 1
+                    throttling["retries"] += int(meta.get("retries") or 0)
+                    if meta.get("ttft_ms") is not None:
+                        ttft_values.append(float(meta["ttft_ms"]))
+                    if meta.get("tokens_per_sec") is not None:
+                        tps_values.append(float(meta["tokens_per_sec"]))
+                latency_ms = (rec.get("response", {}) or {}).get("latency_ms")
+                load_ms = meta.get("load_ms") if isinstance(meta, dict) else None
+                if isinstance(load_ms, (int, float)):
+                    model_load["turn_load_ms_total"] += float(load_ms)
+                    model_load["turn_load_ms_max"] = max(model_load["turn_load_ms_max"], float(load_ms))
+                    if isinstance(latency_ms, (int, float)):
+                        latency_ms = max(0, int(latency_ms - load_ms))
+                # Token accounting from provider metadata when available; otherwise approximate
+                turn_tokens: tuple = (None, None)
+                try:
+                    pm = ((rec.get("response", {}) or {}).get("provider_meta") or {})
+                    usage = pm.get("usage") if isinstance(pm, dict) else None
+                    in_tok = None
+                    out_tok = None
+                    if isinstance(usage, dict):
+                        # OpenAI-style usage
+                        if "prompt_tokens" in usage:
+                            in_tok = int(usage.get("prompt_tokens") or 0)
+                        if "completion_tokens" in usage:
+                            out_tok = int(usage.get("completion_tokens") or 0)
+                        if in_tok is None and "input_tokens" in usage:
+                            in_tok = int(usage.get("input_tokens") or 0)
+                        if out_tok is None and "output_tokens" in usage:
+                            out_tok = int(usage.get("output_tokens") or 0)
+                        # Gemini usageMetadata
+                        if in_tok is None and "promptTokenCount" in usage:
+                            in_tok = int(usage.get("promptTokenCount") or 0)
+                        if out_tok is None and "candidatesTokenCount" in usage:
+                            out_tok = int(usage.get("candidatesTokenCount") or 0)
+                    # Ollama-style counters
+                    if in_tok is None and isinstance(pm, dict) and "prompt_eval_count" in pm:
+                        try:
+                            in_tok = int(pm.get("prompt_eval_count") or 0)
+                        except Exception:
+                            in_tok = 0
+                    if out_tok is None and isinstance(pm, dict) and "eval_count" in pm:
+                        try:
+                            out_tok = int(pm.get("eval_count") or 0)
+                        except Exception:
+                            out_tok = 0
+                    # Fallback to rough estimates if still missing
+                    if in_tok is None:
+                        try:
+                            ctx_est = int((rec.get("context_audit", {}) or {}).get("token_estimate") or 0)
+                        except Exception:
+                            ctx_est = 0
+                        in_tok = ctx_est
+                    if out_tok is None:
+                        try:
+                            out_tok = max(0, int(len(out_text) / 4.0))
+                        except Exception:
+                            out_tok = 0
+                    total_input_tokens += int(in_tok or 0)
+                    total_output_tokens += int(out_tok or 0)
+                    turn_tokens = (int(in_tok or 0), int(out_tok or 0))
+                except Exception:
+                    pass
+                # Robust mapping of user turn index -> assistant turn index in golden
+                # Preferred (convgen_v2): A1=1, A2=3 => assistant_idx = 2*uidx + 1
+                cand_idxs = [2 * uidx + 1, uidx + 1, uidx]
+                # derive user prompt snippet from dataset conversation
+                user_text = ""
+                try:
+                    tlist = conv.get("turns", []) or []
+                    if 0 <= uidx < len(tlist):
+                        user_text = str(tlist[uidx].get("text") or "")
+                except Exception:
                     user_text = ""
-                    try:
-                        tlist = conv.get("turns", []) or []
-                        if 0 <= uidx < len(tlist):
-                            user_text = str(tlist[uidx].get("text") or "")
-                    except Exception:
-                        user_text = ""
-                    def _snippet(t: str, n: int = 160) -> str:
-                        t = (t or "").strip().replace("\n", " ")
-                        return t if len(t) <= n else (t[: n - 1] + "…")
-                    mets: Dict[str, Any] = {}
-                    # exact (if selected and golden exists)
-                    exp_variants = []
-                    if golden_entry:
-                        # pick first matching candidate index
-                        for ax in cand_idxs:
-                            if ax in golden_entry:
-                                exp_variants = golden_entry[ax]
-                                break
-                        if "exact" in metrics_wanted:
-                            try:
-                                mets["exact"] = exact_match(out_text, exp_variants)
-                            except Exception as e:
-                                mets["exact"] = {"metric": "exact", "pass": False, "error": str(e)}
-                        if "semantic" in metrics_wanted:
-                            try:
-                                # semantic may fail if embeddings not available
-                                thr = (jr.config.get("thresholds", {}) or {}).get("semantic")
-                                if thr is None:
-                                    thr = (jr.config.get("thresholds", {}) or {}).get("semantic_threshold")
-                                mets["semantic"] = await semantic_similarity(out_text, exp_variants, threshold=thr, cache=embed_cache)
-                            except Exception as e:
-                                mets["semantic"] = {"metric": "semantic", "pass": False, "error": str(e)}
-                    # policy/consistency metrics don't require gold variants
-                    try:
-                        mets["consistency"] = consistency(out_text, rec.get("state") or {})
-                    except Exception as e:
-                        mets["consistency"] = {"metric": "consistency", "pass": False, "error": str(e)}
-                    try:
-                        exp_decision = (golden_outcome or {}).get("decision")
-                        mets["adherence"] = adherence(out_text, golden_constraints, expected_decision=exp_decision)
-                    except Exception as e:
-                        mets["adherence"] = {"metric": "adherence", "pass": False, "error": str(e)}
-                    try:
-                        history_msgs = [m.get("content", "") for m in (rec.get("request", {}) or {}).get("messages", [])]
-                        # Threshold from run config or settings
-                        thr = (jr.config.get("thresholds", {}) or {}).get("hallucination_threshold")
-                        mets["hallucination"] = hallucination(out_text, rec.get("state") or {}, history_msgs, threshold=thr)
-                    except Exception as e:
-                        mets["hallucination"] = {"metric": "hallucination", "pass": False, "error": str(e)}
+                def _snippet(t: str, n: int = 160) -> str:
+                    t = (t or "").strip().replace("\n", " ")
+                    return t if len(t) <= n else (t[: n - 1] + "…")
+                mets: Dict[str, Any] = {}
+                # exact (if selected and golden exists)
+                exp_variants = []
+                if golden_entry:
+                    # pick first matching candidate index
+                    for ax in cand_idxs:
+                        if ax in golden_entry:
+                            exp_variants = golden_entry[ax]
+                            break
+                    if "exact" in metrics_wanted:
+                        try:
+                            mets["exact"] = exact_match(out_text, exp_variants)
+                        except Exception as e:
+                            mets["exact"] = {"metric": "exact", "pass": False, "error": str(e)}
+                    if "semantic" in metrics_wanted:
+                        try:
+                            # semantic may fail if embeddings not available
+                            thr = (jr.config.get("thresholds", {}) or {}).get("semantic")
+                            if thr is None:
+                                thr = (jr.config.get("thresholds", {}) or {}).get("semantic_threshold")
+                            mets["semantic"] = await semantic_similarity(out_text, exp_variants, threshold=thr, embedder=embed_batcher, cache=embed_cache, store=self.embedding_store, matrices=variant_matrices)
+                        except Exception as e:
+                            mets["semantic"] = {"metric": "semantic", "pass": False, "error": str(e)}
+                # policy/consistency metrics don't require gold variants
+                try:
+                    mets["consistency"] = consistency(out_text, rec.get("state") or {})
+                except Exception as e:
+                    mets["consistency"] = {"metric": "consistency", "pass": False, "error": str(e)}
+                try:
+                    exp_decision = (golden_outcome or {}).get("decision")
+                    mets["adherence"] = adherence(out_text, golden_constraints, expected_decision=exp_decision)
+                except Exception as e:
+                    mets["adherence"] = {"metric": "adherence", "pass": False, "error": str(e)}
+                try:
+                    history_msgs = [m.get("content", "") for m in (rec.get("request", {}) or {}).get("messages", [])]
+                    # Threshold from run config or settings
+                    thr = (jr.config.get("thresholds", {}) or {}).get("hallucination_threshold")
+                    mets["hallucination"] = hallucination(out_text, rec.get("state") or {}, history_msgs, threshold=thr)
+                except Exception as e:
+                    mets["hallucination"] = {"metric": "hallucination", "pass": False, "error": str(e)}
 
-                    # compute turn_pass ignoring metrics that were explicitly skipped
-                    try:
-                        considered = [v for v in mets.values() if isinstance(v, dict) and ("pass" in v) and not v.get("skipped")]
-                        pass_vals = [bool(v.get("pass")) for v in considered]
-                        turn_pass = all(pass_vals) if pass_vals else True
-                    except Exception:
-                        turn_pass = False
-                    per_turn.append({
-                        "turn_index": uidx,
-                        "metrics": mets,
-                        "turn_pass": turn_pass,
-                        "user_prompt_snippet": _snippet(user_text),
-                        "assistant_output_snippet": _snippet(out_text, 200),
-                    })
-                    last_state = rec.get("state") or last_state
+                # compute turn_pass ignoring metrics that were explicitly skipped
+                try:
+                    considered = [v for v in mets.values() if isinstance(v, dict) and ("pass" in v) and not v.get("skipped")]
+                    pass_vals = [bool(v.get("pass")) for v in considered]
+                    turn_pass = all(pass_vals) if pass_vals else True
+                except Exception:
+                    turn_pass = False
+                ctx["per_turn"].append({
+                    "turn_index": uidx,
+                    "metrics": mets,
+                    "turn_pass": turn_pass,
+                    "user_prompt_snippet": _snippet(user_text),
+                    "assistant_output_snippet": _snippet(out_text, 200),
+                    "latency_ms": latency_ms,
+                    "load_ms": load_ms,
+                    "input_tokens": turn_tokens[0],
+                    "output_tokens": turn_tokens[1],
+                    "cache_hit": bool(cache_rec.get("hit")),
+                    "throttle_ms": meta.get("throttle_ms") if isinstance(meta, dict) else None,
+                    "ttft_ms": meta.get("ttft_ms") if isinstance(meta, dict) else None,
+                    "tokens_per_sec": meta.get("tokens_per_sec") if isinstance(meta, dict) else None,
+                })
+                ctx["states"][uidx] = rec.get("state") or {}
+                scoring["turns_scored"] += 1
+                scoring["turns_passed"] += int(bool(turn_pass))
+                self.events.publish(
+                    jr.job_id, "turn",
+                    run_id=jr.run_id,
+                    conversation_id=ctx["conversation_id"],
+                    turn_index=uidx,
+                    turn_pass=turn_pass,
+                    latency_ms=latency_ms,
+                    turns_scored=scoring["turns_scored"],
+                    pass_rate=round(scoring["turns_passed"] / scoring["turns_scored"], 4),
+                )
 
+            def _finish_conversation(ctx: Dict[str, Any]) -> None:
+                conv = ctx["conv"]
+                cid = ctx["conversation_id"]
+                identity = ctx["identity"]
+                golden_outcome = ctx["golden_outcome"]
+                # workers may finish a conversation's turns out of order
+                per_turn = sorted(ctx["per_turn"], key=lambda t: t.get("turn_index", 0))
+                last_state: Dict[str, Any] = {}
+                for uidx in sorted(ctx["states"]):
+                    last_state = ctx["states"][uidx] or last_state
+                # Locate conversation trace directory (support both hashed and plain layouts)
+                try:
+                    from .artifacts import RunFolderLayout  # type: ignore
+                except Exception:
+                    from artifacts import RunFolderLayout  # type: ignore
+                # Prefer plain layout used by TurnRunner in tests; fallback to hashed
+                conv_dir_plain = self.runs_root / jr.run_id / "conversations" / cid
+                conv_dir_hashed = RunFolderLayout(self.runs_root).conversation_subdir(jr.run_id, cid)
+                if conv_dir_plain.exists():
+                    conv_dir = conv_dir_plain
+                else:
+                    # default to hashed to avoid path length issues
+                    conv_dir = conv_dir_hashed
                 # conversation summary
                 summary = aggregate_conversation(per_turn, last_state or {}, golden_outcome or {})
                 # augment summary with counts and failed metrics
@@ -641,89 +842,343 @@ class Orchestrator:
                     conv_description = (conv.get("metadata") or {}).get("short_description")
                 except Exception:
                     conv_description = None
-                results["conversations"].append({
+                ctx["result"] = {
                     "conversation_id": cid,
                     **identity,
                     "conversation_description": conv_description,
                     "turns": per_turn,
                     "summary": summary,
                     "trace_dir": str(conv_dir),
-                })
+                }
+                self.events.publish(
+                    jr.job_id, "conversation",
+                    run_id=jr.run_id,
+                    conversation_id=cid,
+                    conversation_pass=(summary or {}).get("conversation_pass"),
+                    weighted_pass_rate=(summary or {}).get("weighted_pass_rate"),
+                    scored_conversations=sum(1 for c in scoring["contexts"] if c["result"] is not None),
+                    total_conversations=jr.total_conversations,
+                )
+
+            queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+
+            async def _scoring_worker() -> None:
+                while True:
+                    ctx, turn_index, rec = await queue.get()
+                    try:
+                        await _score_turn(ctx, turn_index, rec)
+                    except Exception as e:
+                        import sys
+                        print(f"[DEBUG] Scoring failed for {ctx['conversation_id']} turn {turn_index}: {e}", file=sys.stderr)
+                    finally:
+                        ctx["pending"] -= 1
+                        if ctx["closed"] and ctx["pending"] == 0:
+                            _finish_conversation(ctx)
+                        queue.task_done()
+
+            # Conversations run as independent tasks behind a semaphore; turns within a
+            # conversation stay sequential because each turn builds on the prior transcript.
+            sem = asyncio.Semaphore(self._resolve_concurrency(jr))
+
+            async def _guarded(ctx: Dict[str, Any]) -> bool:
+                async with sem:
+                    def _on_turn(turn_index: int, rec: Dict[str, Any]) -> None:
+                        ctx["pending"] += 1
+                        queue.put_nowait((ctx, turn_index, rec))
+
+                    ok = await self._run_conversation(
+                        jr,
+                        ctx["conv"],
+                        provider=provider,
+                        model=model,
+                        domain=domain,
+                        params_override=params_override,
+                        cache_mode=cache_mode,
+                        on_turn=_on_turn,
+                        storage=storage,
+                        blobs=blobs,
+                        compression=compression,
+                        completed=ctx.get("completed"),
+                        stream=stream,
+                    )
+                    ctx["closed"] = True
+                    if ctx["pending"] == 0:
+                        _finish_conversation(ctx)
+                    return ok
+
+            # Load the Ollama model before the first turn (context.warmup, default on) so no turn pays for it
+            warmup: Optional[Dict[str, Any]] = None
+            if provider == "ollama" and (jr.config.get("context") or {}).get("warmup") is not False:
+                warmup = await self._runner.providers.get(provider).warm_up(model, params_override)
+                self.events.publish(jr.job_id, "warmup", run_id=jr.run_id, **warmup)
+
+            workers = [asyncio.ensure_future(_scoring_worker()) for _ in range(max(2, self._resolve_concurrency(jr)))]
+            # Contexts are opened up front so results keep dataset order
+            contexts = [_open_conversation(conv) for conv in ds.get("conversations", [])]
+            if jr.resume:
+                # Read earlier turn records (in one pass, off the loop) before this attempt starts writing new ones
+                completed = await asyncio.to_thread(self._completed_turns, jr.run_id)
+                for ctx in contexts:
+                    ctx["completed"] = completed.get(str(ctx["conversation_id"]), {})
+                    scoring["turns_resumed"] += len(ctx["completed"])
+            tasks = [asyncio.ensure_future(_guarded(ctx)) for ctx in contexts]
+            try:
+                outcomes = await asyncio.gather(*tasks)
+                await queue.join()
+            except BaseException:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            finally:
+                for w in workers:
+                    w.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                turn_compression = self._runner.compression_stats(jr.run_id)
+                self._runner.close_run(jr.run_id)
+                if self.embedding_store is not None:
+                    try:
+                        self.embedding_store.flush()
+                    except OSError:
+                        pass
+            if jr.cancel_requested or not all(outcomes):
+                jr.transition("cancelled")
+                return jr
+
+            results["conversations"] = [c["result"] for c in scoring["contexts"] if c["result"] is not None]
 
             # persist results
             try:
                 results["input_tokens_total"] = int(total_input_tokens)
                 results["output_tokens_total"] = int(total_output_tokens)
+                results["cache_hits"] = int(cache_hits)
+                results["cache_misses"] = int(cache_misses)
+                limiter = self._runner.providers.limiter_stats().get(provider) or {}
+                results["throttling"] = {**throttling, "concurrency_limit": limiter.get("concurrency_limit")}
+                if stream:
+                    results["streaming"] = {
+                        "streamed_turns": len(ttft_values),
+                        "ttft_ms_mean": round(sum(ttft_values) / len(ttft_values), 1) if ttft_values else None,
+                        "ttft_ms_p50": percentile(ttft_values, 50),
+                        "ttft_ms_p95": percentile(ttft_values, 95),
+                        "tokens_per_sec_mean": round(sum(tps_values) / len(tps_values), 2) if tps_values else None,
+                    }
+                if provider == "ollama":
+                    results["model_load"] = {
+                        "warmup": warmup,
+                        "turn_load_ms_total": round(model_load["turn_load_ms_total"], 1),
+                        "turn_load_ms_max": round(model_load["turn_load_ms_max"], 1),
+                    }
+                if "semantic" in metrics_wanted:
+                    results["embedding_batching"] = embed_batcher.stats()
+                if compression != "off":
+                    results["compression"] = {"mode": compression, "turn_records": turn_compression}
+                if jr.resume:
+                    results["resumed_turns"] = int(scoring["turns_resumed"])
             except Exception:
                 pass
-            self._writer.write_results_json(jr.run_id, results)
+            self._writer.write_results_json(jr.run_id, results, compression=compression)
             try:
-                self._writer.write_results_csv(jr.run_id, results)
+                self._writer.write_results_csv(jr.run_id, results, compression=compression)
             except Exception:
                 pass
-
-            jr.state = "succeeded"
-            jr.updated_at = _now_iso()
-            jr.progress_pct = 100
             try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": None,
-                    "boot_id": self.boot_id,
-                })
+                self._writer.write_results_parquet(jr.run_id, results)
             except Exception:
-                pass
+                pass  # pyarrow not installed
+            results_compression = self._writer.compression_stats(jr.run_id)
+
+            jr.progress_pct = 100
+            jr.transition("succeeded", extra={"compression": {
+                "mode": compression,
+                "turn_records": turn_compression,
+                "results": results_compression,
+            }} if compression != "off" else None)
             return jr
         except asyncio.CancelledError:
-            # Task cancelled externally (via control cancel). Reflect immediately.
-            jr.state = "cancelled"
-            jr.updated_at = _now_iso()
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": "cancelled by user",
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
+            # Task cancelled externally (via control cancel); cancel() has usually recorded it already
+            jr.transition("cancelled", "cancelled by user")
             return jr
         except Exception as e:
-            jr.state = "failed"
-            jr.error = str(e)
-            jr.updated_at = _now_iso()
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": jr.error,
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
+            jr.transition("failed", str(e))
             return jr
 
+    def partial_results(self, job_id: str) -> Dict[str, Any]:
+        """Snapshot of metrics scored so far for a job, usable while it is still running.
+
+        Finished conversations carry their summary; conversations still in flight list
+        the turns scored so far with `in_progress: true` and no summary.
+        """
+        jr = self.jobs[job_id]
+        scoring = jr._scoring or {"contexts": [], "turns_scored": 0}
+        conversations: List[Dict[str, Any]] = []
+        for ctx in scoring["contexts"]:
+            if ctx["result"] is not None:
+                conversations.append(ctx["result"])
+            elif ctx["per_turn"]:
+                conversations.append({
+                    "conversation_id": ctx["conversation_id"],
+                    **ctx["identity"],
+                    "turns": sorted(ctx["per_turn"], key=lambda t: t.get("turn_index", 0)),
+                    "summary": None,
+                    "in_progress": True,
+                })
+        return {
+            "job_id": jr.job_id,
+            "run_id": jr.run_id,
+            "state": jr.state,
+            "progress_pct": jr.progress_pct,
+            "total_conversations": jr.total_conversations,
+            "completed_conversations": jr.completed_conversations,
+            "scored_conversations": sum(1 for c in scoring["contexts"] if c["result"] is not None),
+            "scored_turns": scoring["turns_scored"],
+            "conversations": conversations,
+        }
+
+    async def aclose(self) -> None:
+        """Release pooled provider connections held by the turn runner."""
+        await self._runner.providers.aclose()
+
     def start(self, job_id: str) -> None:
         jr = self.jobs[job_id]
         if jr._task and not jr._task.done():
             return
         jr._task = asyncio.create_task(self.run_job(job_id))
 
+    def submit_matrix(
+        self,
+        *,
+        dataset_ids: List[str],
+        model_specs: List[str],
+        config: Dict[str, Any],
+        provider_concurrency: Any = None,
+        resume: bool = False,
+    ) -> MatrixRecord:
+        """Queue one job per dataset x model pair, loading and validating each dataset once.
+
+        `provider_concurrency` ({"ollama": 1, "openai": 8} or "ollama=1,openai=8") caps
+        in-flight calls per provider across the matrix's jobs while the models run side by side.
+        """
+        dataset_ids = list(dict.fromkeys(dataset_ids))
+        model_specs = list(dict.fromkeys(model_specs))
+        if not dataset_ids or not model_specs:
+            raise ValueError("a matrix needs at least one dataset and one model")
+        for m in model_specs:
+            self.parse_model_spec(m)  # reject bad specs before anything is queued
+        datasets = {d: self.repo.get_dataset(d) for d in dataset_ids}
+        caps = parse_provider_concurrency(provider_concurrency) if provider_concurrency is not None else {}
+        job_ids = [
+            self.submit(dataset_id=d, model_spec=m, config=config, resume=resume, dataset=datasets[d]).job_id
+            for d in dataset_ids for m in model_specs
+        ]
+        mid = matrix_id(self.jobs[j].run_id for j in job_ids)
+        mr = MatrixRecord(
+            matrix_id=mid, dataset_ids=dataset_ids, model_specs=model_specs, job_ids=job_ids,
+            provider_concurrency=caps,
+        )
+        for j in job_ids:
+            self.jobs[j]._matrix_id = mid
+        self.matrices[mid] = mr
+        return mr
+
+    async def _warm_goldens(self, jobs: List[JobRecord]) -> None:
+        """Pre-embed golden variants once per dataset before its models start scoring semantically."""
+        if self.embedding_store is None:
+            return
+        dataset_ids = list(dict.fromkeys(
+            j.config["dataset_id"] for j in jobs
+            if {"semantic", "semantic_similarity"} & set(j.config.get("metrics") or [])
+        ))
+        if not dataset_ids:
+            return
+        try:
+            texts = [t for d in dataset_ids for t in self.repo.golden_variants(d)]
+            emb = OllamaEmbeddings()
+            await warm_texts(texts, self.embedding_store, emb, emb.model)
+        except Exception as e:
+            # scoring embeds on demand instead
+            import sys
+            print(f"[DEBUG] Golden warm-up failed: {e}", file=sys.stderr)
+
+    async def run_matrix(self, matrix_id: str) -> MatrixRecord:
+        """Run every job of a matrix concurrently, then write the combined comparison artifact."""
+        mr = self.matrices[matrix_id]
+        if mr.state != "queued":
+            return mr
+        mr.state = "running"
+        mr.updated_at = _now_iso()
+        jobs = [self.jobs[j] for j in mr.job_ids]
+        try:
+            await self._warm_goldens(jobs)
+            for jr in jobs:
+                self.start(jr.job_id)
+            await asyncio.gather(*(self.wait(jr.job_id) for jr in jobs))
+            runs: List[Dict[str, Any]] = []
+            for jr in jobs:
+                entry: Dict[str, Any] = {
+                    "dataset_id": jr.config["dataset_id"],
+                    "model_spec": jr.config["model_spec"],
+                    "run_id": jr.run_id,
+                    "job_id": jr.job_id,
+                    "state": jr.state,
+                    "error": jr.error,
+                }
+                if jr.state == "succeeded":
+                    try:
+                        entry.update(summarize_results(self._reader.read_results_json(jr.run_id)))
+                    except (OSError, ValueError):
+                        pass
+                runs.append(entry)
+            path = self._writer.write_matrix_comparison(mr.matrix_id, build_comparison(mr.matrix_id, runs))
+            mr.comparison_path = str(path)
+            failed = [jr for jr in jobs if jr.state != "succeeded"]
+            mr.state = "failed" if failed else "succeeded"
+            mr.error = f"{len(failed)} of {len(jobs)} runs did not succeed" if failed else None
+        except asyncio.CancelledError:
+            for jr in jobs:
+                if jr.state not in ("succeeded", "failed", "cancelled"):
+                    self.cancel(jr.job_id)
+            mr.state = "cancelled"
+        except Exception as e:
+            mr.state = "failed"
+            mr.error = str(e)
+        finally:
+            for key in [k for k in self._provider_slots if k[0] == mr.matrix_id]:
+                del self._provider_slots[key]
+        mr.updated_at = _now_iso()
+        return mr
+
+    def start_matrix(self, matrix_id: str) -> None:
+        mr = self.matrices[matrix_id]
+        if mr._task and not mr._task.done():
+            return
+        mr._task = asyncio.create_task(self.run_matrix(matrix_id))
+
+    def matrix_status(self, matrix_id: str) -> Dict[str, Any]:
+        mr = self.matrices[matrix_id]
+        return {
+            "matrix_id": mr.matrix_id,
+            "state": mr.state,
+            "error": mr.error,
+            "datasets": mr.dataset_ids,
+            "models": mr.model_specs,
+            "comparison_path": mr.comparison_path,
+            "jobs": [
+                {
+                    "job_id": j.job_id,
+                    "run_id": j.run_id,
+                    "dataset_id": j.config["dataset_id"],
+                    "model_spec": j.config["model_spec"],
+                    "state": j.state,
+                    "progress_pct": j.progress_pct,
+                }
+                for j in (self.jobs[jid] for jid in mr.job_ids)
+            ],
+        }
+
     async def wait(self, job_id: str) -> JobRecord:
         jr = self.jobs[job_id]
         if jr._task:
-            await jr._task
+            # asyncio.wait does not raise when the task was cancelled before it started
+            await asyncio.wait({jr._task})
         return jr
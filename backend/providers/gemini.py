@@ -6,14 +6,20 @@ import httpx
 
 try:
     from .types import ProviderRequest, ProviderResponse
+    from .http_pool import HttpClientPool
+    from .streaming import StreamTimer, cancel_requested, iter_sse_json, wants_stream
 except ImportError:
     from providers.types import ProviderRequest, ProviderResponse
+    from providers.http_pool import HttpClientPool
+    from providers.streaming import StreamTimer, cancel_requested, iter_sse_json, wants_stream
 
 GEMINI_API = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}"
+GEMINI_STREAM_API = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse&key={key}"
 
 class GeminiProvider:
-    def __init__(self, api_key: str | None) -> None:
+    def __init__(self, api_key: str | None, pool: HttpClientPool | None = None) -> None:
         self.api_key = api_key
+        self.pool = pool or HttpClientPool()
 
     @property
     def enabled(self) -> bool:
@@ -61,20 +67,56 @@ class GeminiProvider:
         }
         if system_msg is not None:
             payload["systemInstruction"] = system_msg
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(url, json=payload)
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                if r.status_code != 200:
-                    return ProviderResponse(False, "", latency_ms, {"status": r.status_code}, error=r.text)
-                data = r.json()
-                text = (
-                    data.get("candidates", [{}])[0]
-                    .get("content", {})
-                    .get("parts", [{}])[0]
-                    .get("text", "")
+        client = self.pool.get()
+        try:
+            if wants_stream(req):
+                url = GEMINI_STREAM_API.format(model=req.model, key=self.api_key)
+                return await self._chat_stream(client, url, payload, req, t0)
+            r = await client.post(url, json=payload)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                meta = {"status": r.status_code, "retry_after": r.headers.get("retry-after")}
+                return ProviderResponse(False, "", latency_ms, meta, error=r.text)
+            data = r.json()
+            text = (
+                data.get("candidates", [{}])[0]
+                .get("content", {})
+                .get("parts", [{}])[0]
+                .get("text", "")
+            )
+            meta = {"candidates": len(data.get("candidates", [])), "usage": data.get("usageMetadata")}
+            return ProviderResponse(True, text, latency_ms, meta)
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            return ProviderResponse(False, "", latency_ms, {"exception": type(e).__name__}, error=str(e))
+
+    async def _chat_stream(self, client: httpx.AsyncClient, url: str, payload: Dict[str, Any], req: ProviderRequest, t0: float) -> ProviderResponse:
+        """SSE streaming: each event is a partial GenerateContentResponse; the last carries final usage."""
+        timer = StreamTimer(t0)
+        parts: List[str] = []
+        meta: Dict[str, Any] = {"candidates": 0, "usage": None}
+        async with client.stream("POST", url, json=payload) as r:
+            if r.status_code != 200:
+                await r.aread()
+                meta = {"status": r.status_code, "retry_after": r.headers.get("retry-after")}
+                return ProviderResponse(False, "", timer.latency_ms(), meta, error=r.text)
+            async for chunk in iter_sse_json(r):
+                candidates = chunk.get("candidates") or []
+                meta["candidates"] = max(meta["candidates"], len(candidates))
+                if chunk.get("usageMetadata"):
+                    meta["usage"] = chunk["usageMetadata"]
+                piece = "".join(
+                    p.get("text", "") for p in ((candidates[0] if candidates else {}).get("content") or {}).get("parts", [])
                 )
-                return ProviderResponse(True, text, latency_ms, {"candidates": len(data.get("candidates", []))})
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                return ProviderResponse(False, "", latency_ms, {}, error=str(e))
+                if piece:
+                    timer.chunk()
+                    parts.append(piece)
+                if cancel_requested(req):
+                    return self._cancelled("".join(parts), timer, meta)
+        completion = (meta.get("usage") or {}).get("candidatesTokenCount")
+        return ProviderResponse(True, "".join(parts), timer.latency_ms(), {**meta, **timer.meta(completion)})
+
+    @staticmethod
+    def _cancelled(content: str, timer: StreamTimer, meta: Dict[str, Any]) -> ProviderResponse:
+        # Closing the stream early stops generation server-side; keep what arrived so far
+        return ProviderResponse(False, content, timer.latency_ms(), {**meta, **timer.meta(), "cancelled": True}, error="cancelled")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Optional
+import httpx
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    return raw.lower() in ("1", "true", "yes")
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+@dataclass
+class PoolConfig:
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    timeout: float = 60.0
+
+    @classmethod
+    def from_env(cls, provider: str) -> "PoolConfig":
+        """Read HTTP_* defaults, overridable per provider (e.g. OPENAI_HTTP_MAX_CONNECTIONS)."""
+        d = cls()
+        p = provider.upper()
+
+        def pick(key: str) -> str:
+            return f"{p}_HTTP_{key}" if os.getenv(f"{p}_HTTP_{key}") not in (None, "") else f"HTTP_{key}"
+
+        return cls(
+            max_connections=_env_int(pick("MAX_CONNECTIONS"), d.max_connections),
+            max_keepalive_connections=_env_int(pick("MAX_KEEPALIVE"), d.max_keepalive_connections),
+            keepalive_expiry=_env_float(pick("KEEPALIVE_EXPIRY"), d.keepalive_expiry),
+            http2=_env_bool(pick("HTTP2"), d.http2),
+            timeout=_env_float(pick("TIMEOUT"), d.timeout),
+        )
+
+
+class HttpClientPool:
+    """Long-lived httpx.AsyncClient shared by every call of one provider adapter.
+
+    httpx connection pools are bound to the event loop that opened them, so the client
+    is recreated transparently when called from a different loop (e.g. the CLI runs one
+    asyncio.run per job). HTTP/2 is only enabled when the optional `h2` package is installed.
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None) -> None:
+        self.config = config or PoolConfig()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _build(self) -> httpx.AsyncClient:
+        cfg = self.config
+        limits = httpx.Limits(
+            max_connections=cfg.max_connections,
+            max_keepalive_connections=min(cfg.max_keepalive_connections, cfg.max_connections),
+            keepalive_expiry=cfg.keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            timeout=cfg.timeout,
+            limits=limits,
+            http2=bool(cfg.http2 and _h2_available()),
+        )
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client from a finished loop cannot be closed cleanly; just drop it.
+            self._client = self._build()
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        if client is None or client.is_closed:
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if loop is current:
+            await client.aclose()
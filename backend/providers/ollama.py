@@ -1,16 +1,91 @@
 from __future__ import annotations
+import os
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import httpx
 
 try:
     from .types import ProviderRequest, ProviderResponse
+    from .http_pool import HttpClientPool
+    from .streaming import StreamTimer, cancel_requested, iter_ndjson, wants_stream
 except ImportError:
     from providers.types import ProviderRequest, ProviderResponse
+    from providers.http_pool import HttpClientPool
+    from providers.streaming import StreamTimer, cancel_requested, iter_ndjson, wants_stream
+
+_META_KEYS = ("total_duration", "load_duration", "prompt_eval_count", "eval_count")
+
+
+def _keep_alive(value: Any) -> Any:
+    # Ollama takes a duration ("30m") or seconds (-1 keeps the model loaded indefinitely)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _num_ctx(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value) or None
+    except (TypeError, ValueError):
+        return None
+
+
+def _done_meta(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Timing and token counts of a finished Ollama response; load_ms is model load time."""
+    meta = {k: data.get(k) for k in _META_KEYS}
+    load_ns = data.get("load_duration")
+    meta["load_ms"] = round(load_ns / 1e6, 1) if isinstance(load_ns, (int, float)) else None
+    return meta
+
 
 class OllamaProvider:
-    def __init__(self, host: str = "http://localhost:11434") -> None:
+    def __init__(
+        self,
+        host: str = "http://localhost:11434",
+        pool: HttpClientPool | None = None,
+        keep_alive: Any = None,
+        num_ctx: Optional[int] = None,
+    ) -> None:
         self.base_url = host.rstrip("/")
+        self.pool = pool or HttpClientPool()
+        # How long Ollama keeps the model loaded after a request, and its context window;
+        # run params `keep_alive`/`num_ctx` (context.params) override these per run
+        self.keep_alive = _keep_alive(keep_alive if keep_alive is not None else os.getenv("OLLAMA_KEEP_ALIVE"))
+        self.num_ctx = _num_ctx(num_ctx if num_ctx is not None else os.getenv("OLLAMA_NUM_CTX"))
+
+    def _residency(self, params: Optional[Dict[str, Any]]) -> tuple[Any, Optional[int]]:
+        """keep_alive and num_ctx for a request. A different num_ctx makes Ollama reload the model,
+        so the warm-up and every turn must agree."""
+        params = params if isinstance(params, dict) else {}
+        keep_alive = _keep_alive(params["keep_alive"]) if params.get("keep_alive") is not None else self.keep_alive
+        num_ctx = _num_ctx(params.get("num_ctx")) or self.num_ctx
+        return keep_alive, num_ctx
+
+    async def warm_up(self, model: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Load `model` before the first turn: a prompt-less /api/generate only loads it.
+
+        Returns ok, latency_ms and load_ms (0 when it was already resident); never raises.
+        """
+        t0 = time.perf_counter()
+        keep_alive, num_ctx = self._residency(params)
+        payload: Dict[str, Any] = {"model": model, "prompt": ""}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if num_ctx:
+            payload["options"] = {"num_ctx": num_ctx}
+        try:
+            r = await self.pool.get().post(f"{self.base_url}/api/generate", json=payload)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                return {"ok": False, "latency_ms": latency_ms, "load_ms": None, "status": r.status_code, "error": r.text[:500]}
+            return {"ok": True, "latency_ms": latency_ms, "load_ms": _done_meta(r.json())["load_ms"]}
+        except Exception as e:
+            return {"ok": False, "latency_ms": int((time.perf_counter() - t0) * 1000), "load_ms": None, "error": str(e)}
 
     async def chat(self, req: ProviderRequest) -> ProviderResponse:
         t0 = time.perf_counter()
@@ -30,7 +105,7 @@ class OllamaProvider:
         payload = {
             "model": req.model,
             "messages": req.messages,
-            "stream": False,
+            "stream": wants_stream(req),
             "options": {
                 "temperature": temperature,
                 "top_p": top_p,
@@ -39,16 +114,50 @@ class OllamaProvider:
         # Add seed for deterministic sampling if provided (Ollama supports seed)
         if seed is not None:
             payload["options"]["seed"] = seed
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(url, json=payload)
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                if r.status_code != 200:
-                    return ProviderResponse(False, "", latency_ms, {"status": r.status_code}, error=r.text)
-                data = r.json()
-                content = data.get("message", {}).get("content", "")
-                meta = {k: data.get(k) for k in ("total_duration", "load_duration", "prompt_eval_count", "eval_count")}
-                return ProviderResponse(True, content, latency_ms, meta)
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                return ProviderResponse(False, "", latency_ms, {}, error=str(e))
+        keep_alive, num_ctx = self._residency((req.metadata or {}).get("params"))
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if num_ctx:
+            payload["options"]["num_ctx"] = num_ctx
+        client = self.pool.get()
+        try:
+            if payload["stream"]:
+                return await self._chat_stream(client, url, payload, req, t0)
+            r = await client.post(url, json=payload)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                meta = {"status": r.status_code, "retry_after": r.headers.get("retry-after")}
+                return ProviderResponse(False, "", latency_ms, meta, error=r.text)
+            data = r.json()
+            content = data.get("message", {}).get("content", "")
+            return ProviderResponse(True, content, latency_ms, _done_meta(data))
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            return ProviderResponse(False, "", latency_ms, {"exception": type(e).__name__}, error=str(e))
+
+    async def _chat_stream(self, client: httpx.AsyncClient, url: str, payload: Dict[str, Any], req: ProviderRequest, t0: float) -> ProviderResponse:
+        """NDJSON streaming: message chunks, then a final `done` object with the eval counts."""
+        timer = StreamTimer(t0)
+        parts: List[str] = []
+        meta: Dict[str, Any] = {}
+        async with client.stream("POST", url, json=payload) as r:
+            if r.status_code != 200:
+                await r.aread()
+                meta = {"status": r.status_code, "retry_after": r.headers.get("retry-after")}
+                return ProviderResponse(False, "", timer.latency_ms(), meta, error=r.text)
+            async for chunk in iter_ndjson(r):
+                piece = (chunk.get("message") or {}).get("content") or ""
+                if piece:
+                    timer.chunk()
+                    parts.append(piece)
+                if chunk.get("done"):
+                    meta = _done_meta(chunk)
+                    break
+                if cancel_requested(req):
+                    return self._cancelled("".join(parts), timer, meta)
+        return ProviderResponse(True, "".join(parts), timer.latency_ms(), {**meta, **timer.meta(meta.get("eval_count"))})
+
+    @staticmethod
+    def _cancelled(content: str, timer: StreamTimer, meta: Dict[str, Any]) -> ProviderResponse:
+        # Closing the stream early stops generation server-side; keep what arrived so far
+        return ProviderResponse(False, content, timer.latency_ms(), {**meta, **timer.meta(), "cancelled": True}, error="cancelled")
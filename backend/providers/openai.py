@@ -5,14 +5,19 @@ import httpx
 
 try:
     from .types import ProviderRequest, ProviderResponse
+    from .http_pool import HttpClientPool
+    from .streaming import StreamTimer, cancel_requested, iter_sse_json, wants_stream
 except ImportError:
     from providers.types import ProviderRequest, ProviderResponse
+    from providers.http_pool import HttpClientPool
+    from providers.streaming import StreamTimer, cancel_requested, iter_sse_json, wants_stream
 
 
 class OpenAIProvider:
-    def __init__(self, api_key: str | None) -> None:
+    def __init__(self, api_key: str | None, pool: HttpClientPool | None = None) -> None:
         self.api_key = api_key
         self.base_url = "https://api.openai.com/v1"
+        self.pool = pool or HttpClientPool()
 
     @property
     def enabled(self) -> bool:
@@ -57,23 +62,55 @@ class OpenAIProvider:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(url, json=payload, headers=headers)
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                if r.status_code != 200:
-                    return ProviderResponse(False, "", latency_ms, {"status": r.status_code}, error=r.text)
-                data = r.json()
-                content = (
-                    (data.get("choices", [{}])[0] or {})
-                    .get("message", {})
-                    .get("content", "")
-                )
-                meta = {
-                    "model": data.get("model"),
-                    "usage": data.get("usage"),
-                }
-                return ProviderResponse(True, content, latency_ms, meta)
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                return ProviderResponse(False, "", latency_ms, {}, error=str(e))
+        client = self.pool.get()
+        try:
+            if wants_stream(req):
+                payload.update(stream=True, stream_options={"include_usage": True})
+                return await self._chat_stream(client, url, payload, headers, req, t0)
+            r = await client.post(url, json=payload, headers=headers)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                meta = {"status": r.status_code, "retry_after": r.headers.get("retry-after")}
+                return ProviderResponse(False, "", latency_ms, meta, error=r.text)
+            data = r.json()
+            content = (
+                (data.get("choices", [{}])[0] or {})
+                .get("message", {})
+                .get("content", "")
+            )
+            meta = {
+                "model": data.get("model"),
+                "usage": data.get("usage"),
+            }
+            return ProviderResponse(True, content, latency_ms, meta)
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            return ProviderResponse(False, "", latency_ms, {"exception": type(e).__name__}, error=str(e))
+
+    async def _chat_stream(self, client: httpx.AsyncClient, url: str, payload: Dict[str, Any], headers: Dict[str, str], req: ProviderRequest, t0: float) -> ProviderResponse:
+        """SSE streaming: `choices[0].delta` chunks; usage arrives in a final chunk without choices."""
+        timer = StreamTimer(t0)
+        parts: List[str] = []
+        meta: Dict[str, Any] = {"model": None, "usage": None}
+        async with client.stream("POST", url, json=payload, headers=headers) as r:
+            if r.status_code != 200:
+                await r.aread()
+                meta = {"status": r.status_code, "retry_after": r.headers.get("retry-after")}
+                return ProviderResponse(False, "", timer.latency_ms(), meta, error=r.text)
+            async for chunk in iter_sse_json(r):
+                meta["model"] = chunk.get("model") or meta["model"]
+                if chunk.get("usage"):
+                    meta["usage"] = chunk["usage"]
+                piece = ((chunk.get("choices") or [{}])[0].get("delta") or {}).get("content") or ""
+                if piece:
+                    timer.chunk()
+                    parts.append(piece)
+                if cancel_requested(req):
+                    return self._cancelled("".join(parts), timer, meta)
+        completion = (meta.get("usage") or {}).get("completion_tokens")
+        return ProviderResponse(True, "".join(parts), timer.latency_ms(), {**meta, **timer.meta(completion)})
+
+    @staticmethod
+    def _cancelled(content: str, timer: StreamTimer, meta: Dict[str, Any]) -> ProviderResponse:
+        # Closing the stream early stops generation server-side; keep what arrived so far
+        return ProviderResponse(False, content, timer.latency_ms(), {**meta, **timer.meta(), "cancelled": True}, error="cancelled")
@@ -0,0 +1,218 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+try:
+    from .types import ProviderRequest, ProviderResponse
+except ImportError:
+    from providers.types import ProviderRequest, ProviderResponse
+
+# Statuses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUSES = (429, 503)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+@dataclass
+class LimitConfig:
+    rpm: float = 0.0  # requests per minute; 0 = unlimited
+    tpm: float = 0.0  # tokens per minute (prompt + completion); 0 = unlimited
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+
+    @classmethod
+    def from_env(cls, provider: str) -> "LimitConfig":
+        """Read PROVIDER_* defaults, overridable per provider (e.g. OPENAI_RPM, GEMINI_TPM)."""
+        d = cls()
+        p = provider.upper()
+
+        def pick(key: str, default: float) -> float:
+            return _env_float(f"{p}_{key}", _env_float(f"PROVIDER_{key}", default))
+
+        max_c = max(1, int(pick("MAX_CONCURRENCY", d.max_concurrency)))
+        return cls(
+            rpm=max(0.0, pick("RPM", d.rpm)),
+            tpm=max(0.0, pick("TPM", d.tpm)),
+            max_concurrency=max_c,
+            min_concurrency=min(max_c, max(1, int(pick("MIN_CONCURRENCY", d.min_concurrency)))),
+        )
+
+
+class TokenBucket:
+    """Continuously refilled bucket of `per_minute` units holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._at) * self.rate)
+        self._at = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` now (possibly going into debt); returns seconds until it is covered."""
+        self._refill()
+        self.level -= min(float(amount), self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) the difference once actual usage is known."""
+        self._refill()
+        self.level = min(self.capacity, self.level - delta)
+
+
+def retry_after_seconds(value: Any) -> Optional[float]:
+    """Seconds from a Retry-After header value (delta-seconds or HTTP date)."""
+    if value in (None, ""):
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def estimate_tokens(req: ProviderRequest) -> int:
+    """Rough request cost for the TPM bucket: ~4 characters per prompt token plus the completion budget."""
+    chars = sum(len(str(m.get("content") or "")) for m in req.messages or [])
+    params = (req.metadata or {}).get("params") or {}
+    try:
+        completion = int(params.get("max_tokens") or 512)
+    except (TypeError, ValueError):
+        completion = 512
+    return chars // 4 + completion
+
+
+def usage_tokens(meta: Dict[str, Any]) -> Optional[int]:
+    """Total tokens reported by a provider response (OpenAI, Gemini or Ollama shapes)."""
+    usage = meta.get("usage")
+    if isinstance(usage, dict):
+        total = usage.get("total_tokens") or usage.get("totalTokenCount")
+        if total is None and ("prompt_tokens" in usage or "completion_tokens" in usage):
+            total = (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+        if total is not None:
+            return int(total)
+    if meta.get("prompt_eval_count") is not None or meta.get("eval_count") is not None:
+        return int(meta.get("prompt_eval_count") or 0) + int(meta.get("eval_count") or 0)
+    return None
+
+
+class ProviderLimiter:
+    """Rate limits and adaptive concurrency for one provider, shared by all of its calls.
+
+    Requests wait for an RPM and a TPM token bucket and for a concurrency slot. The slot
+    limit follows AIMD: it grows by 1/limit per successful call up to max_concurrency,
+    and halves (down to min_concurrency) on 429/503. A Retry-After also holds every new
+    request until that moment.
+    """
+
+    def __init__(self, name: str, config: Optional[LimitConfig] = None) -> None:
+        self.name = name
+        self.config = config or LimitConfig.from_env(name)
+        self.requests = TokenBucket(self.config.rpm) if self.config.rpm > 0 else None
+        self.tokens = TokenBucket(self.config.tpm) if self.config.tpm > 0 else None
+        self.limit = float(self.config.max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Any = None
+        self.stats: Dict[str, Any] = {"calls": 0, "throttled_calls": 0, "throttle_ms": 0, "backoffs": 0}
+
+    def _condition(self) -> asyncio.Condition:
+        # conditions bind to one event loop; the CLI runs each job under its own asyncio.run()
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond, self._loop = asyncio.Condition(), loop
+        return self._cond
+
+    async def acquire(self, est_tokens: int) -> int:
+        """Wait for capacity; returns the time spent waiting in ms."""
+        t0 = time.monotonic()
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < max(1, int(self.limit)))
+            self.in_flight += 1
+        try:
+            wait = self.blocked_until - time.monotonic()
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(est_tokens))
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            await self.release()
+            raise
+        waited = int((time.monotonic() - t0) * 1000)
+        self.stats["calls"] += 1
+        if waited > 0:
+            self.stats["throttled_calls"] += 1
+            self.stats["throttle_ms"] += waited
+        return waited
+
+    async def release(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            cond.notify_all()
+
+    def observe(self, resp: Any, est_tokens: int) -> None:
+        """Adapt to a finished call: AIMD on the concurrency limit, TPM reconciliation, Retry-After."""
+        meta = getattr(resp, "provider_meta", None) or {}
+        if meta.get("status") in THROTTLE_STATUSES:
+            self.limit = max(float(self.config.min_concurrency), self.limit / 2.0)
+            self.stats["backoffs"] += 1
+            delay = retry_after_seconds(meta.get("retry_after"))
+            if delay:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            return
+        if getattr(resp, "ok", False):
+            self.limit = min(float(self.config.max_concurrency), self.limit + 1.0 / max(1.0, self.limit))
+            actual = usage_tokens(meta)
+            if actual is not None and self.tokens is not None:
+                self.tokens.adjust(actual - est_tokens)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "concurrency_limit": round(self.limit, 2), "in_flight": self.in_flight}
+
+
+class RateLimitedProvider:
+    """Adapter wrapper that runs every chat() call through its provider's ProviderLimiter.
+
+    Responses carry `throttle_ms` (time spent waiting for capacity) in provider_meta.
+    Other attributes (e.g. `enabled`) come from the wrapped adapter.
+    """
+
+    def __init__(self, adapter: Any, limiter: ProviderLimiter) -> None:
+        self.adapter = adapter
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.adapter, name)
+
+    async def chat(self, req: ProviderRequest) -> ProviderResponse:
+        est = estimate_tokens(req)
+        waited = await self.limiter.acquire(est)
+        try:
+            resp = await self.adapter.chat(req)
+        finally:
+            await self.limiter.release()
+        self.limiter.observe(resp, est)
+        if isinstance(getattr(resp, "provider_meta", None), dict):
+            resp.provider_meta["throttle_ms"] = waited
+        return resp
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import os
-from typing import Dict
+from typing import Any, Dict, Optional
 from pathlib import Path
 
 # Load .env from repo root so CLI and scripts pick up API keys without starting the web app
@@ -34,19 +34,49 @@ try:
     from .ollama import OllamaProvider
     from .gemini import GeminiProvider
     from .openai import OpenAIProvider
+    from .http_pool import HttpClientPool, PoolConfig
+    from .rate_limit import LimitConfig, ProviderLimiter, RateLimitedProvider
+    from .resilience import CircuitBreaker, ResilientProvider, RetryPolicy
+    from .replay import ReplayProvider
+    from .synthetic import SyntheticProvider
 except ImportError:
     from providers.ollama import OllamaProvider
     from providers.gemini import GeminiProvider
     from providers.openai import OpenAIProvider
+    from providers.http_pool import HttpClientPool, PoolConfig
+    from providers.rate_limit import LimitConfig, ProviderLimiter, RateLimitedProvider
+    from providers.resilience import CircuitBreaker, ResilientProvider, RetryPolicy
+    from providers.replay import ReplayProvider
+    from providers.synthetic import SyntheticProvider
 
 class ProviderRegistry:
-    def __init__(self) -> None:
+    def __init__(self, runs_root: Optional[Path] = None) -> None:
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self._ollama = OllamaProvider(self.ollama_host)
-        self._gemini = GeminiProvider(self.google_api_key)
-        self._openai = OpenAIProvider(self.openai_api_key)
+        # One long-lived connection pool per provider, reused by every adapter call
+        self._pools: Dict[str, HttpClientPool] = {
+            name: HttpClientPool(PoolConfig.from_env(name)) for name in ("ollama", "gemini", "openai")
+        }
+        # RPM/TPM buckets and adaptive concurrency per provider (e.g. OPENAI_RPM, GEMINI_TPM)
+        self.limiters: Dict[str, ProviderLimiter] = {
+            name: ProviderLimiter(name, LimitConfig.from_env(name)) for name in ("ollama", "gemini", "openai")
+        }
+        # Retries with jittered backoff and a circuit breaker around the rate-limited calls
+        self.policies: Dict[str, RetryPolicy] = {name: RetryPolicy.from_env(name) for name in self.limiters}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(p.breaker_threshold, p.breaker_cooldown_s) for name, p in self.policies.items()
+        }
+        self._ollama = self._wrap("ollama", OllamaProvider(self.ollama_host, pool=self._pools["ollama"]))
+        self._gemini = self._wrap("gemini", GeminiProvider(self.google_api_key, pool=self._pools["gemini"]))
+        self._openai = self._wrap("openai", OpenAIProvider(self.openai_api_key, pool=self._pools["openai"]))
+        # Offline providers for exercising the pipeline without a model: `replay:<run_id>`
+        # answers from an earlier run under runs_root, `synthetic:<profile>` makes up answers
+        self._replay = ReplayProvider(runs_root)
+        self._synthetic = SyntheticProvider()
+
+    def _wrap(self, name: str, adapter):
+        return ResilientProvider(RateLimitedProvider(adapter, self.limiters[name]), self.policies[name], self.breakers[name])
 
     @property
     def gemini_enabled(self) -> bool:
@@ -59,4 +89,20 @@ class ProviderRegistry:
             return self._gemini
         if provider == "openai":
             return self._openai
+        if provider == "replay":
+            return self._replay
+        if provider == "synthetic":
+            return self._synthetic
         raise KeyError(f"Unknown provider: {provider}")
+
+    def limiter_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Calls, throttled calls, throttle time, backoffs and current concurrency limit per provider."""
+        return {name: lim.snapshot() for name, lim in self.limiters.items()}
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections (called on app shutdown)."""
+        for pool in self._pools.values():
+            try:
+                await pool.aclose()
+            except Exception:
+                pass
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .types import CALL_META_KEYS, ProviderRequest, ProviderResponse
+    from ..artifacts import RunArtifactReader
+except ImportError:
+    from providers.types import CALL_META_KEYS, ProviderRequest, ProviderResponse
+    from artifacts import RunArtifactReader
+
+# provider_meta keys describing the original call, not part of the recorded answer
+_CALL_META_KEYS = CALL_META_KEYS + ("replay",)
+
+
+def message_hash(messages: List[Dict[str, Any]]) -> str:
+    blob = json.dumps(messages, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ReplayProvider:
+    """Answers from the turn records of an earlier run (model spec `replay:<run_id>`).
+
+    A request is matched by conversation_id/turn_index, then by a hash of its messages.
+    Recorded provider_meta (usage, eval counts) is returned as is, so token accounting
+    behaves like the original run. REPLAY_LATENCY=recorded sleeps for the recorded
+    latency; by default answers are immediate.
+    """
+
+    enabled = True
+
+    def __init__(self, runs_root: Optional[Path] = None) -> None:
+        self.reader = RunArtifactReader(runs_root) if runs_root is not None else None
+        self.recorded_latency = os.getenv("REPLAY_LATENCY", "off").lower() == "recorded"
+        # run_id -> ({(conversation_id, turn_index): record}, {message hash: record})
+        self._index: Dict[str, Tuple[Dict[Tuple[str, int], Dict[str, Any]], Dict[str, Dict[str, Any]]]] = {}
+
+    def _load(self, run_id: str) -> Tuple[Dict[Tuple[str, int], Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        by_turn: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        by_hash: Dict[str, Dict[str, Any]] = {}
+        for rec in self.reader.read_turn_records(run_id) if self.reader is not None else []:
+            if not isinstance(rec.get("response"), dict):
+                continue
+            by_turn[(str(rec.get("conversation_id")), int(rec.get("turn_index", -1)))] = rec
+            messages = (rec.get("request") or {}).get("messages")
+            if isinstance(messages, list):
+                by_hash.setdefault(message_hash(messages), rec)
+        return by_turn, by_hash
+
+    async def _records(self, run_id: str) -> Tuple[Dict[Tuple[str, int], Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        index = self._index.get(run_id)
+        if index is None:
+            index = await asyncio.to_thread(self._load, run_id)
+            self._index[run_id] = index
+        return index
+
+    async def chat(self, req: ProviderRequest) -> ProviderResponse:
+        t0 = time.perf_counter()
+        meta_in = req.metadata or {}
+        by_turn, by_hash = await self._records(req.model)
+        match = "turn"
+        rec = by_turn.get((str(meta_in.get("conversation_id")), int(meta_in.get("turn_index", -1))))
+        if rec is None:
+            match = "hash"
+            rec = by_hash.get(message_hash(req.messages))
+        if rec is None:
+            return ProviderResponse(
+                False, "", int((time.perf_counter() - t0) * 1000), {"replay": {"run_id": req.model, "match": None}},
+                error=f"no recorded turn in run {req.model} for this request",
+            )
+        resp = rec["response"]
+        recorded = resp.get("provider_meta") if isinstance(resp.get("provider_meta"), dict) else {}
+        meta = {k: v for k, v in recorded.items() if k not in _CALL_META_KEYS}
+        meta["replay"] = {"run_id": req.model, "match": match, "original_latency_ms": resp.get("latency_ms")}
+        if self.recorded_latency and isinstance(resp.get("latency_ms"), (int, float)):
+            await asyncio.sleep(resp["latency_ms"] / 1000.0)
+        return ProviderResponse(
+            bool(resp.get("ok")), resp.get("content") or "", int((time.perf_counter() - t0) * 1000), meta,
+            error=resp.get("error"),
+        )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+try:
+    from .types import ProviderRequest, ProviderResponse
+    from .rate_limit import retry_after_seconds
+except ImportError:
+    from providers.types import ProviderRequest, ProviderResponse
+    from providers.rate_limit import retry_after_seconds
+
+# HTTP statuses worth another attempt; transport errors (provider_meta.exception) are retried too
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+@dataclass
+class RetryPolicy:
+    retries: int = 3  # attempts after the first
+    backoff_base_ms: float = 250.0
+    backoff_max_ms: float = 8000.0
+    breaker_threshold: int = 5  # consecutive failed calls (after retries) that open the circuit
+    breaker_cooldown_s: float = 30.0
+
+    @classmethod
+    def from_env(cls, provider: str) -> "RetryPolicy":
+        """Read PROVIDER_* defaults, overridable per provider (e.g. OPENAI_RETRIES)."""
+        d = cls()
+        p = provider.upper()
+
+        def pick(key: str, default: float) -> float:
+            return _env_float(f"{p}_{key}", _env_float(f"PROVIDER_{key}", default))
+
+        return cls(
+            retries=max(0, int(pick("RETRIES", d.retries))),
+            backoff_base_ms=max(0.0, pick("BACKOFF_BASE_MS", d.backoff_base_ms)),
+            backoff_max_ms=max(0.0, pick("BACKOFF_MAX_MS", d.backoff_max_ms)),
+            breaker_threshold=max(1, int(pick("BREAKER_THRESHOLD", d.breaker_threshold))),
+            breaker_cooldown_s=max(0.0, pick("BREAKER_COOLDOWN_S", d.breaker_cooldown_s)),
+        )
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds before retry number `attempt` (0-based): full jitter over an exponential cap,
+        but never sooner than the server's Retry-After."""
+        cap = min(self.backoff_max_ms, self.backoff_base_ms * (2 ** attempt)) / 1000.0
+        delay = random.uniform(0.0, cap)
+        return max(delay, retry_after or 0.0)
+
+
+def is_retryable(resp: Any) -> bool:
+    if getattr(resp, "ok", False):
+        return False
+    meta = getattr(resp, "provider_meta", None) or {}
+    return meta.get("status") in RETRYABLE_STATUSES or bool(meta.get("exception"))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one provider.
+
+    closed -> open after `threshold` failed calls in a row; calls are then refused
+    without reaching the provider. After `cooldown_s` (or `probe()`) calls are let through
+    again (half_open): the first success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown_s: float = 30.0) -> None:
+        self.threshold = max(1, int(threshold))
+        self.cooldown_s = float(cooldown_s)
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown_s:
+            self.state = "half_open"
+        return self.state != "open"
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.state = "closed"
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def probe(self) -> None:
+        """Let calls through again before the cooldown ends (e.g. when the user resumes a paused job)."""
+        if self.state == "open":
+            self.state = "half_open"
+
+
+class ResilientProvider:
+    """Adapter wrapper adding retries with jittered exponential backoff and a circuit breaker.
+
+    Retries cover timeouts/transport errors, 5xx and 429 (honoring Retry-After).
+    provider_meta gains `retries` and `circuit`. When the circuit is open the call is
+    not attempted and the response has `circuit: "open"`; the orchestrator pauses the job.
+    """
+
+    def __init__(self, adapter: Any, policy: RetryPolicy, breaker: CircuitBreaker) -> None:
+        self.adapter = adapter
+        self.policy = policy
+        self.breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.adapter, name)
+
+    async def chat(self, req: ProviderRequest) -> ProviderResponse:
+        if not self.breaker.allow():
+            return ProviderResponse(
+                False, "", 0, {"circuit": "open", "retries": 0},
+                error=f"circuit open after {self.breaker.failures} consecutive provider failures",
+            )
+        retries = 0
+        while True:
+            resp = await self.adapter.chat(req)
+            if retries >= self.policy.retries or not is_retryable(resp):
+                break
+            meta = getattr(resp, "provider_meta", None) or {}
+            await asyncio.sleep(self.policy.backoff(retries, retry_after_seconds(meta.get("retry_after"))))
+            retries += 1
+        # a request the provider rejects as invalid (4xx) says nothing about its health
+        self.breaker.record(bool(getattr(resp, "ok", False)) or not is_retryable(resp))
+        meta: Dict[str, Any] = getattr(resp, "provider_meta", None)
+        if isinstance(meta, dict):
+            meta["retries"] = retries
+            meta["circuit"] = self.breaker.state
+        return resp
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .types import CALL_META_KEYS, ProviderResponse
+except ImportError:
+    from providers.types import CALL_META_KEYS, ProviderResponse
+
+CACHE_MODES = ("off", "read", "readwrite")
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "responses"
+
+
+def normalize_cache_mode(value: Any) -> str:
+    """Map a run config `cache` value to one of off|read|readwrite (unknown -> off)."""
+    if value is True:
+        return "readwrite"
+    v = str(value or "off").strip().lower()
+    return v if v in CACHE_MODES else "off"
+
+
+def cache_key(provider: str, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    blob = json.dumps(
+        {"provider": provider, "model": model, "messages": messages, "params": params or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _answer_meta(meta: Any) -> Dict[str, Any]:
+    return {k: v for k, v in (meta or {}).items() if k not in CALL_META_KEYS} if isinstance(meta, dict) else {}
+
+
+class ResponseCache:
+    """On-disk cache of successful provider responses with size-bounded LRU eviction.
+
+    Entries are stored as <root>/<key[:2]>/<key>.json. Recency is tracked in memory and
+    mirrored to file mtimes so the LRU order survives restarts. Per-call provider_meta
+    (CALL_META_KEYS) is not stored, so a hit is not counted as throttled, retried or loaded.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root or os.getenv("RESPONSE_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._total = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            if self.root.exists():
+                for p in self.root.glob("*/*.json"):
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, p.stem, st.st_size))
+            entries.sort()
+            self._index = OrderedDict((k, size) for _, k, size in entries)
+            self._total = sum(self._index.values())
+        return self._index
+
+    def get(self, key: str) -> Optional[ProviderResponse]:
+        index = self._load_index()
+        if key not in index:
+            return None
+        p = self._path(key)
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            self._total -= index.pop(key, 0)
+            return None
+        index.move_to_end(key)
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return ProviderResponse(
+            True,
+            data.get("content") or "",
+            int(data.get("latency_ms") or 0),
+            _answer_meta(data.get("provider_meta")),
+        )
+
+    def put(self, key: str, resp: ProviderResponse) -> None:
+        if not resp.ok:
+            return
+        index = self._load_index()
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        body = json.dumps(
+            {"content": resp.content, "latency_ms": resp.latency_ms, "provider_meta": _answer_meta(resp.provider_meta)},
+            separators=(",", ":"),
+        )
+        tmp = p.with_suffix(".tmp")
+        tmp.write_text(body, encoding="utf-8")
+        os.replace(tmp, p)
+        self._total -= index.pop(key, 0)
+        index[key] = len(body.encode("utf-8"))
+        self._total += index[key]
+        self._evict()
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        while self._total > self.max_bytes and len(index) > 1:
+            old_key, size = index.popitem(last=False)
+            self._total -= size
+            try:
+                self._path(old_key).unlink()
+            except OSError:
+                pass
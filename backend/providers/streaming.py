@@ -0,0 +1,80 @@
+from __future__ import annotations
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+try:
+    from .types import ProviderRequest
+except ImportError:
+    from providers.types import ProviderRequest
+
+
+def wants_stream(req: ProviderRequest) -> bool:
+    return bool((req.metadata or {}).get("stream"))
+
+
+def cancel_requested(req: ProviderRequest) -> bool:
+    """True once the request's `cancel` event (the job's cancellation flag) is set."""
+    ev = (req.metadata or {}).get("cancel")
+    return ev is not None and ev.is_set()
+
+
+async def iter_sse_json(r: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """JSON payloads of a server-sent event stream (`data: {...}` lines, ending at [DONE])."""
+    async for line in r.aiter_lines():
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        if data:
+            yield json.loads(data)
+
+
+async def iter_ndjson(r: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """One JSON object per line (Ollama's streaming format)."""
+    async for line in r.aiter_lines():
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class StreamTimer:
+    """Chunk arrival times of one streamed response.
+
+    time-to-first-token covers queueing and prefill; decode speed is measured from the
+    first to the last content chunk, in tokens when the provider reports a completion
+    count and in chunks otherwise.
+    """
+
+    def __init__(self, t0: float) -> None:
+        self.t0 = t0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.chunks = 0
+
+    def chunk(self) -> None:
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+        self.last = now
+        self.chunks += 1
+
+    def latency_ms(self) -> int:
+        return int((time.perf_counter() - self.t0) * 1000)
+
+    def meta(self, completion_tokens: Optional[int] = None) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"stream": True, "stream_chunks": self.chunks, "ttft_ms": None,
+                               "inter_token_ms": None, "tokens_per_sec": None}
+        if self.first is None or self.last is None:
+            return out
+        out["ttft_ms"] = round((self.first - self.t0) * 1000, 1)
+        tokens = int(completion_tokens) if completion_tokens else self.chunks
+        decode_s = self.last - self.first
+        if tokens > 1 and decode_s > 0:
+            out["inter_token_ms"] = round(decode_s * 1000 / (tokens - 1), 2)
+            out["tokens_per_sec"] = round((tokens - 1) / decode_s, 2)
+        return out
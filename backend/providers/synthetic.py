@@ -0,0 +1,113 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import math
+import random
+from dataclasses import dataclass, fields
+from typing import Any, Dict
+
+try:
+    from .types import ProviderRequest, ProviderResponse
+except ImportError:
+    from providers.types import ProviderRequest, ProviderResponse
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+_WORDS = (
+    "order", "refund", "account", "shipping", "policy", "customer", "payment", "delivery",
+    "update", "request", "confirm", "details", "status", "support", "return", "item",
+)
+
+
+@dataclass
+class SyntheticProfile:
+    words: int = 60  # mean answer length
+    words_spread: float = 0.2  # answer length varies +/- this fraction
+    latency_ms: float = 0.0  # mean simulated latency
+    dist: str = "fixed"  # one of LATENCY_DISTRIBUTIONS
+    spread: float = 0.25  # relative spread (uniform +/-, normal sd, lognormal sigma)
+    seed: int = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> "SyntheticProfile":
+        """Profile from a model name like `words=200,latency_ms=150,dist=lognormal`.
+
+        Unknown keys and bare names (e.g. `synthetic:default`) are ignored.
+        """
+        profile = cls()
+        types_ = {f.name: f.type for f in fields(cls)}
+        for part in (spec or "").split(","):
+            key, sep, value = part.partition("=")
+            key = key.strip()
+            if not sep or key not in types_:
+                continue
+            try:
+                if key == "dist":
+                    if value.strip() in LATENCY_DISTRIBUTIONS:
+                        profile.dist = value.strip()
+                elif types_[key] in ("int", int):
+                    setattr(profile, key, max(0, int(value)))
+                else:
+                    setattr(profile, key, max(0.0, float(value)))
+            except ValueError:
+                continue
+        return profile
+
+    def sample_latency_ms(self, rng: random.Random) -> float:
+        mean = self.latency_ms
+        if mean <= 0:
+            return 0.0
+        if self.dist == "uniform":
+            value = rng.uniform(mean * (1 - self.spread), mean * (1 + self.spread))
+        elif self.dist == "normal":
+            value = rng.gauss(mean, mean * self.spread)
+        elif self.dist == "lognormal":
+            # parameterized so the distribution's mean is latency_ms
+            value = rng.lognormvariate(math.log(mean) - self.spread ** 2 / 2, self.spread)
+        elif self.dist == "exponential":
+            value = rng.expovariate(1.0 / mean)
+        else:
+            value = mean
+        return max(0.0, value)
+
+
+class SyntheticProvider:
+    """Canned answers of configurable length and latency (model spec `synthetic:<profile>`).
+
+    Everything is derived from a hash of the profile, conversation_id, turn_index and
+    messages, so repeated runs produce identical answers and latencies. Latency is
+    simulated with asyncio.sleep; usage is reported in OpenAI shape (~1 token per word).
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._profiles: Dict[str, SyntheticProfile] = {}
+
+    def profile(self, model: str) -> SyntheticProfile:
+        profile = self._profiles.get(model)
+        if profile is None:
+            profile = self._profiles[model] = SyntheticProfile.parse(model)
+        return profile
+
+    async def chat(self, req: ProviderRequest) -> ProviderResponse:
+        profile = self.profile(req.model)
+        meta_in = req.metadata or {}
+        key = json.dumps(
+            [req.model, profile.seed, meta_in.get("conversation_id"), meta_in.get("turn_index"), req.messages],
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        rng = random.Random(hashlib.sha256(key.encode("utf-8")).hexdigest())
+        jitter = profile.words * profile.words_spread
+        n_words = max(1, int(round(rng.uniform(profile.words - jitter, profile.words + jitter))))
+        content = " ".join(rng.choice(_WORDS) for _ in range(n_words))
+        latency_ms = profile.sample_latency_ms(rng)
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000.0)
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in req.messages or []) // 4
+        meta: Dict[str, Any] = {
+            "synthetic": {"dist": profile.dist, "latency_ms": round(latency_ms, 1)},
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": n_words, "total_tokens": prompt_tokens + n_words},
+        }
+        return ProviderResponse(True, content, int(latency_ms), meta)
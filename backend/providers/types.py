@@ -3,6 +3,13 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 
+# provider_meta keys describing one call (wrapper bookkeeping, stream/load timings) rather than
+# the answer itself; they are dropped when a response is cached or replayed
+CALL_META_KEYS = (
+    "throttle_ms", "retries", "circuit",
+    "stream", "stream_chunks", "ttft_ms", "inter_token_ms", "tokens_per_sec", "load_ms",
+)
+
 @dataclass
 class ProviderRequest:
     model: str
@@ -0,0 +1,194 @@
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CATALOG_NAME = ".runs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    vertical TEXT,
+    job_id TEXT,
+    dataset_id TEXT,
+    model_spec TEXT,
+    state TEXT,
+    progress_pct INTEGER,
+    total_conversations INTEGER,
+    completed_conversations INTEGER,
+    error TEXT,
+    boot_id TEXT,
+    has_results INTEGER NOT NULL DEFAULT 0,
+    created_ts REAL,
+    updated_ts REAL,
+    status_json TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_job_id ON runs(job_id);
+CREATE INDEX IF NOT EXISTS runs_vertical ON runs(vertical);
+CREATE INDEX IF NOT EXISTS runs_dataset ON runs(dataset_id);
+CREATE INDEX IF NOT EXISTS runs_model ON runs(model_spec);
+CREATE INDEX IF NOT EXISTS runs_state ON runs(state);
+"""
+
+_COLUMNS = (
+    "run_id", "vertical", "job_id", "dataset_id", "model_spec", "state", "progress_pct",
+    "total_conversations", "completed_conversations", "error", "boot_id", "has_results",
+    "created_ts", "updated_ts",
+)
+_FILTERS = ("job_id", "vertical", "dataset_id", "model_spec", "state")
+
+
+def is_run_dir(path: Path) -> bool:
+    return (path / "job.json").exists() or (path / "run_config.json").exists()
+
+
+class RunCatalog:
+    """SQLite index of the runs under one runs root (<runs_root>/.runs.sqlite).
+
+    Run folders stay the source of truth; the catalog mirrors run_config.json and
+    job.json as they are written so listings and job-id lookups need no directory scans.
+    A catalog created next to existing run folders is backfilled from them once.
+    Connections are opened per operation so no file handle outlives a call.
+    """
+
+    def __init__(self, runs_root: Path, auto_backfill: bool = True) -> None:
+        self.runs_root = Path(runs_root)
+        self.path = self.runs_root / CATALOG_NAME
+        self.vertical = self.runs_root.name
+        self._lock = threading.Lock()
+        self.runs_root.mkdir(parents=True, exist_ok=True)
+        fresh = not self.path.exists()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+        if fresh and auto_backfill:
+            self.backfill()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            db = sqlite3.connect(str(self.path), timeout=10)
+            try:
+                db.row_factory = sqlite3.Row
+                db.execute("PRAGMA synchronous=NORMAL")
+                with db:
+                    yield db
+            finally:
+                db.close()
+
+    def _upsert(self, run_id: str, values: Dict[str, Any]) -> None:
+        values = {"vertical": self.vertical, "updated_ts": time.time(), **values}
+        cols = ", ".join(["run_id", *values])
+        marks = ", ".join("?" for _ in range(len(values) + 1))
+        # a re-initialised run (e.g. resumed) keeps its original creation time
+        updates = ", ".join(
+            "created_ts=COALESCE(runs.created_ts, excluded.created_ts)" if k == "created_ts" else f"{k}=excluded.{k}"
+            for k in values
+        )
+        with self._connect() as db:
+            db.execute(
+                f"INSERT INTO runs ({cols}) VALUES ({marks}) ON CONFLICT(run_id) DO UPDATE SET {updates}",
+                [run_id, *values.values()],
+            )
+
+    def record_config(self, run_id: str, config: Dict[str, Any], created_ts: Optional[float] = None) -> None:
+        self._upsert(run_id, {
+            "dataset_id": config.get("dataset_id"),
+            "model_spec": config.get("model_spec"),
+            "created_ts": time.time() if created_ts is None else created_ts,
+        })
+
+    def record_status(self, run_id: str, status: Dict[str, Any]) -> None:
+        values = {k: status.get(k) for k in (
+            "job_id", "state", "progress_pct", "total_conversations", "completed_conversations", "error", "boot_id",
+        )}
+        values["status_json"] = json.dumps(status)
+        if status.get("state") == "succeeded":
+            values["has_results"] = 1
+        self._upsert(run_id, values)
+
+    def record_results(self, run_id: str) -> None:
+        self._upsert(run_id, {"has_results": 1})
+
+    def _row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        item = {k: row[k] for k in _COLUMNS}
+        item["has_results"] = bool(item["has_results"])
+        return item
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM runs WHERE run_id=?", (run_id,)).fetchone()
+        return self._row(row) if row is not None else None
+
+    def find_job(self, job_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(run_id, persisted job status) of the most recently updated run of a job."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT run_id, status_json FROM runs WHERE job_id=? ORDER BY updated_ts DESC LIMIT 1", (job_id,)
+            ).fetchone()
+        if row is None or not row["status_json"]:
+            return None
+        return row["run_id"], json.loads(row["status_json"])
+
+    def list(self, limit: Optional[int] = None, offset: int = 0, **filters: Any) -> Tuple[List[Dict[str, Any]], int]:
+        """Runs ordered by run_id matching the given column filters, plus the total match count."""
+        where = [f"{k}=?" for k in _FILTERS if filters.get(k) is not None]
+        args = [filters[k] for k in _FILTERS if filters.get(k) is not None]
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        with self._connect() as db:
+            total = db.execute(f"SELECT COUNT(*) FROM runs{clause}", args).fetchone()[0]
+            rows = db.execute(
+                f"SELECT * FROM runs{clause} ORDER BY run_id LIMIT ? OFFSET ?",
+                args + [-1 if limit is None else max(0, int(limit)), max(0, int(offset))],
+            ).fetchall()
+        return [self._row(r) for r in rows], int(total)
+
+    def backfill(self) -> int:
+        """Index every run folder under runs_root from its run_config.json/job.json; returns the count."""
+        try:
+            from .compression import find_artifact
+        except ImportError:
+            from compression import find_artifact
+        count = 0
+        for p in sorted(self.runs_root.iterdir()):
+            if not p.is_dir() or p.name.startswith(".") or not is_run_dir(p):
+                continue
+            cfg_path = p / "run_config.json"
+            try:
+                cfg = json.loads(cfg_path.read_text(encoding="utf-8")) if cfg_path.exists() else {}
+            except (OSError, ValueError):
+                cfg = {}
+            self.record_config(p.name, cfg, created_ts=cfg_path.stat().st_mtime if cfg_path.exists() else None)
+            try:
+                self.record_status(p.name, json.loads((p / "job.json").read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                pass
+            if find_artifact(p / "results.json") is not None:
+                self.record_results(p.name)
+            count += 1
+        return count
+
+
+_CATALOGS: Dict[Path, RunCatalog] = {}  # one instance (schema check, backfill) per runs root
+_CATALOGS_LOCK = threading.Lock()
+
+
+def run_catalog(runs_root: Path) -> Optional[RunCatalog]:
+    """Shared catalog of a runs root; None when disabled (RUN_CATALOG=off) or unavailable."""
+    if os.getenv("RUN_CATALOG", "on").strip().lower() in ("off", "0", "false", "no"):
+        return None
+    key = Path(runs_root).resolve()
+    with _CATALOGS_LOCK:
+        cat = _CATALOGS.get(key)
+        if cat is None:
+            try:
+                cat = RunCatalog(key)
+            except (sqlite3.Error, OSError):
+                return None
+            _CATALOGS[key] = cat
+        return cat
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import copy
+import json
 import re
 from typing import Dict, List, Optional, Any
 
@@ -51,38 +53,77 @@ AMOUNT_REFUND_PAT = re.compile(r"(?:refund(?: of)?|reimburse(?:ment)?(?: of)?)\s
 AMOUNT_GENERAL_PAT = re.compile(r"\$\s*([0-9]+(?:\.[0-9]{1,2})?)\b")
 
 
+class RuleFamily:
+    """An ordered [(label, [patterns])] rule table compiled once at import.
+
+    Each label's patterns are merged into a single alternation, so a turn costs one
+    regex search per label instead of one `re.search` (and re cache lookup) per raw
+    pattern. Label order is priority order and results match the per-pattern loops.
+    """
+
+    def __init__(self, rules: List[tuple], flags: int = 0) -> None:
+        self._rules = [
+            (label, re.compile("|".join(f"(?:{p})" for p in pats), flags).search)
+            for label, pats in rules
+        ]
+
+    def first(self, text: str) -> Any:
+        """Highest-priority label with a match, or None."""
+        for label, search in self._rules:
+            if search(text):
+                return label
+        return None
+
+    def all(self, text: str) -> List[Any]:
+        """Every matching label, in priority order."""
+        return [label for label, search in self._rules if search(text)]
+
+
+# Compiled once at import; intents and policy flags match against lowercased text
+_INTENT_RULES = {domain: RuleFamily(list(intents.items())) for domain, intents in COMMON_INTENTS.items()}
+_POLICY_FLAG_RULES = RuleFamily(list(POLICY_FLAGS_PATTERNS.items()))
+_DECISION_RULES = RuleFamily([(val, [pat]) for pat, val in DECISION_MAP.items()], re.I)
+# Decision including refund-phrasing fallbacks (only consulted when DECISION_MAP finds nothing)
+_ASSISTANT_DECISION_RULES = RuleFamily(
+    [(val, [pat]) for pat, val in DECISION_MAP.items()]
+    + [
+        ("DENY", [REFUND_NEGATIVE.pattern]),
+        ("PARTIAL", [REFUND_PARTIAL.pattern]),
+        ("ALLOW", [REFUND_POSITIVE.pattern]),
+    ],
+    re.I,
+)
+_NEXT_ACTION_RULES = RuleFamily(
+    [
+        ("issue_refund", [r"issue (a )?refund|process(ing)? refund"]),
+        ("confirm_order", [r"confirm order|confirmed order"]),
+        ("escalate", [r"escalat(e|ion)"]),
+        ("request_more_info", [r"need (more )?info|provide details"]),
+    ],
+    re.I,
+)
+FINAL_STATE_PAT = re.compile(r"FINAL_STATE\s*:\s*(\{.*\})\s*$", re.I)
+TOTAL_PAT = re.compile(r"total\s*\$?\s*([0-9]+(?:\.[0-9]{1,2})?)", re.I)
+KYC_OK_PAT = re.compile(r"kyc (ok|passed)", re.I)
+KYC_FLAG_PAT = re.compile(r"kyc (fail|flag)", re.I)
+LIMIT_PAT = re.compile(r"limit exceeded|over limit|above limit", re.I)
+
+_NO_RULES = RuleFamily([])
+
+
 def _detect_intent(domain: str, text: str) -> Optional[str]:
-    text_l = text.lower()
-    for intent, pats in COMMON_INTENTS.get(domain, {}).items():
-        for p in pats:
-            if re.search(p, text_l):
-                return intent
-    return None
+    return _INTENT_RULES.get(domain, _NO_RULES).first(text.lower())
 
 
 def _collect_policy_flags(text: str) -> List[str]:
-    out: List[str] = []
-    tl = text.lower()
-    for flag, pats in POLICY_FLAGS_PATTERNS.items():
-        for p in pats:
-            if re.search(p, tl):
-                out.append(flag)
-                break
-    return out
+    return _POLICY_FLAG_RULES.all(text.lower())
 
 
 def _detect_decision(text: str) -> Optional[str]:
-    for pat, val in DECISION_MAP.items():
-        if re.search(pat, text, re.I):
-            return val
-    return None
+    return _DECISION_RULES.first(text)
 
 
-def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """
-    Deterministic extractor over the full transcript (turns as list of {role,user|assistant; text}).
-    Returns a compact state object aggregated from all turns. No LLM usage.
-    """
+def _initial_state(domain: str) -> Dict[str, Any]:
     state: Dict[str, Any] = {
         "user_intent": None,
         "decision": None,
@@ -104,6 +145,83 @@ def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional
             "kyc_status": None,
             "limit_flags": [],
         })
+    return state
+
+
+def _apply_turn(domain: str, state: Dict[str, Any], t: Dict[str, str]) -> None:
+    """Fold one turn into state in place (latest info wins)."""
+    role = t.get("role", "").lower()
+    text = t.get("text", "")
+    # Fast-path: parse structured FINAL_STATE JSON line if present at end of assistant reply
+    if role == "assistant":
+        try:
+            m = FINAL_STATE_PAT.search(text)
+            if m:
+                js = m.group(1)
+                obj = json.loads(js)
+                # Merge allowed keys
+                for k in ("decision", "next_action", "refund_amount", "policy_flags"):
+                    if k in obj:
+                        state[k] = obj[k]
+        except Exception:
+            pass
+    text_l = text.lower()
+    # intent primarily from user turns
+    if role == "user":
+        intent = _INTENT_RULES.get(domain, _NO_RULES).first(text_l)
+        if intent:
+            state["user_intent"] = intent
+    # decisions/actions from assistant turns
+    if role == "assistant":
+        # DECISION_MAP first, then refund phrasing heuristics (negative, partial, positive)
+        dec = _ASSISTANT_DECISION_RULES.first(text or "")
+        if dec:
+            state["decision"] = dec
+        action = _NEXT_ACTION_RULES.first(text)
+        if action:
+            state["next_action"] = action
+
+    # Common flags and notes
+    flags = _POLICY_FLAG_RULES.all(text_l)
+    if flags:
+        for f in flags:
+            if f not in state["policy_flags"]:
+                state["policy_flags"].append(f)
+
+    # Domain-specific extraction
+    if domain == "commerce":
+        m = ORDER_PAT.search(text)
+        if m:
+            order_id = m.group(1) or m.group(2)
+            state["order_id"] = order_id
+        mr = AMOUNT_REFUND_PAT.search(text)
+        if mr:
+            state["refund_amount"] = float(mr.group(1))
+        mt = TOTAL_PAT.search(text)
+        if mt:
+            state["totals"] = float(mt.group(1))
+    elif domain == "banking":
+        ma = ACCOUNT_PAT.search(text)
+        if ma:
+            state["account_id"] = ma.group(1)
+        mamt = AMOUNT_GENERAL_PAT.search(text)
+        if mamt:
+            state["amount"] = float(mamt.group(1))
+        if KYC_OK_PAT.search(text):
+            state["kyc_status"] = "ok"
+        elif KYC_FLAG_PAT.search(text):
+            state["kyc_status"] = "flag"
+        if LIMIT_PAT.search(text):
+            if "limit_exceeded" not in state.get("limit_flags", []):
+                state.setdefault("limit_flags", []).append("limit_exceeded")
+
+
+def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Deterministic extractor over the full transcript (turns as list of {role,user|assistant; text}).
+    Returns a compact state object aggregated from all turns. No LLM usage.
+    """
+    state = _initial_state(domain)
 
     if prev_state:
         # start from previous known values
@@ -112,81 +230,37 @@ def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional
 
     # Process turns sequentially, latest info wins
     for t in turns:
-        role = t.get("role", "").lower()
-        text = t.get("text", "")
-        # Fast-path: parse structured FINAL_STATE JSON line if present at end of assistant reply
-        if role == "assistant":
-            try:
-                import json as _json
-                import re as _re
-                m = _re.search(r"FINAL_STATE\s*:\s*(\{.*\})\s*$", text, _re.I)
-                if m:
-                    js = m.group(1)
-                    obj = _json.loads(js)
-                    # Merge allowed keys
-                    for k in ("decision", "next_action", "refund_amount", "policy_flags"):
-                        if k in obj:
-                            state[k] = obj[k]
-            except Exception:
-                pass
-        # intent primarily from user turns
-        if role == "user":
-            intent = _detect_intent(domain, text)
-            if intent:
-                state["user_intent"] = intent
-        # decisions/actions from assistant turns
-        if role == "assistant":
-            dec = _detect_decision(text)
-            # Heuristics around refund phrasing
-            if REFUND_NEGATIVE.search(text or ""):
-                dec = dec or "DENY"
-            elif REFUND_PARTIAL.search(text or ""):
-                dec = dec or "PARTIAL"
-            elif REFUND_POSITIVE.search(text or ""):
-                dec = dec or "ALLOW"
-            if dec:
-                state["decision"] = dec
-            if re.search(r"issue (a )?refund|process(ing)? refund", text, re.I):
-                state["next_action"] = "issue_refund"
-            elif re.search(r"confirm order|confirmed order", text, re.I):
-                state["next_action"] = "confirm_order"
-            elif re.search(r"escalat(e|ion)", text, re.I):
-                state["next_action"] = "escalate"
-            elif re.search(r"need (more )?info|provide details", text, re.I):
-                state["next_action"] = "request_more_info"
-
-        # Common flags and notes
-        flags = _collect_policy_flags(text)
-        if flags:
-            for f in flags:
-                if f not in state["policy_flags"]:
-                    state["policy_flags"].append(f)
-
-        # Domain-specific extraction
-        if domain == "commerce":
-            m = ORDER_PAT.search(text)
-            if m:
-                order_id = m.group(1) or m.group(2)
-                state["order_id"] = order_id
-            mr = AMOUNT_REFUND_PAT.search(text)
-            if mr:
-                state["refund_amount"] = float(mr.group(1))
-            mt = re.search(r"total\s*\$?\s*([0-9]+(?:\.[0-9]{1,2})?)", text, re.I)
-            if mt:
-                state["totals"] = float(mt.group(1))
-        elif domain == "banking":
-            ma = ACCOUNT_PAT.search(text)
-            if ma:
-                state["account_id"] = ma.group(1)
-            mamt = AMOUNT_GENERAL_PAT.search(text)
-            if mamt:
-                state["amount"] = float(mamt.group(1))
-            if re.search(r"kyc (ok|passed)", text, re.I):
-                state["kyc_status"] = "ok"
-            elif re.search(r"kyc (fail|flag)", text, re.I):
-                state["kyc_status"] = "flag"
-            if re.search(r"limit exceeded|over limit|above limit", text, re.I):
-                if "limit_exceeded" not in state.get("limit_flags", []):
-                    state.setdefault("limit_flags", []).append("limit_exceeded")
+        _apply_turn(domain, state, t)
 
     return state
+
+
+class IncrementalStateExtractor:
+    """Per-conversation extractor that only consumes turns it has not seen yet.
+
+    `advance(turns)` expects successive calls with growing prefixes of the same
+    transcript and returns the same state as `extract_state(domain, turns)`.
+    `with_reply(text)` returns that state with an assistant reply folded in, matching
+    `extract_state(domain, turns + [reply], prev_state=state)`, without mutating the
+    transcript state (model replies are not part of the scripted transcript).
+    """
+
+    def __init__(self, domain: str) -> None:
+        self.domain = domain
+        self._state = _initial_state(domain)
+        self._consumed = 0
+
+    def advance(self, turns: List[Dict[str, str]]) -> Dict[str, Any]:
+        if len(turns) < self._consumed:
+            # Not a continuation of what we have seen; start over.
+            self._state = _initial_state(self.domain)
+            self._consumed = 0
+        for t in turns[self._consumed:]:
+            _apply_turn(self.domain, self._state, t)
+        self._consumed = len(turns)
+        return copy.deepcopy(self._state)
+
+    def with_reply(self, text: str) -> Dict[str, Any]:
+        state = copy.deepcopy(self._state)
+        _apply_turn(self.domain, state, {"role": "assistant", "text": text or ""})
+        return state
@@ -40,3 +40,115 @@ def test_write_and_read_json_and_csv():
         # check csv rows
         content = p.read_text(encoding="utf-8").splitlines()
         assert len(content) >= 2
+
+
+def test_compressed_results_are_read_and_served_transparently(monkeypatch):
+    from fastapi.testclient import TestClient
+    import app as app_mod
+
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        w = RunArtifactWriter(root)
+        rid = "rid"
+        w.init_run(rid, {"dataset_id": "ds1"})
+        res = sample_results()
+        w.write_results_json(rid, res)  # plain first; the compressed write replaces it
+        p_json = w.write_results_json(rid, res, compression="gzip")
+        p_csv = w.write_results_csv(rid, res, compression="gzip")
+        assert p_json.name == "results.json.gz" and p_csv.name == "results.csv.gz"
+        assert not (root / rid / "results.json").exists()
+        stats = w.compression_stats(rid)
+        assert stats["mode"] == "gzip" and stats["ratio"] > 1.0
+        assert set(stats["artifacts"]) == {"results.json", "results.csv"}
+
+        r = RunArtifactReader(root)
+        assert r.read_results_json(rid) == res
+        # rewriting without an explicit mode keeps the stored format
+        assert w.write_results_json(rid, res).name == "results.json.gz"
+
+        monkeypatch.setitem(app_mod.app.state.vctx, "commerce", {"orch": None, "artifacts": w, "reader": r, "vertical": "commerce"})
+        client = TestClient(app_mod.app)
+        plain = client.get(f"/runs/{rid}/artifacts?type=json&vertical=commerce", headers={"Accept-Encoding": "identity"})
+        assert plain.status_code == 200 and "content-encoding" not in plain.headers
+        assert plain.json() == res
+        encoded = client.get(f"/runs/{rid}/artifacts?type=csv&vertical=commerce", headers={"Accept-Encoding": "gzip"})
+        assert encoded.headers["content-encoding"] == "gzip"
+        assert encoded.text.startswith("run_id,")
+        assert client.get(f"/runs/{rid}/results?vertical=commerce").json() == res
+
+
+def test_zstd_turn_records_use_a_trained_dictionary(monkeypatch):
+    import pytest
+    pytest.importorskip("zstandard")
+    from compression import ArtifactCodec, ZstdDictionaries, decompress, dictionary_root
+
+    monkeypatch.setenv("ZSTD_DICT_SAMPLES", "50")
+    with tempfile.TemporaryDirectory() as d:
+        dicts = ZstdDictionaries(dictionary_root(Path(d)))
+        codec = ArtifactCodec("zstd", dicts)
+        records = [
+            json.dumps({"run_id": "r", "turn_index": i, "state": {"order_id": f"A{i}"}, "response": {"ok": True, "content": f"reply {i} " * 5}}).encode("utf-8")
+            for i in range(120)
+        ]
+        frames = [codec.compress(rec, kind="turn_records", record=True) for rec in records]
+        assert dicts.current() is not None
+        # a fresh reader resolves each frame's dictionary by id
+        fresh = ZstdDictionaries(dictionary_root(Path(d)))
+        assert [decompress(f, fresh) for f in frames] == records
+        assert codec.stats()["ratio"] > 1.0
+
+
+def test_parquet_export_has_typed_per_turn_columns():
+    import pytest
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        w = RunArtifactWriter(root)
+        res = sample_results()
+        res["conversations"][0]["axes"] = {"price_sensitivity": "high"}
+        res["conversations"][0]["turns"][0].update({"latency_ms": 12, "input_tokens": 40, "output_tokens": 7, "cache_hit": False})
+        p = w.write_results_parquet("rid", res)
+        table = pq.read_table(str(p))
+        assert table.num_rows == 2
+        types = {f.name: str(f.type) for f in table.schema}
+        assert types["turn_index"] == "int64" and types["exact_pass"] == "bool"
+        assert types["semantic_score"] == "double" and types["axis_price_sensitivity"] == "string"
+        rows = table.to_pylist()
+        assert rows[0]["latency_ms"] == 12 and rows[0]["exact_pass"] is True
+        # metrics that did not run stay null instead of False
+        assert rows[0]["semantic_pass"] is None and rows[1]["semantic_score"] == 0.5
+
+
+def test_job_status_writer_coalesces_progress_and_writes_atomically():
+    import asyncio
+    from artifacts import JobStatusWriter
+
+    async def scenario(d):
+        w = RunArtifactWriter(Path(d))
+        sw = JobStatusWriter(w, interval_ms=50)
+        path = w.layout.job_status_path("r1")
+        sw.update("r1", {"job_id": "j1", "state": "running", "progress_pct": 0})
+        for pct in range(1, 100):
+            sw.update("r1", {"job_id": "j1", "state": "running", "progress_pct": pct})
+        assert sw.writes == 1  # first write only; progress is pending
+        assert sw.snapshot("j1")["progress_pct"] == 99
+        assert json.loads(path.read_text(encoding="utf-8"))["progress_pct"] == 0
+        await asyncio.sleep(0.1)
+        assert sw.writes == 2  # one trailing write for all pending updates
+        assert json.loads(path.read_text(encoding="utf-8"))["progress_pct"] == 99
+        sw.update("r1", {"job_id": "j1", "state": "succeeded", "progress_pct": 100})
+        assert json.loads(path.read_text(encoding="utf-8"))["state"] == "succeeded"  # terminal: immediate
+        assert sorted(p.name for p in path.parent.iterdir()) == ["job.json"]  # no temp files left
+        assert sw.snapshot("j1") is None  # finished jobs are not kept in memory
+        await asyncio.sleep(0.1)
+        assert sw.writes == 3
+
+        # snapshots are per job, even when a rerun shares the run folder
+        sw.update("r2", {"job_id": "j2", "state": "cancelling", "progress_pct": 40})
+        sw.update("r2", {"job_id": "j3", "state": "running", "progress_pct": 5})
+        assert sw.snapshot("j2")["progress_pct"] == 40
+        assert sw.snapshot("j3")["progress_pct"] == 5
+
+    with tempfile.TemporaryDirectory() as d:
+        asyncio.run(scenario(d))
@@ -26,3 +26,43 @@ def test_cli_run_with_sample(tmp_path: Path, monkeypatch):
     # should have created a runs folder with at least one subdir
     runs = list((tmp_path / "runs").glob("*/"))
     assert runs, "expected at least one run folder created"
+
+
+def test_cli_run_id_matches_config_without_context(tmp_path: Path):
+    from backend.orchestrator import compute_run_id
+
+    assert cli.main(["init", "--root", str(tmp_path)]) == 0
+    rc_path = tmp_path / "configs" / "sample.run.json"
+    rc = json.loads(rc_path.read_text(encoding="utf-8"))
+    rc["models"] = ["gemini:gemini-2.5"]
+    rc["concurrency"] = 2  # execution-only: must not change the run id
+    rc_path.write_text(json.dumps(rc), encoding="utf-8")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(rc_path)]) == 0
+
+    ds = json.loads((tmp_path / "datasets" / "demo.dataset.json").read_text(encoding="utf-8"))
+    expected = compute_run_id(ds["dataset_id"], ds["version"], "gemini:gemini-2.5",
+                              {"metrics": rc.get("metrics") or [], "thresholds": rc.get("thresholds") or {}})
+    assert (tmp_path / "runs" / expected).is_dir()
+
+
+def test_cli_run_accepts_offline_providers(tmp_path: Path):
+    assert cli.main(["init", "--root", str(tmp_path)]) == 0
+    rc_path = tmp_path / "configs" / "sample.run.json"
+    rc = json.loads(rc_path.read_text(encoding="utf-8"))
+    rc["models"] = ["synthetic:words=20"]
+    rc["metrics"] = ["exact"]
+    rc_path.write_text(json.dumps(rc), encoding="utf-8")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(rc_path)]) == 0
+    (source,) = [p.name for p in (tmp_path / "runs").iterdir() if p.is_dir() and (p / "results.json").exists()]
+
+    rc["models"] = [f"replay:{source}"]
+    rc_path.write_text(json.dumps(rc), encoding="utf-8")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(rc_path)]) == 0
+    (replay_dir,) = (tmp_path / "runs").glob("*-replay-*")
+    replayed = json.loads((replay_dir / "results.json").read_text(encoding="utf-8"))
+    turns = [t for c in replayed["conversations"] for t in c["turns"]]
+    assert turns and all(t["output_tokens"] for t in turns)
+
+    rc["models"] = ["unknown:model"]
+    rc_path.write_text(json.dumps(rc), encoding="utf-8")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(rc_path)]) == 3  # schema validation error
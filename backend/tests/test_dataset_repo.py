@@ -71,3 +71,73 @@ def test_invalid_json_and_schema_rejection():
         assert len(items) == 1
         assert items[0]["valid"] is False
         assert "errors" in items[0]
+
+
+def test_index_reused_until_files_change():
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"conv{i}", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]} for i in range(3)
+            ],
+        }
+        golden = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "entries": [
+                {"conversation_id": f"conv{i}", "turns": [{"turn_index": 1, "expected": {"variants": [f"v{i}"]}}]}
+                for i in range(3)
+            ],
+        }
+        write_json(root / "commerce_sample.dataset.json", ds)
+        write_json(root / "commerce_sample.golden.json", golden)
+
+        repo = DatasetRepository(root)
+        calls = []
+        orig_validate = repo.sv.validate
+        repo.sv.validate = lambda kind, data: calls.append(kind) or orig_validate(kind, data)
+
+        for i in range(3):
+            assert repo.get_golden(f"conv{i}")["entry"]["turns"][0]["expected"]["variants"] == [f"v{i}"]
+        repo.list_datasets()
+        repo.get_dataset("commerce_sample")
+        assert calls == ["dataset", "golden"]
+
+        # returned objects are copies; mutating them does not poison the index
+        repo.get_dataset("commerce_sample")["conversations"].clear()
+        assert len(repo.get_dataset("commerce_sample")["conversations"]) == 3
+
+        # rewriting a file (size changes) invalidates only that file
+        golden["entries"][0]["turns"][0]["expected"]["variants"] = ["changed variant"]
+        write_json(root / "commerce_sample.golden.json", golden)
+        assert repo.get_golden("conv0")["entry"]["turns"][0]["expected"]["variants"] == ["changed variant"]
+        assert calls == ["dataset", "golden", "golden"]
+
+        # new files are picked up
+        write_json(root / "other.dataset.json", {**ds, "dataset_id": "other", "conversations": [
+            {"conversation_id": "conv9", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]}]})
+        assert repo.get_conversation("conv9")["dataset_id"] == "other"
+
+
+def test_get_golden_picks_the_conversations_dataset_without_loading_it():
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        turns = [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]
+        write_json(root / "combined.dataset.json", {
+            "dataset_id": "combined", "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "conv1", "turns": turns}],
+        })
+        for ds_id in ("aaa_scenario", "combined"):  # golden files are scanned in name order
+            write_json(root / f"{ds_id}.golden.json", {
+                "dataset_id": ds_id, "version": "1.0.0",
+                "entries": [{"conversation_id": "conv1", "turns": [{"turn_index": 1, "expected": {"variants": [ds_id]}}]}],
+            })
+        repo = DatasetRepository(root)
+        repo.get_conversation = None  # the lookup goes through the index, not a conversation copy
+        gold = repo.get_golden("conv1")
+        assert gold["dataset_id"] == "combined"
+        assert gold["entry"]["turns"][0]["expected"]["variants"] == ["combined"]
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from embeddings.batcher import EmbeddingBatcher
+
+
+class _RecordingEmbedder:
+    model = "fake-embed"
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("boom")
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_callers():
+    inner = _RecordingEmbedder()
+    b = EmbeddingBatcher(inner, max_batch=4, linger_ms=20)
+    outs = await asyncio.gather(
+        b.embed(["a", "bb"]),
+        b.embed(["bb", "ccc"]),
+        b.embed(["dddd"]),
+    )
+    assert outs == [[[1.0], [2.0]], [[2.0], [3.0]], [[4.0]]]
+    # size threshold (4 pending) flushed the first two callers together; duplicate 'bb' sent once
+    assert inner.calls == [["a", "bb", "ccc"], ["dddd"]]
+    st = b.stats()
+    assert st["requests"] == 3 and st["batches"] == 2 and st["largest_batch"] == 3
+    assert b.model == "fake-embed"
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_errors_to_each_caller():
+    b = EmbeddingBatcher(_RecordingEmbedder(fail=True), max_batch=8, linger_ms=1)
+    res = await asyncio.gather(b.embed(["a"]), b.embed(["b"]), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in res)
+    assert b.stats()["failed_batches"] == 1
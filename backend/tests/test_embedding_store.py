@@ -0,0 +1,120 @@
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from embeddings.embedding_store import EmbeddingStore, warm_texts
+from metrics import semantic_similarity
+
+
+def test_store_roundtrip_persists_and_evicts():
+    with tempfile.TemporaryDirectory() as td:
+        # 4-dim float32 rows = 16 bytes; cap at 3 rows
+        st = EmbeddingStore(Path(td), max_bytes=48)
+        st.put_many("m", ["a", "b", "c"], [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]])
+        assert st.get_many("m", ["a"]) == [[1.0, 0.0, 0.0, 0.0]]  # 'a' becomes most recent
+        st.put_many("m", ["d"], [[0, 0, 0, 1]])  # evicts 'b'
+        assert st.get_many("m", ["b"]) == [None]
+        assert st.get_many("other-model", ["a"]) == [None]
+        st.close()
+
+        reopened = EmbeddingStore(Path(td), max_bytes=48)
+        got = reopened.get_many("m", ["a", "c", "d"])
+        assert got == [[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+        vec_files = list(Path(td).glob("*.vec"))
+        assert len(vec_files) == 1 and vec_files[0].stat().st_size <= 48
+
+
+def test_store_journals_rows_and_compacts_after_flush_rows():
+    import json
+    with tempfile.TemporaryDirectory() as td:
+        st = EmbeddingStore(Path(td), max_bytes=16 * 4, flush_rows=3)
+        st.put_many("m", ["a", "b"], [[1, 0, 0, 0], [0, 1, 0, 0]])
+        snapshot = next(Path(td).glob("*.idx.json"))
+        assert json.loads(snapshot.read_text())["rows"] == []  # new rows only went to the journal
+        # another store (e.g. another process) sees them through the journal
+        assert EmbeddingStore(Path(td)).get_many("m", ["b"]) == [[0.0, 1.0, 0.0, 0.0]]
+        st.put_many("m", ["c"], [[0, 0, 1, 0]])
+        assert len(json.loads(snapshot.read_text())["rows"]) == 3  # flush_rows reached: compacted
+        shard = st._shard("m")
+        assert shard.free == {3}  # the unused row is tracked instead of rescanned
+        st.put_many("m", ["d", "e"], [[0, 0, 0, 1], [1, 1, 0, 0]])  # full: 'e' evicts 'a'
+        assert shard.free == set() and sorted(shard.rows.values()) == [0, 1, 2, 3]
+        assert st.get_many("m", ["a"]) == [None]
+        st.close()
+        assert EmbeddingStore(Path(td)).get_many("m", ["e"]) == [[1.0, 1.0, 0.0, 0.0]]
+
+
+def test_stores_sharing_a_directory_do_not_clobber_each_other():
+    with tempfile.TemporaryDirectory() as td:
+        a = EmbeddingStore(Path(td), max_bytes=16 * 64, flush_rows=5)
+        b = EmbeddingStore(Path(td), max_bytes=16 * 64, flush_rows=5)
+        for i in range(20):  # interleaved writes, each store growing the file in turn
+            a.put_many("m", [f"a{i}"], [[i, 1, 0, 0]])
+            b.put_many("m", [f"b{i}", f"b{i}x"], [[i, 2, 0, 0], [i, 3, 0, 0]])
+        a.close()
+        b.close()
+        fresh = EmbeddingStore(Path(td))
+        got = fresh.get_many("m", [f"a{i}" for i in range(20)] + [f"b{i}" for i in range(20)])
+        assert got == [[float(i), 1.0, 0.0, 0.0] for i in range(20)] + [[float(i), 2.0, 0.0, 0.0] for i in range(20)]
+        assert len(set(fresh._shard("m").rows.values())) == 60  # no row handed out twice
+
+
+def _put_in_child(root, prefix, n):
+    st = EmbeddingStore(Path(root), flush_rows=64)
+    for i in range(0, n, 8):
+        st.put_many("m", [f"{prefix}{j}" for j in range(i, i + 8)], [[float(j)] * 768 for j in range(i, i + 8)])
+    st.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stores are shared across processes on POSIX only")
+def test_store_shared_by_two_processes():
+    import multiprocessing
+    with tempfile.TemporaryDirectory() as td:
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_put_in_child, args=(td, p, 200)) for p in ("x", "y")]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        assert [p.exitcode for p in procs] == [0, 0]
+        got = EmbeddingStore(Path(td)).get_many("m", [f"{p}{j}" for p in ("x", "y") for j in range(200)])
+        assert all(v is not None and v[0] == float(j) and v[-1] == float(j) for v, j in zip(got, list(range(200)) * 2))
+
+
+def test_store_float16_returns_storage_precision():
+    with tempfile.TemporaryDirectory() as td:
+        st = EmbeddingStore(Path(td), dtype="float16")
+        stored = st.put_many("m", ["x"], [[0.1, 0.2, 0.3]])
+        assert stored == st.get_many("m", ["x"])
+        assert stored[0] != [0.1, 0.2, 0.3] and abs(stored[0][0] - 0.1) < 1e-3
+
+
+class _CountingEmbedder:
+    model = "fake-embed"
+
+    def __init__(self):
+        self.calls = []
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_semantic_similarity_uses_store_across_runs():
+    with tempfile.TemporaryDirectory() as td:
+        st = EmbeddingStore(Path(td))
+        emb = _CountingEmbedder()
+        counts = await warm_texts(["hello", "world", "hello"], st, emb, emb.model, batch_size=1)
+        assert counts == {"texts": 2, "already_cached": 0, "embedded": 2}
+        assert emb.calls == [["hello"], ["world"]]
+
+        r1 = await semantic_similarity("hi", ["hello", "world"], embedder=emb, threshold=0.5, store=st)
+        assert emb.calls[-1] == ["hi"]  # golden variants came from the store
+        # with a fresh per-run cache only the output is embedded again: outputs are never stored
+        r2 = await semantic_similarity("hi", ["hello", "world"], embedder=emb, threshold=0.5, cache={}, store=st)
+        assert emb.calls[-1] == ["hi"] and len(emb.calls) == 4
+        assert st.get_many(emb.model, ["hi"]) == [None]
+        assert r1["scores"] == r2["scores"] and r1["best_variant_index"] == r2["best_variant_index"]
@@ -20,3 +20,32 @@ async def test_semantic_similarity_mock(monkeypatch):
     res = await semantic_similarity("hello", ["hello", "world"], embedder=OllamaEmbeddings(), threshold=0.8)
     assert res["pass"] is True
     assert pytest.approx(res["score_max"], 1e-6) == 1.0
+
+
+def test_vectorized_cosine_matches_scalar_loop(monkeypatch):
+    import random
+    import embeddings.similarity as sim
+
+    rng = random.Random(3)
+    cases = []
+    for _ in range(200):
+        dim = rng.choice([3, 16, 768])
+        out = [rng.uniform(-1, 1) for _ in range(dim)]
+        variants = [[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(rng.randint(1, 6))]
+        cases.append((out, variants))
+    base = [0.3] * 8
+    cases.append((base, [[0.6] * 8, [0.3] * 8, [0.0] * 8]))  # exact tie, zero variant
+    cases.append(([0.0] * 8, [[1.0] * 8, [2.0] * 8]))  # zero output
+    cases.append(([1.0, 0.0], [[-1.0, 0.0]]))  # all scores -1.0
+    cases.append(([1.0, 2.0], [[1.0, 2.0, 3.0], [1.0, 2.0]]))  # ragged
+
+    for out, variants in cases:
+        expected = sim._scalar_scores(out, variants)
+        scores, idx, best = sim.cosine_scores(out, variants)
+        assert (idx, best) == expected[1:]
+        assert all(abs(a - b) < 1e-12 for a, b in zip(scores, expected[0]))
+
+    monkeypatch.setattr(sim, "np", None)
+    out, variants = cases[0]
+    assert sim.variant_matrix(variants) is None
+    assert sim.cosine_scores(out, variants) == sim._scalar_scores(out, variants)
@@ -73,3 +73,616 @@ async def test_orchestrator_cancel(monkeypatch):
         orch.cancel(jr.job_id)
         res = await orch.wait(jr.job_id)
         assert res.state == 'cancelled'
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_concurrent_conversations(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        turns = [
+            {"role": "user", "text": "hi"},
+            {"role": "assistant", "text": "hello"},
+            {"role": "user", "text": "thanks"},
+        ]
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": f"c{i}", "turns": turns} for i in range(6)],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        in_flight = {"now": 0, "max": 0}
+        seen: dict = {}
+
+        async def tracking_run_turn(self, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            seen.setdefault(kwargs["conversation_id"], []).append(kwargs["turn_index"])
+            in_flight["now"] -= 1
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', tracking_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest',
+                         config={"metrics": ["exact"], "context": {"concurrency": 3}})
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        assert res.completed_conversations == 6
+        assert in_flight["max"] == 3
+        # turns within a conversation stay ordered
+        assert all(v == [0, 2] for v in seen.values())
+        # concurrency does not change the run identity
+        plain = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest',
+                            config={"metrics": ["exact"], "context": {}})
+        assert plain.run_id == jr.run_id
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_batches_semantic_embeddings(monkeypatch):
+    import orchestrator as orchestrator_mod
+    OllamaEmbeddings = orchestrator_mod.OllamaEmbeddings
+
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        turns = [{"role": "user", "text": "where is my order"}, {"role": "assistant", "text": "x"}]
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": f"c{i}", "turns": turns} for i in range(8)],
+        }
+        golden = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "entries": [
+                {"conversation_id": f"c{i}", "turns": [{"turn_index": 1, "expected": {"variants": [f"answer {i}", "shared"]}}],
+                 "final_outcome": {"decision": "ALLOW"}}
+                for i in range(8)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        Path(ds_dir, 'commerce_sample.golden.json').write_text(json.dumps(golden), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        orch.embedding_store = None
+
+        async def writing_run_turn(self, **kwargs):
+            conv_dir = runs_dir / kwargs["run_id"] / "conversations" / kwargs["conversation_id"]
+            conv_dir.mkdir(parents=True, exist_ok=True)
+            rec = {"turn_index": kwargs["turn_index"], "response": {"ok": True, "content": f"reply {kwargs['conversation_id']}"}}
+            (conv_dir / f"turn_{kwargs['turn_index']:03d}.json").write_text(json.dumps(rec), encoding="utf-8")
+            return rec
+        monkeypatch.setattr(type(orch._runner), 'run_turn', writing_run_turn, raising=True)
+
+        calls = []
+
+        async def fake_embed(self, texts):
+            calls.append(list(texts))
+            return [[1.0, float(len(t))] for t in texts]
+        monkeypatch.setattr(OllamaEmbeddings, "embed", fake_embed, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest',
+                         config={"metrics": ["semantic"], "context": {"concurrency": 8, "embed_batching": {"max_batch": 64, "linger_ms": 20}}})
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        results = json.loads(Path(runs_dir, jr.run_id, 'results.json').read_text(encoding='utf-8'))
+        assert [c["conversation_id"] for c in results["conversations"]] == [f"c{i}" for i in range(8)]
+        assert all("score_max" in c["turns"][0]["metrics"]["semantic"] for c in results["conversations"])
+        stats = results["embedding_batching"]
+        assert stats["requests"] == 8 and stats["batches"] == len(calls) == 1
+        assert stats["embedded_texts"] == 8 + 8 + 1  # outputs, per-conversation answers, one shared variant
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_scores_turns_as_they_complete(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        turns = [
+            {"role": "user", "text": "where is my order"},
+            {"role": "assistant", "text": "x"},
+            {"role": "user", "text": "thanks"},
+        ]
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": turns}, {"conversation_id": "c2", "turns": turns}],
+        }
+        golden = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "entries": [
+                {"conversation_id": cid, "turns": [{"turn_index": 1, "expected": {"variants": ["on its way"]}}],
+                 "final_outcome": {"decision": "ALLOW"}}
+                for cid in ("c1", "c2")
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        Path(ds_dir, 'commerce_sample.golden.json').write_text(json.dumps(golden), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        release = asyncio.Event()
+
+        async def gated_run_turn(self, **kwargs):
+            # records are never written to disk: scoring must use what run_turn returns
+            if kwargs["conversation_id"] == "c2" and kwargs["turn_index"] == 2:
+                await release.wait()
+            return {"turn_index": kwargs["turn_index"], "response": {"ok": True, "content": "On its way"}, "state": {}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', gated_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"]})
+        orch.start(jr.job_id)
+        for _ in range(100):
+            snap = orch.partial_results(jr.job_id)
+            if snap["scored_turns"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert snap["state"] == "running"
+        assert snap["scored_conversations"] == 1
+        c1, c2 = snap["conversations"]
+        assert c1["conversation_id"] == "c1" and c1["summary"] is not None
+        assert c2["in_progress"] is True and [t["turn_index"] for t in c2["turns"]] == [0]
+        assert c2["turns"][0]["metrics"]["exact"]["pass"] is True
+
+        release.set()
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        results = json.loads(Path(runs_dir, jr.run_id, 'results.json').read_text(encoding='utf-8'))
+        assert [[t["turn_index"] for t in c["turns"]] for c in results["conversations"]] == [[0, 2], [0, 2]]
+        assert orch.partial_results(jr.job_id)["scored_conversations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_publishes_progress_events(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [
+                    {"role": "user", "text": "Where is my order A1?"},
+                    {"role": "assistant", "text": "Share order ID"},
+                    {"role": "user", "text": "It is A1"},
+                ]}
+                for i in range(2)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+
+        async def fake_run_turn(self, **kwargs):
+            return {"response": {"ok": True, "latency_ms": 5}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"], "thresholds": {}})
+        q = orch.events.subscribe(jr.job_id)
+        await orch.run_job(jr.job_id)
+
+        events = []
+        while not q.empty():
+            events.append(q.get_nowait())
+        assert [e["seq"] for e in events] == sorted(e["seq"] for e in events)
+        assert events[0]["type"] == "state" and events[0]["state"] == "running"
+        assert events[-1]["type"] == "state" and events[-1]["state"] == "succeeded"
+        turns = [e for e in events if e["type"] == "turn"]
+        assert len(turns) == 4 and all(e["latency_ms"] == 5 for e in turns)
+        assert turns[-1]["turns_scored"] == 4 and 0.0 <= turns[-1]["pass_rate"] <= 1.0
+        convs = [e for e in events if e["type"] == "conversation"]
+        assert sorted(e["conversation_id"] for e in convs) == ["c0", "c1"]
+        assert orch.events.last_state(jr.job_id)["state"] == "succeeded"
+        orch.events.unsubscribe(jr.job_id, q)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_pause_resume_is_event_driven(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [
+                    {"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"},
+                    {"role": "user", "text": "bye"}, {"role": "assistant", "text": "bye"},
+                ]}
+                for i in range(4)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        first_turn = asyncio.Event()
+        calls = []
+
+        async def fake_run_turn(self, **kwargs):
+            calls.append(kwargs.get("turn_index"))
+            first_turn.set()
+            await asyncio.sleep(0)
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"], "context": {"concurrency": 4}})
+        q = orch.events.subscribe(jr.job_id)
+        orch.start(jr.job_id)
+        await first_turn.wait()
+        orch.pause(jr.job_id)
+        orch.pause(jr.job_id)  # already paused: no second status write
+        await asyncio.sleep(0.05)
+        paused_calls = len(calls)
+        await asyncio.sleep(0.05)
+        assert len(calls) == paused_calls and jr.state == 'paused'
+
+        orch.resume(jr.job_id)
+        res = await asyncio.wait_for(orch.wait(jr.job_id), timeout=0.25)
+        assert res.state == 'succeeded' and len(calls) == 8
+
+        states = []  # state changes; progress writes repeat "running"
+        while not q.empty():
+            e = q.get_nowait()
+            if e["type"] == "state" and (not states or states[-1] != e["state"]):
+                states.append(e["state"])
+        assert states[:3] == ["running", "paused", "running"] and states[-1] == "succeeded"
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_cancel_releases_paused_job(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": [
+                {"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"},
+                {"role": "user", "text": "bye"}, {"role": "assistant", "text": "bye"},
+            ]}],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+
+        async def fake_run_turn(self, **kwargs):
+            orch.pause(jr.job_id)  # pause after the first turn
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"context": {"warmup": False}})
+        # run without start(): cancel() has no task to cancel and relies on waking the paused gate
+        task = asyncio.create_task(orch.run_job(jr.job_id))
+        await asyncio.sleep(0.01)
+        assert not task.done() and jr.state == 'paused'
+        orch.cancel(jr.job_id)
+        res = await asyncio.wait_for(task, timeout=0.1)
+        assert res.state == 'cancelled'
+        status = json.loads(Path(runs_dir, jr.run_id, 'job.json').read_text(encoding='utf-8'))
+        assert status["state"] == 'cancelled' and status["error"] == 'cancelled by user'
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_resume_reruns_only_missing_turns(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [
+                    {"role": "user", "text": "Where is my order A1?"}, {"role": "assistant", "text": "Share order ID"},
+                    {"role": "user", "text": "It is A1"}, {"role": "assistant", "text": "Thanks"},
+                ]}
+                for i in range(3)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        from artifacts import RunArtifactWriter
+        calls = []
+        fail = {("c1", 2), ("c2", 0)}  # provider errors in the first attempt
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        adapter = orch._runner.providers.get("ollama")
+
+        async def fake_chat(self, req):
+            key = (req.metadata["conversation_id"], req.metadata["turn_index"])
+            calls.append(key)
+            return types.SimpleNamespace(ok=key not in fail, content="ok", latency_ms=1, provider_meta={}, error=None)
+        monkeypatch.setattr(type(adapter), "chat", fake_chat, raising=True)
+
+        cfg = {"metrics": ["exact"], "thresholds": {}, "context": {}}
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config=cfg)
+        RunArtifactWriter(runs_dir).init_run(jr.run_id, {"dataset_id": "commerce_sample", "model_spec": "ollama:llama3.2:latest", **cfg})
+        await orch.run_job(jr.job_id)
+        assert len(calls) == 6
+
+        # a fresh orchestrator (server restart) finishes the run
+        calls.clear(); fail.clear()
+        orch2 = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        jr2 = orch2.resume_run(jr.run_id)
+        assert jr2.run_id == jr.run_id and jr2.resume
+        reads = []
+        real_read = orch2._reader.read_turn_records
+        monkeypatch.setattr(orch2._reader, 'read_turn_records', lambda *a, **k: reads.append(a) or real_read(*a, **k))
+        res = await orch2.run_job(jr2.job_id)
+        assert res.state == 'succeeded'
+        assert reads == [(jr.run_id,)]  # earlier records are loaded once for the whole run
+        assert sorted(calls) == [("c1", 2), ("c2", 0)]
+        results = json.loads(Path(runs_dir, jr.run_id, 'results.json').read_text(encoding='utf-8'))
+        assert results["resumed_turns"] == 4
+        assert [len(c["turns"]) for c in results["conversations"]] == [2, 2, 2]
+
+        with pytest.raises(FileNotFoundError):
+            orch2.resume_run("no-such-run")
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_matrix_runs_models_concurrently_and_compares(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]}
+                for i in range(3)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+
+        loads = []
+        real_get_dataset = orch.repo.get_dataset
+        monkeypatch.setattr(orch.repo, 'get_dataset', lambda ds_id: loads.append(ds_id) or real_get_dataset(ds_id))
+        inflight = {"ollama": 0, "openai": 0}
+        peak = dict(inflight)
+        models_seen = set()
+
+        async def fake_run_turn(self, **kwargs):
+            p = kwargs["provider"]
+            inflight[p] += 1
+            peak[p] = max(peak[p], inflight[p])
+            models_seen.add(kwargs["model"])
+            await asyncio.sleep(0.005)
+            inflight[p] -= 1
+            return {"response": {"ok": True, "latency_ms": 3}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        with pytest.raises(ValueError):
+            orch.submit_matrix(dataset_ids=["commerce_sample"], model_specs=["no-provider"], config={})
+        mr = orch.submit_matrix(
+            dataset_ids=["commerce_sample"],
+            model_specs=["ollama:a", "ollama:b", "openai:c"],
+            config={"metrics": ["exact"], "thresholds": {}, "context": {"concurrency": 3}},
+            provider_concurrency={"ollama": 1},
+        )
+        res = await orch.run_matrix(mr.matrix_id)
+        assert res.state == 'succeeded'
+        assert loads == ["commerce_sample"]  # loaded once for all three models
+        assert models_seen == {"a", "b", "c"}
+        assert peak == {"ollama": 1, "openai": 3}  # capped across both ollama models; openai uses its concurrency
+
+        comparison = json.loads(Path(res.comparison_path).read_text(encoding='utf-8'))
+        assert comparison["models"] == ["ollama:a", "ollama:b", "openai:c"]
+        assert [r["conversations"] for r in comparison["runs"]] == [3, 3, 3]
+        assert all(r["latency_ms_p50"] == 3.0 for r in comparison["runs"])
+        assert Path(res.comparison_path).with_name("comparison.csv").exists()
+
+        # the matrix's caps stay with its jobs; later jobs use the orchestrator-wide ones
+        assert orch.provider_concurrency == {}
+        assert not any(scope == mr.matrix_id for scope, _ in orch._provider_slots)
+        peak.update({"ollama": 0, "openai": 0})
+        jr = orch.submit(dataset_id="commerce_sample", model_spec="ollama:a",
+                         config={"metrics": ["exact"], "thresholds": {}, "context": {"concurrency": 3, "cache": False}})
+        await orch.run_job(jr.job_id)
+        assert jr.state == 'succeeded'
+        assert peak["ollama"] == 3
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_pauses_job_when_provider_circuit_opens(monkeypatch):
+    monkeypatch.setenv("PROVIDER_RETRIES", "0")
+    monkeypatch.setenv("PROVIDER_BREAKER_THRESHOLD", "2")
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [
+                    {"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"},
+                    {"role": "user", "text": "bye"}, {"role": "assistant", "text": "bye"},
+                ]}
+                for i in range(3)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        outage = {"down": True, "calls": 0}
+
+        async def flaky_chat(self, req):
+            outage["calls"] += 1
+            if outage["down"]:
+                return types.SimpleNamespace(ok=False, content="", latency_ms=1, provider_meta={"status": 502}, error="bad gateway")
+            return types.SimpleNamespace(ok=True, content="hello", latency_ms=1, provider_meta={"status": 200}, error=None)
+        adapter = orch._runner.providers.get("ollama").adapter.adapter  # below the retry and rate-limit wrappers
+        monkeypatch.setattr(type(adapter), 'chat', flaky_chat, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"], "context": {"concurrency": 1}})
+        orch.start(jr.job_id)
+        for _ in range(50):
+            if jr.state == 'paused':
+                break
+            await asyncio.sleep(0.01)
+        assert jr.state == 'paused' and 'circuit open' in jr.error
+        assert outage["calls"] == 2  # the breaker stopped the job instead of failing every turn
+        orch._write_status(jr)  # a progress write (e.g. another conversation finishing) keeps the reason
+        assert 'circuit open' in orch.status_snapshot(jr.job_id)["error"]
+
+        outage["down"] = False
+        orch.resume(jr.job_id)
+        res = await asyncio.wait_for(orch.wait(jr.job_id), timeout=2)
+        assert res.state == 'succeeded' and res.error is None
+        results = json.loads(Path(runs_dir, jr.run_id, 'results.json').read_text(encoding='utf-8'))
+        turns = [t for c in results["conversations"] for t in c["turns"]]
+        assert len(turns) == 6
+
+
+@pytest.mark.asyncio
+async def test_replay_provider_answers_from_a_synthetic_run():
+    from artifacts import RunArtifactReader
+    from providers.types import ProviderRequest
+
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [
+                    {"role": "user", "text": f"hi {i}"}, {"role": "assistant", "text": "hello"},
+                    {"role": "user", "text": "bye"}, {"role": "assistant", "text": "bye"},
+                ]}
+                for i in range(3)
+            ],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+
+        # no provider is patched: both runs go through the real turn runner and artifacts
+        src = orch.submit(dataset_id='commerce_sample', model_spec='synthetic:words=12', config={"metrics": ["exact"], "context": {"turn_storage": "jsonl"}})
+        assert (await orch.run_job(src.job_id)).state == 'succeeded'
+        replay = orch.submit(dataset_id='commerce_sample', model_spec=f'replay:{src.run_id}', config={"metrics": ["exact"]})
+        assert (await orch.run_job(replay.job_id)).state == 'succeeded'
+
+        reader = RunArtifactReader(runs_dir)
+        original = {(r["conversation_id"], r["turn_index"]): r["response"] for r in reader.read_turn_records(src.run_id)}
+        replayed = reader.read_turn_records(replay.run_id)
+        assert len(replayed) == len(original) == 6
+        for r in replayed:
+            resp = r["response"]
+            recorded = original[(r["conversation_id"], r["turn_index"])]
+            assert resp["ok"] and resp["content"] == recorded["content"]
+            assert resp["provider_meta"]["replay"]["match"] == "turn"
+            assert resp["provider_meta"]["usage"] == recorded["provider_meta"]["usage"]
+
+        # unmatched conversation ids fall back to the message hash
+        resp = await orch._runner.providers.get("replay").chat(ProviderRequest(
+            model=src.run_id, messages=replayed[0]["request"]["messages"], metadata={"conversation_id": "other", "turn_index": 9}))
+        assert resp.ok and resp.provider_meta["replay"]["match"] == "hash"
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_warms_up_ollama_and_keeps_load_time_out_of_latency(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": [
+                {"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"},
+                {"role": "user", "text": "bye"}, {"role": "assistant", "text": "bye"},
+            ]}],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        order = []
+
+        async def fake_warm_up(self, model, params=None):
+            order.append("warmup")
+            return {"ok": True, "latency_ms": 900, "load_ms": 850.0}
+
+        async def fake_chat(self, req):
+            order.append("turn")
+            load = 400.0 if len(order) == 2 else 2.0  # the model was unloaded before the first turn
+            return types.SimpleNamespace(ok=True, content="hello", latency_ms=int(load) + 100, provider_meta={"load_ms": load}, error=None)
+        adapter = orch._runner.providers.get("ollama").adapter.adapter
+        monkeypatch.setattr(type(adapter), 'warm_up', fake_warm_up, raising=True)
+        monkeypatch.setattr(type(adapter), 'chat', fake_chat, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"]})
+        q = orch.events.subscribe(jr.job_id)
+        assert (await orch.run_job(jr.job_id)).state == 'succeeded'
+        assert order == ["warmup", "turn", "turn"]
+        events = []
+        while not q.empty():
+            events.append(q.get_nowait())
+        assert [e["load_ms"] for e in events if e["type"] == "warmup"] == [850.0]
+
+        results = json.loads(Path(runs_dir, jr.run_id, 'results.json').read_text(encoding='utf-8'))
+        turns = results["conversations"][0]["turns"]
+        assert [t["latency_ms"] for t in turns] == [100, 100] and [t["load_ms"] for t in turns] == [400.0, 2.0]
+        assert results["model_load"] == {"warmup": {"ok": True, "latency_ms": 900, "load_ms": 850.0},
+                                         "turn_load_ms_total": 402.0, "turn_load_ms_max": 400.0}
+
+
+def test_run_id_ignores_empty_and_execution_only_context():
+    from orchestrator import compute_run_id
+
+    base = {"metrics": ["exact"], "thresholds": {}}
+    rid = compute_run_id("d", "1", "m:x", base)
+    assert compute_run_id("d", "1", "m:x", {**base, "context": {}}) == rid
+    assert compute_run_id("d", "1", "m:x", {**base, "context": {"concurrency": 3, "turn_storage": "jsonl"}}) == rid
+    assert compute_run_id("d", "1", "m:x", {**base, "context": {"params": {"temperature": 0.5}}}) != rid
+
+
+@pytest.mark.asyncio
+async def test_rerun_with_other_turn_storage_replaces_earlier_records():
+    from artifacts import RunArtifactReader
+
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": [
+                {"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"},
+                {"role": "user", "text": "bye"}, {"role": "assistant", "text": "bye"},
+            ]}],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        reader = RunArtifactReader(runs_dir)
+
+        started = []
+        for context in ({"turn_storage": "jsonl", "artifact_compression": "gzip"},
+                        {"turn_storage": "jsonl", "artifact_compression": "zstd"},
+                        {"turn_storage": "files", "artifact_compression": "zstd"}):
+            jr = orch.submit(dataset_id='commerce_sample', model_spec='synthetic:words=3', config={"metrics": ["exact"], "context": context})
+            assert (await orch.run_job(jr.job_id)).state == 'succeeded'
+            records = reader.read_turn_records(jr.run_id)
+            assert len(records) == 2
+            started.append(min(r["timestamps"]["started_at"] for r in records))
+        assert len({jr.run_id for jr in orch.jobs.values()}) == 1  # storage options share the run id
+        assert started == sorted(started) and len(set(started)) == 3  # each rerun reads its own records
+        assert not Path(runs_dir, jr.run_id, 'turns.idx.jsonl').exists()
+
+        # a resume keeps the storage the run folder already uses
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='synthetic:words=3', config={"metrics": ["exact"], "context": {"turn_storage": "jsonl"}}, resume=True)
+        assert (await orch.run_job(jr.job_id)).state == 'succeeded'
+        assert not Path(runs_dir, jr.run_id, 'turns.idx.jsonl').exists()
+        assert min(r["timestamps"]["started_at"] for r in reader.read_turn_records(jr.run_id)) == started[-1]
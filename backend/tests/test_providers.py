@@ -36,3 +36,259 @@ async def test_gemini_disabled_without_key(monkeypatch):
     resp = await gemini.chat(ProviderRequest(model="gemini-2.5", messages=[{"role": "user", "content": "hi"}], metadata={}))
     assert not resp.ok
     assert "disabled" in (resp.error or "").lower()
+
+
+@pytest.mark.asyncio
+async def test_adapter_reuses_pooled_client(monkeypatch):
+    import httpx
+    from providers.http_pool import HttpClientPool
+
+    builds = []
+
+    def handler(request):
+        return httpx.Response(200, json={"message": {"content": "pong"}, "eval_count": 1})
+
+    def fake_build(self):
+        c = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        builds.append(c)
+        return c
+
+    monkeypatch.setattr(HttpClientPool, "_build", fake_build, raising=True)
+    r = ProviderRegistry()
+    ollama = r.get("ollama")
+    req = ProviderRequest(model="llama3.2:latest", messages=[{"role": "user", "content": "ping"}], metadata={})
+    first = await ollama.chat(req)
+    second = await ollama.chat(req)
+    assert first.ok and second.ok and second.content == "pong"
+    assert len(builds) == 1
+    await r.aclose()
+    assert builds[0].is_closed
+
+
+def test_pool_config_per_provider_override(monkeypatch):
+    from providers.http_pool import PoolConfig
+
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "8")
+    monkeypatch.setenv("OPENAI_HTTP_MAX_CONNECTIONS", "3")
+    monkeypatch.setenv("HTTP_KEEPALIVE_EXPIRY", "5")
+    assert PoolConfig.from_env("openai").max_connections == 3
+    assert PoolConfig.from_env("ollama").max_connections == 8
+    assert PoolConfig.from_env("ollama").keepalive_expiry == 5.0
+
+
+def test_token_bucket_and_retry_after_parsing():
+    from providers.rate_limit import TokenBucket, retry_after_seconds
+
+    b = TokenBucket(60)  # one per second, burst of 60
+    assert b.reserve(60) == 0.0
+    assert 0.9 < b.reserve(1) <= 1.0
+    b.adjust(-30)  # refund once actual usage turned out lower
+    assert b.reserve(10) == 0.0
+    assert retry_after_seconds("2") == 2.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # in the past
+    assert retry_after_seconds(None) is None
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_provider_adapts_concurrency_and_honors_retry_after():
+    from providers.rate_limit import LimitConfig, ProviderLimiter, RateLimitedProvider
+
+    state = {"inflight": 0, "peak": 0, "status": 200}
+
+    class FakeAdapter:
+        enabled = True
+
+        async def chat(self, req):
+            state["inflight"] += 1
+            state["peak"] = max(state["peak"], state["inflight"])
+            await asyncio.sleep(0.01)
+            state["inflight"] -= 1
+            if state["status"] != 200:
+                return types.SimpleNamespace(ok=False, content="", latency_ms=1, provider_meta={"status": state["status"], "retry_after": "0.05"})
+            return types.SimpleNamespace(ok=True, content="ok", latency_ms=1, provider_meta={})
+
+    limiter = ProviderLimiter("openai", LimitConfig(max_concurrency=4, min_concurrency=1))
+    p = RateLimitedProvider(FakeAdapter(), limiter)
+    assert p.enabled
+    req = ProviderRequest(model="m", messages=[{"role": "user", "content": "hi"}], metadata={})
+
+    await asyncio.gather(*(p.chat(req) for _ in range(10)))
+    assert state["peak"] == 4
+
+    state["status"] = 429
+    resp = await p.chat(req)
+    assert not resp.ok and limiter.limit == 2.0 and limiter.stats["backoffs"] == 1
+    state["status"] = 200
+    resp = await p.chat(req)  # held back by Retry-After
+    assert resp.ok and resp.provider_meta["throttle_ms"] >= 40
+    assert 2.0 < limiter.limit < 3.0  # additive increase after success
+
+    state["peak"] = 0
+    await asyncio.gather(*(p.chat(req) for _ in range(6)))
+    assert state["peak"] < 4  # still below the pre-backoff limit while it grows back
+    assert limiter.snapshot()["throttled_calls"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_resilient_provider_retries_and_opens_circuit():
+    from providers.resilience import CircuitBreaker, ResilientProvider, RetryPolicy
+
+    calls = []
+    outcomes = []
+
+    class FakeAdapter:
+        enabled = True
+
+        async def chat(self, req):
+            calls.append(1)
+            status = outcomes.pop(0) if outcomes else 200
+            if status == "timeout":
+                return types.SimpleNamespace(ok=False, content="", latency_ms=1, provider_meta={"exception": "ReadTimeout"})
+            return types.SimpleNamespace(ok=status == 200, content="ok", latency_ms=1, provider_meta={"status": status})
+
+    policy = RetryPolicy(retries=2, backoff_base_ms=1, backoff_max_ms=5)
+    breaker = CircuitBreaker(threshold=2, cooldown_s=60)
+    p = ResilientProvider(FakeAdapter(), policy, breaker)
+    req = ProviderRequest(model="m", messages=[{"role": "user", "content": "hi"}], metadata={})
+
+    outcomes[:] = ["timeout", 503]
+    resp = await p.chat(req)
+    assert resp.ok and resp.provider_meta["retries"] == 2 and len(calls) == 3
+
+    outcomes[:] = [400]  # not retryable, and not held against the provider
+    resp = await p.chat(req)
+    assert not resp.ok and resp.provider_meta["retries"] == 0 and breaker.failures == 0
+
+    outcomes[:] = [500] * 6
+    for _ in range(2):
+        resp = await p.chat(req)
+    assert resp.provider_meta == {"status": 500, "retries": 2, "circuit": "open"}
+    calls.clear()
+    resp = await p.chat(req)  # refused without reaching the provider
+    assert not resp.ok and resp.provider_meta["circuit"] == "open" and not calls
+
+    breaker.probe()
+    resp = await p.chat(req)
+    assert resp.ok and breaker.state == "closed" and resp.provider_meta["circuit"] == "closed"
+
+
+def test_retry_policy_from_env_and_backoff(monkeypatch):
+    from providers.resilience import RetryPolicy
+
+    monkeypatch.setenv("PROVIDER_RETRIES", "5")
+    monkeypatch.setenv("GEMINI_RETRIES", "1")
+    monkeypatch.setenv("PROVIDER_BACKOFF_MAX_MS", "1000")
+    assert RetryPolicy.from_env("gemini").retries == 1
+    policy = RetryPolicy.from_env("openai")
+    assert policy.retries == 5
+    assert all(0.0 <= policy.backoff(n) <= 1.0 for n in range(10))
+    assert policy.backoff(0, retry_after=2.5) == 2.5
+
+
+@pytest.mark.asyncio
+async def test_streaming_adapters_record_ttft_and_cancel_early(monkeypatch):
+    import json as _json
+    import httpx
+    from providers.http_pool import HttpClientPool
+
+    def handler(request):
+        if request.url.path == "/api/chat":
+            assert _json.loads(request.content)["stream"] is True
+            lines = [{"message": {"content": w}, "done": False} for w in ("Hel", "lo", "!")]
+            lines.append({"message": {"content": ""}, "done": True, "eval_count": 3, "load_duration": 5})
+            return httpx.Response(200, content="\n".join(_json.dumps(x) for x in lines).encode())
+        body = _json.loads(request.content)
+        assert body["stream"] is True and body["stream_options"] == {"include_usage": True}
+        events = [{"model": "gpt", "choices": [{"delta": {"content": w}}]} for w in ("Hi", " there")]
+        events.append({"model": "gpt", "choices": [], "usage": {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6}})
+        sse = "".join(f"data: {_json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+        return httpx.Response(200, content=sse.encode(), headers={"content-type": "text/event-stream"})
+
+    monkeypatch.setattr(HttpClientPool, "_build", lambda self: httpx.AsyncClient(transport=httpx.MockTransport(handler)), raising=True)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    r = ProviderRegistry()
+    msgs = [{"role": "user", "content": "hi"}]
+
+    resp = await r.get("ollama").chat(ProviderRequest(model="llama3.2:latest", messages=msgs, metadata={"stream": True}))
+    assert resp.ok and resp.content == "Hello!"
+    meta = resp.provider_meta
+    assert meta["stream"] and meta["stream_chunks"] == 3 and meta["eval_count"] == 3 and meta["load_duration"] == 5
+    assert meta["ttft_ms"] is not None and meta["ttft_ms"] <= resp.latency_ms + 1
+
+    resp = await r.get("openai").chat(ProviderRequest(model="gpt", messages=msgs, metadata={"stream": True}))
+    assert resp.ok and resp.content == "Hi there"
+    assert resp.provider_meta["usage"]["total_tokens"] == 6 and resp.provider_meta["ttft_ms"] is not None
+
+    cancel = asyncio.Event()
+    cancel.set()
+    resp = await r.get("ollama").chat(ProviderRequest(model="llama3.2:latest", messages=msgs, metadata={"stream": True, "cancel": cancel}))
+    assert not resp.ok and resp.error == "cancelled" and resp.content == "Hel"
+    assert resp.provider_meta["cancelled"] and resp.provider_meta["retries"] == 0
+    await r.aclose()
+
+
+def test_stream_timer_decode_rates():
+    from providers.streaming import StreamTimer
+
+    timer = StreamTimer(t0=0.0)
+    assert timer.meta()["ttft_ms"] is None
+    timer.first, timer.last, timer.chunks = 0.5, 1.5, 3
+    meta = timer.meta(completion_tokens=11)
+    assert meta["ttft_ms"] == 500.0 and meta["tokens_per_sec"] == 10.0 and meta["inter_token_ms"] == 100.0
+    assert timer.meta()["tokens_per_sec"] == 2.0  # falls back to chunk count
+
+
+@pytest.mark.asyncio
+async def test_synthetic_provider_is_deterministic(monkeypatch):
+    from providers.synthetic import SyntheticProfile
+
+    profile = SyntheticProfile.parse("bench,words=10,words_spread=0,latency_ms=20,dist=lognormal,spread=0.5,bogus=1")
+    assert (profile.words, profile.latency_ms, profile.dist, profile.spread) == (10, 20.0, "lognormal", 0.5)
+    assert SyntheticProfile.parse("default").latency_ms == 0.0
+
+    slept = []
+
+    async def fake_sleep(s):
+        slept.append(s)
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    synthetic = ProviderRegistry().get("synthetic")
+    req = ProviderRequest(model="words=10,words_spread=0,latency_ms=20,dist=lognormal,spread=0.5",
+                          messages=[{"role": "user", "content": "hi"}], metadata={"conversation_id": "c1", "turn_index": 0})
+    a, b = await synthetic.chat(req), await synthetic.chat(req)
+    assert a.ok and a.content == b.content and len(a.content.split()) == 10
+    assert a.latency_ms == b.latency_ms and slept[0] == slept[1] > 0
+    assert a.provider_meta["usage"]["completion_tokens"] == 10
+    other = await synthetic.chat(ProviderRequest(model=req.model, messages=req.messages, metadata={"conversation_id": "c2", "turn_index": 0}))
+    assert other.content != a.content
+
+
+@pytest.mark.asyncio
+async def test_ollama_warm_up_and_residency_options(monkeypatch):
+    import json as _json
+    import httpx
+    from providers.http_pool import HttpClientPool
+
+    seen = []
+
+    def handler(request):
+        body = _json.loads(request.content)
+        seen.append((request.url.path, body))
+        if request.url.path == "/api/generate":
+            return httpx.Response(200, json={"model": body["model"], "done": True, "load_duration": 2_500_000_000})
+        return httpx.Response(200, json={"message": {"content": "ok"}, "load_duration": 1_000_000, "eval_count": 1})
+
+    monkeypatch.setattr(HttpClientPool, "_build", lambda self: httpx.AsyncClient(transport=httpx.MockTransport(handler)), raising=True)
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "30m")
+    monkeypatch.setenv("OLLAMA_NUM_CTX", "8192")
+    ollama = ProviderRegistry().get("ollama")
+
+    warm = await ollama.warm_up("llama3.2:latest", {"num_ctx": 4096})
+    assert warm["ok"] and warm["load_ms"] == 2500.0
+    assert seen[-1] == ("/api/generate", {"model": "llama3.2:latest", "prompt": "", "keep_alive": "30m", "options": {"num_ctx": 4096}})
+
+    resp = await ollama.chat(ProviderRequest(model="llama3.2:latest", messages=[{"role": "user", "content": "hi"}],
+                                             metadata={"params": {"keep_alive": "-1"}}))
+    body = seen[-1][1]
+    assert body["keep_alive"] == -1 and body["options"]["num_ctx"] == 8192
+    assert resp.ok and resp.provider_meta["load_ms"] == 1.0
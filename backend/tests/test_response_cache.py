@@ -0,0 +1,71 @@
+import tempfile
+import types
+from pathlib import Path
+
+import pytest
+
+from providers.response_cache import ResponseCache, cache_key, normalize_cache_mode
+from providers.types import ProviderResponse
+from turn_runner import TurnRunner
+
+
+def test_cache_key_and_mode():
+    msgs = [{"role": "user", "content": "hi"}]
+    k1 = cache_key("ollama", "m", msgs, {"temperature": 0.0, "seed": 42})
+    k2 = cache_key("ollama", "m", msgs, {"seed": 42, "temperature": 0.0})
+    assert k1 == k2
+    assert k1 != cache_key("ollama", "m", msgs, {"temperature": 0.0, "seed": 7})
+    assert normalize_cache_mode("READ") == "read"
+    assert normalize_cache_mode(None) == "off"
+    assert normalize_cache_mode("bogus") == "off"
+
+
+def test_lru_eviction_by_size():
+    with tempfile.TemporaryDirectory() as d:
+        cache = ResponseCache(Path(d), max_bytes=300)
+        for k in ("a1", "b2", "c3"):
+            cache.put(k * 8, ProviderResponse(True, "x" * 40, 5, {}))
+        # touch the oldest so it becomes most recently used
+        assert cache.get("a1" * 8) is not None
+        cache.put("d4" * 8, ProviderResponse(True, "x" * 40, 5, {}))
+        assert cache.get("b2" * 8) is None
+        assert cache.get("a1" * 8) is not None
+        # a fresh instance rebuilds the index from disk
+        assert ResponseCache(Path(d), max_bytes=300).get("d4" * 8).content == "x" * 40
+
+
+def test_cache_keeps_answer_meta_only():
+    with tempfile.TemporaryDirectory() as d:
+        cache = ResponseCache(Path(d))
+        meta = {"eval_count": 3, "usage": {"completion_tokens": 3}, "throttle_ms": 40, "retries": 2,
+                "circuit": "closed", "ttft_ms": 55.0, "tokens_per_sec": 20.0, "load_ms": 900.0}
+        cache.put("ab" * 8, ProviderResponse(True, "answer", 5, meta))
+        # a hit must not be counted as throttled, retried, streamed or loading the model again
+        assert cache.get("ab" * 8).provider_meta == {"eval_count": 3, "usage": {"completion_tokens": 3}}
+        assert meta["retries"] == 2  # the live response is left alone
+
+
+@pytest.mark.asyncio
+async def test_turn_runner_cache_modes(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        runner = TurnRunner(Path(d) / "runs", response_cache=ResponseCache(Path(d) / "cache"))
+        calls = []
+
+        async def fake_chat(self, req):
+            calls.append(req)
+            return ProviderResponse(True, "cached answer", 12, {"eval_count": 3})
+        monkeypatch.setattr(type(runner.providers.get("ollama")), "chat", fake_chat, raising=True)
+
+        kwargs = dict(run_id="r", provider="ollama", model="m", domain="commerce",
+                      conversation_id="c1", turn_index=0, turns=[{"role": "user", "text": "refund please"}])
+        miss = await runner.run_turn(**kwargs, cache_mode="read")
+        assert miss["cache"]["hit"] is False
+        await runner.run_turn(**kwargs, cache_mode="readwrite")
+        hit = await runner.run_turn(**kwargs, cache_mode="read")
+        assert hit["cache"]["hit"] is True
+        assert hit["response"]["content"] == "cached answer"
+        assert hit["response"]["latency_ms"] == 0
+        assert hit["cache"]["original_latency_ms"] == 12
+        off = await runner.run_turn(**kwargs)
+        assert off["cache"] == {"mode": "off", "hit": False}
+        assert len(calls) == 3
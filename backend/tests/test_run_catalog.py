@@ -0,0 +1,77 @@
+import json
+import tempfile
+from pathlib import Path
+
+from artifacts import RunArtifactWriter
+from run_catalog import RunCatalog
+
+
+def _status(job_id, state, boot_id="b1"):
+    return {"job_id": job_id, "state": state, "progress_pct": 100 if state == "succeeded" else 10,
+            "total_conversations": 2, "completed_conversations": 1, "error": None, "boot_id": boot_id}
+
+
+def test_writer_mirrors_runs_into_catalog():
+    with tempfile.TemporaryDirectory() as d:
+        w = RunArtifactWriter(Path(d))
+        for i, (ds, model) in enumerate([("ds1", "ollama:a"), ("ds1", "ollama:b"), ("ds2", "ollama:a")]):
+            rid = f"run{i}"
+            w.init_run(rid, {"dataset_id": ds, "model_spec": model})
+            w.write_job_status(rid, _status(f"job{i}", "running"))
+        w.write_job_status("run1", _status("job1", "succeeded"))
+        cat = w.catalog
+
+        assert cat.find_job("job1") == ("run1", _status("job1", "succeeded"))
+        assert cat.find_job("nope") is None
+        row = cat.get("run1")
+        assert row["has_results"] and row["dataset_id"] == "ds1" and row["vertical"] == Path(d).name
+
+        rows, total = cat.list(dataset_id="ds1")
+        assert total == 2 and [r["run_id"] for r in rows] == ["run0", "run1"]
+        rows, total = cat.list(limit=1, offset=1)
+        assert total == 3 and [r["run_id"] for r in rows] == ["run1"]
+        assert [r["run_id"] for r in cat.list(state="running")[0]] == ["run0", "run2"]
+
+
+def test_catalog_backfills_existing_run_folders():
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        for i in range(3):
+            run_dir = root / f"old{i}"
+            run_dir.mkdir()
+            (run_dir / "run_config.json").write_text(json.dumps({"dataset_id": "ds", "model_spec": f"m{i}"}))
+            (run_dir / "job.json").write_text(json.dumps(_status(f"j{i}", "succeeded")))
+        (root / "old0" / "results.json").write_text("{}")
+        (root / "not-a-run").mkdir()
+
+        cat = RunCatalog(root)  # a new catalog indexes what is already on disk
+        rows, total = cat.list()
+        assert total == 3 and [r["model_spec"] for r in rows] == ["m0", "m1", "m2"]
+        assert cat.find_job("j2")[0] == "old2"
+        assert cat.get("old0")["has_results"]
+
+
+def test_runs_endpoint_pages_and_filters(monkeypatch):
+    from fastapi.testclient import TestClient
+    import app as app_mod
+    from artifacts import RunArtifactReader
+
+    with tempfile.TemporaryDirectory() as d:
+        w = RunArtifactWriter(Path(d))
+        for i in range(5):
+            w.init_run(f"r{i}", {"dataset_id": "ds" if i % 2 else "other", "model_spec": "ollama:m"})
+            w.write_job_status(f"r{i}", _status(f"job-{i}", "running"))
+        monkeypatch.setitem(app_mod.app.state.vctx, "commerce", {"orch": app_mod.Orchestrator(datasets_dir=Path(d), runs_root=Path(d)), "artifacts": w, "reader": RunArtifactReader(Path(d)), "vertical": "commerce"})
+        client = TestClient(app_mod.app)
+
+        r = client.get("/runs", params={"vertical": "commerce", "limit": 2, "offset": 1})
+        assert r.headers["x-total-count"] == "5"
+        assert [x["run_id"] for x in r.json()] == ["r1", "r2"]
+        assert all(x["state"] == "stale" for x in r.json())  # boot id of another server session
+        r = client.get("/runs", params={"vertical": "commerce", "dataset_id": "ds"})
+        assert [x["run_id"] for x in r.json()] == ["r1", "r3"]
+
+        # persisted job lookup without scanning run folders
+        assert client.get("/runs/job-3/status").json()["state"] == "failed"
+        assert client.post("/runs/job-4/control", json={"action": "cancel"}).json()["state"] == "cancelled"
+        assert w.catalog.get("r4")["state"] == "cancelled"
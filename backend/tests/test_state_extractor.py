@@ -25,3 +25,82 @@ def test_extract_state_banking():
     assert s["amount"] == 100.0
     assert s["account_id"] == "9XYZ"
     assert s["decision"] == "ALLOW"
+
+
+def _replay_matches_full_rescan(domain, turns, replies):
+    import json
+    from state_extractor import IncrementalStateExtractor
+
+    inc = IncrementalStateExtractor(domain)
+    for i, t in enumerate(turns):
+        if t.get("role") != "user":
+            continue
+        prefix = turns[: i + 1]
+        full = extract_state(domain, prefix)
+        assert json.dumps(inc.advance(prefix)) == json.dumps(full)
+        reply = replies[i % len(replies)]
+        expected = extract_state(domain, list(prefix) + [{"role": "assistant", "text": reply}], prev_state=full)
+        assert json.dumps(inc.with_reply(reply)) == json.dumps(expected)
+
+
+def test_incremental_extractor_matches_extract_state():
+    from backend.cli import DEMO_DATASET
+    from backend.coverage_builder_v2 import build_per_behavior_datasets_v2
+
+    replies = [
+        "We can issue refund of $25.50 for order #AB-12 after it's shipped.",
+        "Sorry, I cannot refund this; it is outside the return window. Let me escalate.",
+        'Approved. FINAL_STATE: {"decision": "PARTIAL", "next_action": null, "refund_amount": 5, "policy_flags": ["no_receipt"]}',
+        "Please provide details, total $40 incl. shipping. No receipt needed.",
+        "Transfer approved from account id 77QQ-1, amount $300; KYC passed but limit exceeded.",
+    ]
+    fixtures = [("commerce", DEMO_DATASET["conversations"][0]["turns"])]
+    fixtures.append(("commerce", [
+        {"role": "user", "text": "Where is my order #A123?"},
+        {"role": "assistant", "text": "Please share the order ID."},
+        {"role": "user", "text": "Order ID is A123, I want my money back"},
+        {"role": "assistant", "text": "We can issue refund of $10 after it's shipped."},
+        {"role": "user", "text": "It's past the return window, no receipt. Promo?"},
+    ]))
+    fixtures.append(("banking", [
+        {"role": "user", "text": "Please transfer $100 from acct id 9XYZ to saving."},
+        {"role": "assistant", "text": "Approved. Proceeding."},
+        {"role": "user", "text": "Also dispute an unauthorized charge, kyc flag? over limit?"},
+        {"role": "assistant", "text": "I cannot waive fee. FINAL_STATE: {\"decision\": \"DENY\"}"},
+        {"role": "user", "text": "Then block my card"},
+    ]))
+    for ds, _ in build_per_behavior_datasets_v2():
+        domain = ds["metadata"]["domain"]
+        for conv in ds["conversations"]:
+            fixtures.append((domain, conv["turns"]))
+    assert len(fixtures) > 100
+    for domain, turns in fixtures:
+        _replay_matches_full_rescan(domain, turns, replies)
+
+
+def test_rule_families_match_per_pattern_search():
+    import itertools
+    import re
+    import state_extractor as se
+
+    phrases = [
+        "where is my order", "tracking", "refund please", "money back", "returning it", "return window",
+        "exchange", "delayed", "late", "promo code", "coupon", "replacement", "transfer $5", "balance",
+        "dispute", "block my card", "loan", "waive fee", "shipped", "no receipt", "approved",
+        "cannot refund", "partial refund", "we can issue refund", "escalate", "need more info",
+        "provide details", "confirmed order", "deny", "allow", "outside the return window",
+    ]
+    texts = [" ".join(p) for p in itertools.permutations(phrases, 2)] + phrases
+
+    def legacy(domain, text):
+        tl = text.lower()
+        intent = next((i for i, pats in se.COMMON_INTENTS.get(domain, {}).items()
+                       if any(re.search(p, tl) for p in pats)), None)
+        flags = [f for f, pats in se.POLICY_FLAGS_PATTERNS.items() if any(re.search(p, tl) for p in pats)]
+        dec = next((v for p, v in se.DECISION_MAP.items() if re.search(p, text, re.I)), None)
+        return intent, flags, dec
+
+    for domain in ("commerce", "banking", "unknown"):
+        for text in texts:
+            assert (se._detect_intent(domain, text), se._collect_policy_flags(text), se._detect_decision(text)) \
+                == legacy(domain, text), text
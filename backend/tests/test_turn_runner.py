@@ -35,3 +35,135 @@ async def test_turn_runner_persists(monkeypatch):
         assert rec["response"]["ok"]
         out = Path(d) / "runx" / "conversations" / "conv1" / "turn_001.json"
         assert out.exists()
+
+
+@pytest.mark.asyncio
+async def test_turn_runner_jsonl_storage_reads_back_like_files(monkeypatch):
+    import json
+    from artifacts import RunArtifactReader
+
+    with tempfile.TemporaryDirectory() as d:
+        runner = TurnRunner(Path(d))
+        ollama = runner.providers.get("ollama")
+
+        async def fake_chat(self, req):
+            return types.SimpleNamespace(ok=True, content=f"reply {req.metadata['turn_index']}", latency_ms=2, provider_meta={})
+        monkeypatch.setattr(type(ollama), "chat", fake_chat, raising=True)
+
+        turns = [
+            {"role": "user", "text": "I want a refund for order A1"},
+            {"role": "assistant", "text": "Sure"},
+            {"role": "user", "text": "Thanks"},
+        ]
+        written = {}
+        for storage, run_id in (("jsonl", "run-log"), ("files", "run-files")):
+            for cid in ("conv1", "conv2"):
+                for idx in (2, 0):  # out of order on purpose
+                    rec = await runner.run_turn(
+                        run_id=run_id, provider="ollama", model="m", domain="commerce",
+                        conversation_id=cid, turn_index=idx, turns=turns[: idx + 1], storage=storage,
+                    )
+                    written[(run_id, cid, idx)] = json.loads(json.dumps(rec))
+        runner.turn_log.close_all()
+
+        log_run = Path(d) / "run-log"
+        assert not list(log_run.rglob("turn_*.json"))
+        assert len((log_run / "turns.jsonl").read_text(encoding="utf-8").splitlines()) == 4
+        # a torn trailing index line (crash mid-append) is ignored
+        with open(log_run / "turns.idx.jsonl", "a", encoding="utf-8") as f:
+            f.write('["conv1", 4, 99')
+
+        reader = RunArtifactReader(Path(d))
+        for run_id in ("run-log", "run-files"):
+            got = reader.read_turn_records(run_id, "conv1")
+            assert got == [written[(run_id, "conv1", 0)], written[(run_id, "conv1", 2)]]
+            grouped = reader.read_turn_records_by_conversation(run_id)
+            assert list(grouped) == ["conv1", "conv2"] and grouped["conv1"] == got
+
+        # the parsed index is reused across reads until the log grows
+        parsed = reader.turn_log._indexes["run-log"]
+        reader.read_turn_records("run-log", "conv2")
+        assert reader.turn_log._indexes["run-log"] is parsed
+        for idx in (0, 1):
+            await runner.run_turn(
+                run_id="run-grow", provider="ollama", model="m", domain="commerce",
+                conversation_id="conv1", turn_index=idx, turns=turns[: idx + 1], storage="jsonl",
+            )
+            assert [r["turn_index"] for r in reader.read_turn_records("run-grow", "conv1")] == list(range(idx + 1))
+
+
+@pytest.mark.asyncio
+async def test_turn_runner_stores_shared_message_bodies_once(monkeypatch):
+    import json
+    from artifacts import RunArtifactReader
+
+    monkeypatch.setenv("TURN_BLOB_MIN_BYTES", "64")
+    with tempfile.TemporaryDirectory() as d:
+        runner = TurnRunner(Path(d))
+        ollama = runner.providers.get("ollama")
+
+        async def fake_chat(self, req):
+            return types.SimpleNamespace(ok=True, content="ok", latency_ms=2, provider_meta={})
+        monkeypatch.setattr(type(ollama), "chat", fake_chat, raising=True)
+
+        turns = [
+            {"role": "user", "text": "I want a refund for order A1"},
+            {"role": "assistant", "text": "Sure"},
+            {"role": "user", "text": "Thanks"},
+        ]
+        written = []
+        for storage, run_id in (("files", "run-files"), ("jsonl", "run-log")):
+            for idx in (0, 2):
+                rec = await runner.run_turn(
+                    run_id=run_id, provider="ollama", model="m", domain="commerce",
+                    conversation_id="conv1", turn_index=idx, turns=turns[: idx + 1], storage=storage,
+                )
+                assert "content" in rec["request"]["messages"][0]  # returned record stays whole
+                written.append((run_id, json.loads(json.dumps(rec))))
+            runner.close_run(run_id)
+
+        stored = json.loads((Path(d) / "run-files" / "conversations" / "conv1" / "turn_002.json").read_text(encoding="utf-8"))
+        system = stored["request"]["messages"][0]
+        assert system["content_ref"].startswith("sha256:") and "content" not in system
+        # both turns share one system-prompt blob; only the STATE suffix stays inline
+        assert len(list((Path(d) / "run-files" / "blobs").rglob("*.txt"))) == 1
+        assert system.get("content_tail", "").startswith("\nSTATE=")
+
+        reader = RunArtifactReader(Path(d))
+        for run_id in ("run-files", "run-log"):
+            got = reader.read_turn_records(run_id, "conv1")
+            assert got == [r for rid, r in written if rid == run_id]
+
+
+@pytest.mark.asyncio
+async def test_turn_runner_compressed_storage_reads_back(monkeypatch):
+    import json
+    from artifacts import RunArtifactReader
+
+    with tempfile.TemporaryDirectory() as d:
+        runner = TurnRunner(Path(d))
+        ollama = runner.providers.get("ollama")
+
+        async def fake_chat(self, req):
+            return types.SimpleNamespace(ok=True, content="ok " * 50, latency_ms=2, provider_meta={})
+        monkeypatch.setattr(type(ollama), "chat", fake_chat, raising=True)
+
+        turns = [{"role": "user", "text": "I want a refund for order A1"}]
+        written = {}
+        for storage, run_id in (("files", "run-files"), ("jsonl", "run-log")):
+            for cid in ("conv1", "conv2"):
+                rec = await runner.run_turn(
+                    run_id=run_id, provider="ollama", model="m", domain="commerce",
+                    conversation_id=cid, turn_index=0, turns=turns, storage=storage, compression="gzip",
+                )
+                written[(run_id, cid)] = json.loads(json.dumps(rec))
+            stats = runner.compression_stats(run_id)
+            assert stats["mode"] == "gzip" and stats["artifacts"]["turn_records"]["ratio"] > 1.0
+            runner.close_run(run_id)
+
+        assert (Path(d) / "run-files" / "conversations" / "conv1" / "turn_000.json.gz").exists()
+        assert (Path(d) / "run-log" / "turns.jsonl.gz").exists()
+        reader = RunArtifactReader(Path(d))
+        for run_id in ("run-files", "run-log"):
+            for cid in ("conv1", "conv2"):
+                assert reader.read_turn_records(run_id, cid) == [written[(run_id, cid)]]
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+try:
+    from .compression import ArtifactCodec, ZstdDictionaries, decompress, dictionary_root, variants
+except ImportError:
+    from compression import ArtifactCodec, ZstdDictionaries, decompress, dictionary_root, variants
+
+TURN_STORAGE_MODES = ("files", "jsonl")
+SEGMENT_NAME = "turns.jsonl"
+INDEX_NAME = "turns.idx.jsonl"
+# parsed indexes kept per TurnLog (most recently read runs)
+INDEX_CACHE_RUNS = 8
+
+
+def normalize_turn_storage(value: Any = None) -> str:
+    """Map a run config `turn_storage` value to files|jsonl (falls back to TURN_STORAGE env, then files)."""
+    v = str(value or os.getenv("TURN_STORAGE") or "files").strip().lower()
+    return v if v in TURN_STORAGE_MODES else "files"
+
+
+class TurnLog:
+    """Append-only per-run turn log: one compact JSON line per turn record.
+
+    <runs_root>/<run_id>/turns.jsonl holds the records; turns.idx.jsonl holds one
+    [conversation_id, turn_index, offset, length] line per record, appended after the
+    record itself so the index never points at a partially written line. When a turn
+    is written twice (e.g. a resumed run), the later entry wins.
+
+    With a compressing codec each line is stored as its own gzip/zstd frame in
+    turns.jsonl.gz / turns.jsonl.zst (concatenated frames are still a valid stream), so
+    the index keeps random access to single records. A parsed index is reused until the
+    index file's size or mtime changes, so per-conversation reads do not reparse it.
+    """
+
+    def __init__(self, runs_root: Path) -> None:
+        self.runs_root = Path(runs_root)
+        self.dictionaries = ZstdDictionaries(dictionary_root(self.runs_root))
+        self._handles: Dict[str, Tuple[IO[bytes], IO[bytes]]] = {}
+        # run_id -> ((size, mtime_ns) of the index file, {conversation_id: [(turn_index, offset, length)]})
+        self._indexes: "OrderedDict[str, Tuple[Tuple[int, int], Dict[Any, List[Tuple[int, int, int]]]]]" = OrderedDict()
+
+    def segment_path(self, run_id: str, suffix: str = "") -> Path:
+        return self.runs_root / run_id / (SEGMENT_NAME + suffix)
+
+    def _existing_segment(self, run_id: str) -> Optional[Path]:
+        for p in variants(self.segment_path(run_id)):
+            if p.exists():
+                return p
+        return None
+
+    def index_path(self, run_id: str) -> Path:
+        return self.runs_root / run_id / INDEX_NAME
+
+    def append(self, run_id: str, record: Dict[str, Any], codec: Optional[ArtifactCodec] = None) -> Tuple[int, int]:
+        handles = self._handles.get(run_id)
+        if handles is None:
+            # keep appending to an existing segment (e.g. resumed run); frames are self-describing
+            segment = self._existing_segment(run_id) or self.segment_path(run_id, codec.suffix if codec else "")
+            segment.parent.mkdir(parents=True, exist_ok=True)
+            handles = (open(segment, "ab"), open(self.index_path(run_id), "ab"))
+            self._handles[run_id] = handles
+        seg, idx = handles
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        if codec is not None:
+            line = codec.compress(line, kind="turn_records", record=True)
+        seg.seek(0, os.SEEK_END)
+        offset = seg.tell()
+        seg.write(line)
+        seg.flush()
+        entry = [record.get("conversation_id"), record.get("turn_index"), offset, len(line)]
+        idx.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        idx.flush()
+        return offset, len(line)
+
+    def close(self, run_id: str) -> None:
+        for h in self._handles.pop(run_id, ()):
+            try:
+                h.close()
+            except OSError:
+                pass
+
+    def close_all(self) -> None:
+        for run_id in list(self._handles):
+            self.close(run_id)
+
+    def exists(self, run_id: str) -> bool:
+        return self.index_path(run_id).exists()
+
+    def remove(self, run_id: str) -> None:
+        """Delete the run's log (every segment variant) and index, e.g. before a fresh rerun."""
+        self.close(run_id)
+        self._indexes.pop(run_id, None)
+        for p in variants(self.segment_path(run_id)) + [self.index_path(run_id)]:
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _index(self, run_id: str) -> Dict[Any, List[Tuple[int, int, int]]]:
+        """Latest (turn_index, offset, length) of every record, grouped by conversation in turn order."""
+        path = self.index_path(run_id)
+        try:
+            st = path.stat()
+        except OSError:
+            self._indexes.pop(run_id, None)
+            return {}
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = self._indexes.get(run_id)
+        if cached is not None and cached[0] == stamp:
+            self._indexes.move_to_end(run_id)
+            return cached[1]
+        entries: Dict[Tuple[Any, int], Tuple[int, int]] = {}
+        try:
+            with open(path, "rb") as f:
+                for raw in f:
+                    try:
+                        cid, tix, offset, length = json.loads(raw)
+                    except (ValueError, TypeError):
+                        continue  # torn trailing line
+                    entries[(cid, int(tix))] = (int(offset), int(length))
+        except OSError:
+            return {}
+        grouped: Dict[Any, List[Tuple[int, int, int]]] = {}
+        for (cid, tix), (offset, length) in sorted(entries.items(), key=lambda kv: (str(kv[0][0]), kv[0][1])):
+            grouped.setdefault(cid, []).append((tix, offset, length))
+        self._indexes[run_id] = (stamp, grouped)
+        while len(self._indexes) > INDEX_CACHE_RUNS:
+            self._indexes.popitem(last=False)
+        return grouped
+
+    def read(self, run_id: str, conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records of a run (optionally one conversation), ordered by conversation then turn_index."""
+        index = self._index(run_id)
+        if conversation_id is None:
+            wanted = [e for entries in index.values() for e in entries]
+        else:
+            wanted = index.get(conversation_id) or []
+        out: List[Dict[str, Any]] = []
+        if not wanted:
+            return out
+        segment = self._existing_segment(run_id)
+        if segment is None:
+            return out
+        with open(segment, "rb") as f:
+            for _, offset, length in wanted:
+                f.seek(offset)
+                try:
+                    out.append(json.loads(decompress(f.read(length), self.dictionaries)))
+                except (ValueError, OSError, EOFError, RuntimeError):
+                    continue
+        return out
@@ -8,19 +8,89 @@ from datetime import datetime, timezone
 try:
     from .providers.registry import ProviderRegistry  # type: ignore
     from .providers.types import ProviderRequest  # type: ignore
-    from .state_extractor import extract_state  # type: ignore
+    from .providers.response_cache import ResponseCache, cache_key, normalize_cache_mode  # type: ignore
+    from .state_extractor import extract_state, IncrementalStateExtractor  # type: ignore
     from .context_builder import build_context  # type: ignore
+    from .turn_log import TurnLog, normalize_turn_storage  # type: ignore
+    from .blob_store import BlobStore, BLOB_DIRNAME, dehydrate_record  # type: ignore
+    from .compression import ArtifactCodec, normalize_compression, write_artifact  # type: ignore
 except Exception:
     from providers.registry import ProviderRegistry  # type: ignore
     from providers.types import ProviderRequest  # type: ignore
-    from state_extractor import extract_state  # type: ignore
+    from providers.response_cache import ResponseCache, cache_key, normalize_cache_mode  # type: ignore
+    from state_extractor import extract_state, IncrementalStateExtractor  # type: ignore
     from context_builder import build_context  # type: ignore
+    from turn_log import TurnLog, normalize_turn_storage  # type: ignore
+    from blob_store import BlobStore, BLOB_DIRNAME, dehydrate_record  # type: ignore
+    from compression import ArtifactCodec, normalize_compression, write_artifact  # type: ignore
 
 
 class TurnRunner:
-    def __init__(self, run_root: Path) -> None:
+    def __init__(self, run_root: Path, response_cache: ResponseCache | None = None) -> None:
         self.run_root = Path(run_root)
-        self.providers = ProviderRegistry()
+        self.providers = ProviderRegistry(runs_root=self.run_root)
+        # Opt-in per run (context.cache); created lazily so runs with cache=off never touch disk
+        self._response_cache = response_cache
+        # Append-only JSONL storage for runs with turn_storage=jsonl
+        self.turn_log = TurnLog(self.run_root)
+        # Per-run content-addressed stores for large message bodies (system prompt etc.)
+        self._blob_stores: Dict[str, BlobStore] = {}
+        # Per-run codecs for compressed turn records (context.artifact_compression)
+        self._codecs: Dict[str, ArtifactCodec] = {}
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        if self._response_cache is None:
+            self._response_cache = ResponseCache()
+        return self._response_cache
+
+    def blob_store(self, run_id: str) -> BlobStore:
+        store = self._blob_stores.get(run_id)
+        if store is None:
+            store = BlobStore(self.run_root / run_id / BLOB_DIRNAME)
+            self._blob_stores[run_id] = store
+        return store
+
+    def codec(self, run_id: str, compression: str) -> ArtifactCodec:
+        codec = self._codecs.get(run_id)
+        if codec is None or codec.mode != normalize_compression(compression):
+            codec = ArtifactCodec(normalize_compression(compression), self.turn_log.dictionaries)
+            self._codecs[run_id] = codec
+        return codec
+
+    def compression_stats(self, run_id: str) -> Dict[str, Any] | None:
+        codec = self._codecs.get(run_id)
+        return codec.stats() if codec is not None else None
+
+    def stored_turn_storage(self, run_id: str) -> str | None:
+        """Storage mode of the turn records already in a run folder (jsonl, files or None)."""
+        if self.turn_log.exists(run_id):
+            return "jsonl"
+        conv_root = self.run_root / run_id / "conversations"
+        if conv_root.is_dir() and next(conv_root.glob("*/turn_*.json*"), None) is not None:
+            return "files"
+        return None
+
+    def reset_run(self, run_id: str) -> None:
+        """Drop turn records of an earlier run with the same run_id (turn log and turn files).
+
+        run_ids ignore storage options, so a rerun with another turn_storage or compression
+        would otherwise leave older records next to (or in front of) the new ones.
+        """
+        self.turn_log.remove(run_id)
+        conv_root = self.run_root / run_id / "conversations"
+        if conv_root.is_dir():
+            for tf in conv_root.glob("*/turn_*.json*"):
+                try:
+                    tf.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def close_run(self, run_id: str) -> None:
+        """Release per-run storage state (turn log handles, blob index, codec)."""
+        self.turn_log.close(run_id)
+        self._blob_stores.pop(run_id, None)
+        self._codecs.pop(run_id, None)
 
     @staticmethod
     def _now_iso() -> str:
@@ -64,10 +134,17 @@ class TurnRunner:
         conv_meta: Dict[str, Any] | None = None,
         params_override: Dict[str, Any] | None = None,
         max_tokens: int = 2048,
+        cache_mode: str = "off",
+        extractor: IncrementalStateExtractor | None = None,
+        storage: str = "files",
+        blobs: bool = True,
+        compression: str = "off",
+        stream: bool = False,
+        cancel: Any = None,
     ) -> Dict[str, Any]:
         started_at = self._now_iso()
-        # 1) derive state from transcript
-        state = extract_state(domain, turns)
+        # 1) derive state from transcript; a per-conversation extractor only consumes new turns
+        state = extractor.advance(turns) if extractor is not None else extract_state(domain, turns)
         # 2) build provider-ready context
         # Build context with conversation-level metadata (policy + facts) when available
         ctx = build_context(domain, turns, state, max_tokens=max_tokens, conv_meta=conv_meta or {}, params_override=params_override)
@@ -81,16 +158,40 @@ class TurnRunner:
             "turn_index": turn_index,
             "domain": domain,
             "params": params,
+            # Streamed calls stop reading (and close the connection) once `cancel` is set
+            "stream": bool(stream),
+            "cancel": cancel,
         })
-        resp = await adapter.chat(req)
+        cache_mode = normalize_cache_mode(cache_mode)
+        cache_info: Dict[str, Any] = {"mode": cache_mode, "hit": False}
+        resp = None
+        if cache_mode != "off":
+            key = cache_key(provider, model, messages, params)
+            cache_info["key"] = key
+            resp = self.response_cache.get(key)
+            if resp is not None:
+                cache_info["hit"] = True
+                cache_info["original_latency_ms"] = resp.latency_ms
+                # A cache hit costs no model time; keep latency stats honest
+                resp.latency_ms = 0
+        if resp is None:
+            resp = await adapter.chat(req)
+            if cache_mode == "readwrite" and resp.ok:
+                try:
+                    self.response_cache.put(cache_info["key"], resp)
+                except Exception:
+                    pass
         ended_at = self._now_iso()
 
         # Update state with assistant reply by re-running extractor over turns + model output.
         # This captures the structured FINAL_STATE JSON (if present) or falls back to heuristics.
         try:
-            assistant_msg = {"role": "assistant", "text": resp.content or ""}
-            updated_turns: List[Dict[str, str]] = list(turns) + [assistant_msg]
-            state = extract_state(domain, updated_turns, prev_state=state)
+            if extractor is not None:
+                state = extractor.with_reply(resp.content or "")
+            else:
+                assistant_msg = {"role": "assistant", "text": resp.content or ""}
+                updated_turns: List[Dict[str, str]] = list(turns) + [assistant_msg]
+                state = extract_state(domain, updated_turns, prev_state=state)
         except Exception:
             pass
 
@@ -110,12 +211,20 @@ class TurnRunner:
                 "provider_meta": resp.provider_meta,
                 "error": getattr(resp, "error", None),
             },
+            "cache": cache_info,
             "timestamps": {
                 "started_at": started_at,
                 "ended_at": ended_at,
             },
         }
-        # 4) persist artifact
-        out_path = self._artifact_path(run_id, conversation_id, turn_index)
-        out_path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        # 4) persist artifact: one pretty-printed file per turn, or a line in the run's turn log.
+        # Large message bodies are stored once per run by hash; the returned record stays whole.
+        # With artifact compression, records are gzip/zstd frames (zstd with a trained dictionary).
+        stored = dehydrate_record(record, self.blob_store(run_id)) if blobs else record
+        codec = self.codec(run_id, compression)
+        if normalize_turn_storage(storage) == "jsonl":
+            self.turn_log.append(run_id, stored, codec if codec.mode != "off" else None)
+        else:
+            out_path = self._artifact_path(run_id, conversation_id, turn_index)
+            write_artifact(out_path, json.dumps(stored, indent=2).encode("utf-8"), codec, record=True)
         return record
@@ -0,0 +1,146 @@
+"""Micro-benchmark: state_extractor rule engine vs the previous per-pattern re.search loops.
+
+Usage (from repo root):
+    python scripts/bench_state_extractor.py [--turns 100000] [--seed 7] [--repeat 3]
+
+Builds a synthetic corpus of user/assistant turns, checks that both implementations
+agree on every turn, and prints turns/second for each.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+from backend import state_extractor as se  # noqa: E402
+
+USER_PHRASES = [
+    "where is my order #A{n}?", "tracking order {n} please", "I want a refund", "money back now",
+    "returning the item", "is it inside the return window", "can I exchange it", "delayed shipping again",
+    "late delivery", "any coupon or promo?", "send a replacement", "order id is ZX-{n}",
+    "please transfer ${n} from acct id 9XY{n}", "how much money do I have", "dispute an unauthorized charge",
+    "block my card", "loan status?", "waive fee please", "it was shipped already", "no receipt sorry",
+]
+ASSISTANT_PHRASES = [
+    "We can issue refund of ${n}.", "Approved, processing refund now.", "I cannot refund this order.",
+    "A partial refund is possible.", "Let me escalate this to a specialist.", "I need more info about it.",
+    "Please provide details.", "Your confirmed order ships soon.", "It is outside the return window.",
+    "That exceeds threshold for max refund.", "Order total ${n}.50 including tax.", "KYC passed, limit exceeded.",
+    "Happy to help with anything else.",
+]
+
+
+def build_corpus(n_turns: int, seed: int):
+    rng = random.Random(seed)
+    turns = []
+    for i in range(n_turns):
+        role = "user" if i % 2 == 0 else "assistant"
+        pool = USER_PHRASES if role == "user" else ASSISTANT_PHRASES
+        text = " ".join(rng.choice(pool).format(n=rng.randint(1, 999)) for _ in range(rng.randint(1, 4)))
+        turns.append((rng.choice(["commerce", "banking"]), {"role": role, "text": text}))
+    return turns
+
+
+# --- previous implementation (re.search per raw pattern, text lowercased per call) ---
+def legacy_intent(domain, text):
+    text_l = text.lower()
+    for intent, pats in se.COMMON_INTENTS.get(domain, {}).items():
+        for p in pats:
+            if re.search(p, text_l):
+                return intent
+    return None
+
+
+def legacy_flags(text):
+    out = []
+    tl = text.lower()
+    for flag, pats in se.POLICY_FLAGS_PATTERNS.items():
+        for p in pats:
+            if re.search(p, tl):
+                out.append(flag)
+                break
+    return out
+
+
+def legacy_decision(text):
+    dec = None
+    for pat, val in se.DECISION_MAP.items():
+        if re.search(pat, text, re.I):
+            dec = val
+            break
+    if se.REFUND_NEGATIVE.search(text or ""):
+        dec = dec or "DENY"
+    elif se.REFUND_PARTIAL.search(text or ""):
+        dec = dec or "PARTIAL"
+    elif se.REFUND_POSITIVE.search(text or ""):
+        dec = dec or "ALLOW"
+    return dec
+
+
+def legacy_next_action(text):
+    if re.search(r"issue (a )?refund|process(ing)? refund", text, re.I):
+        return "issue_refund"
+    if re.search(r"confirm order|confirmed order", text, re.I):
+        return "confirm_order"
+    if re.search(r"escalat(e|ion)", text, re.I):
+        return "escalate"
+    if re.search(r"need (more )?info|provide details", text, re.I):
+        return "request_more_info"
+    return None
+
+
+def legacy_rules(domain, t):
+    text = t["text"]
+    if t["role"] == "user":
+        return (legacy_intent(domain, text), None, None, legacy_flags(text))
+    return (None, legacy_decision(text), legacy_next_action(text), legacy_flags(text))
+
+
+def engine_rules(domain, t):
+    text = t["text"]
+    text_l = text.lower()
+    flags = se._POLICY_FLAG_RULES.all(text_l)
+    if t["role"] == "user":
+        return (se._INTENT_RULES.get(domain, se._NO_RULES).first(text_l), None, None, flags)
+    return (None, se._ASSISTANT_DECISION_RULES.first(text), se._NEXT_ACTION_RULES.first(text), flags)
+
+
+def _rate(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        out = [fn(d, t) for d, t in corpus]
+        best = min(best, time.perf_counter() - t0)
+    return out, len(corpus) / best if best else float("inf")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--turns", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    args = ap.parse_args()
+    corpus = build_corpus(args.turns, args.seed)
+    re.purge()
+    before, before_rate = _rate(legacy_rules, corpus, args.repeat)
+    after, after_rate = _rate(engine_rules, corpus, args.repeat)
+    mismatches = sum(1 for a, b in zip(before, after) if a != b)
+    print(f"turns: {len(corpus)}")
+    print(f"rule detection  before: {before_rate:,.0f} turns/s  after: {after_rate:,.0f} turns/s  "
+          f"speedup: {after_rate / before_rate:.2f}x  mismatches: {mismatches}")
+    # End-to-end incremental extraction over the same corpus (one long conversation per domain)
+    t0 = time.perf_counter()
+    extractors = {d: se.IncrementalStateExtractor(d) for d in ("commerce", "banking")}
+    for d, t in corpus:
+        se._apply_turn(d, extractors[d]._state, t)
+    dt = time.perf_counter() - t0
+    print(f"full _apply_turn fold: {len(corpus) / dt:,.0f} turns/s")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())